@@ -0,0 +1,182 @@
+"""Vergleichender Benchmark aller Implementierungen des Verkehrsnetzes.
+
+Für jede Kombination aus Implementierung, Netztyp und Größe wird ein
+eigener Prozess gestartet. Gemessen werden der Aufbau des Netzes über die
+öffentliche API, einzelne Anfragen, eine gebündelte Anfrage (Matrix aus
+Start- und Zielstationen) sowie der Zuwachs des belegten Arbeitsspeichers (RSS) durch den Aufbau.
+Die Ergebnisse werden als JSON geschrieben, um Regressionen zu verfolgen.
+
+Beispiel:
+    python benchmark.py --sizes 1000,10000 --output ergebnisse.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import time
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+from generators import GENERATORS
+from implementations import IMPLEMENTATIONS
+
+def _resident_memory() -> Optional[int]:
+    """
+    Aktuell belegter Arbeitsspeicher (RSS) des Prozesses in Bytes.
+
+    Ohne /proc (z. B. macOS, Windows) wird None geliefert und der Speicher
+    nicht gemessen; der Spitzenwert aus getrusage wäre keine Differenz
+    vor und nach dem Aufbau und daher nicht vergleichbar.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _summary(durations: List[float]) -> Dict[str, float]:
+    """Kennzahlen einer Liste von Laufzeiten in Millisekunden."""
+    ordered = sorted(durations)
+    return {
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def _checksum(answers: List[Optional[int]]) -> Dict[str, int]:
+    """Prüfsumme der Antworten, um abweichende Ergebnisse zu erkennen."""
+    return {"total": sum(answer for answer in answers if answer is not None),
+            "unreachable": sum(answer is None for answer in answers)}
+
+
+def run_case(implementation_name: str, kind: str, size: int, queries: int,
+             matrix: int, seed: int) -> Dict[str, Any]:
+    """Führt einen Benchmark-Fall im aktuellen Prozess aus."""
+    generated = GENERATORS[kind](size, seed)
+    rng = random.Random(seed)
+    names = generated.names
+    pairs = [(rng.choice(names), rng.choice(names)) for _ in range(queries)]
+    starts = rng.sample(names, min(matrix, len(names)))
+    ends = rng.sample(names, min(matrix, len(names)))
+    matrix_pairs = [(start, end) for start in starts for end in ends]
+
+    result: Dict[str, Any] = {"stations": generated.station_count, "edges": generated.edge_count}
+    implementation = IMPLEMENTATIONS[implementation_name]()
+
+    memory_before = _resident_memory()
+    begin = time.perf_counter()
+    network = implementation.build(generated)
+    result["build_s"] = time.perf_counter() - begin
+    memory_after = _resident_memory()
+    if memory_before is not None and memory_after is not None:
+        result["memory_mb"] = (memory_after - memory_before) / 2 ** 20
+
+    durations: List[float] = []
+    answers: List[Optional[int]] = []
+    for start, end in pairs:
+        begin = time.perf_counter()
+        answers.append(implementation.query(network, start, end))
+        durations.append(time.perf_counter() - begin)
+    result["single"] = _summary(durations)
+    result["single"]["checksum"] = _checksum(answers)
+
+    begin = time.perf_counter()
+    answers = implementation.batch(network, matrix_pairs)
+    elapsed = time.perf_counter() - begin
+    result["batch"] = {"queries": len(matrix_pairs), "total_s": elapsed,
+                       "per_query_ms": elapsed / len(matrix_pairs) * 1000,
+                       "checksum": _checksum(answers)}
+    return result
+
+
+def _worker(connection: Any, *arguments: Any) -> None:
+    """Einstiegspunkt des Kindprozesses: Ergebnis oder Fehler über die Pipe melden."""
+    try:
+        connection.send({"status": "ok", **run_case(*arguments)})
+    except Exception as error:
+        connection.send({"status": "error", "error": f"{type(error).__name__}: {error}",
+                         "traceback": traceback.format_exc()})
+    finally:
+        connection.close()
+
+
+def run_isolated(implementation_name: str, kind: str, size: int, queries: int,
+                 matrix: int, seed: int, timeout: float) -> Dict[str, Any]:
+    """Führt einen Benchmark-Fall in einem frischen Prozess mit Zeitlimit aus."""
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_worker,
+                              args=(sender, implementation_name, kind, size, queries, matrix, seed))
+    process.start()
+    sender.close()
+    if receiver.poll(timeout):
+        try:
+            result = receiver.recv()
+        except EOFError:
+            # Der Prozess ist ohne Ergebnis beendet worden (z. B. Speichermangel)
+            process.join()
+            result = {"status": "error", "error": f"Prozess beendet mit Code {process.exitcode}"}
+    else:
+        result = {"status": "timeout", "timeout_s": timeout}
+    process.join(1)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark der Verkehrsnetz-Implementierungen")
+    parser.add_argument("--implementations", default=",".join(IMPLEMENTATIONS),
+                        help="Kommagetrennte Liste der Implementierungen")
+    parser.add_argument("--generators", default=",".join(GENERATORS),
+                        help="Kommagetrennte Liste der Netztypen")
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000",
+                        help="Kommagetrennte Liste der Stationsanzahlen")
+    parser.add_argument("--queries", type=int, default=50, help="Anzahl einzelner Anfragen")
+    parser.add_argument("--matrix", type=int, default=10,
+                        help="Start- und Zielstationen der gebündelten Anfrage (Matrix n x n)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=600.0, help="Zeitlimit je Fall in Sekunden")
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args()
+
+    cases: List[Tuple[str, str, int]] = [
+        (implementation, kind, int(size))
+        for kind in args.generators.split(",")
+        for size in args.sizes.split(",")
+        for implementation in args.implementations.split(",")
+    ]
+    results = []
+    for implementation, kind, size in cases:
+        result = run_isolated(implementation, kind, size, args.queries, args.matrix, args.seed, args.timeout)
+        results.append({"implementation": implementation, "generator": kind, "size": size, **result})
+        if result["status"] == "ok":
+            print(f"{implementation:20} {kind:17} {size:>8}  Aufbau {result['build_s']:8.2f} s  "
+                  f"Anfrage {result['single']['median_ms']:9.2f} ms  "
+                  f"Matrix {result['batch']['per_query_ms']:9.2f} ms/Anfrage", flush=True)
+        else:
+            print(f"{implementation:20} {kind:17} {size:>8}  {result['status']}: {result.get('error', '')}",
+                  flush=True)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"queries": args.queries, "matrix": args.matrix, "seed": args.seed,
+                     "timeout_s": args.timeout},
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Ergebnisse gespeichert in {args.output}")
+
+if __name__ == "__main__":
+    main()
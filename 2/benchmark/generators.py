@@ -0,0 +1,118 @@
+"""Generatoren für synthetische Verkehrsnetze.
+
+Alle Generatoren sind deterministisch (fester Seed) und liefern die Netze
+in einer neutralen Form aus Stationsnamen und ungerichteten Kanten, die
+von den Adaptern in implementations.py in die jeweilige Implementierung
+übertragen wird.
+"""
+
+from array import array
+from math import hypot, isqrt, pi, sqrt
+from typing import Callable, Dict, List, Tuple
+import random
+
+class GeneratedNetwork:
+    """
+    Ein erzeugtes Netz: Stationsnamen und ungerichtete Kanten als drei
+    parallele Arrays (Station 1, Station 2, Fahrzeit in Minuten).
+    """
+
+    def __init__(self, kind: str, names: List[str], first: array, second: array, durations: array) -> None:
+        self.kind = kind
+        self.names = names
+        self.first = first
+        self.second = second
+        self.durations = durations
+
+    @property
+    def station_count(self) -> int:
+        return len(self.names)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.durations)
+
+    def edges(self):
+        """Iteriert über die Kanten als (Station 1, Station 2, Fahrzeit) mit Stationsindizes."""
+        return zip(self.first, self.second, self.durations)
+
+    def __repr__(self) -> str:
+        return f"GeneratedNetwork({self.kind!r}, {self.station_count} stations, {self.edge_count} edges)"
+
+
+def _network(kind: str, n: int, edges: List[Tuple[int, int, int]]) -> GeneratedNetwork:
+    first, second, durations = array('l'), array('l'), array('l')
+    for a, b, duration in edges:
+        first.append(a)
+        second.append(b)
+        durations.append(duration)
+    return GeneratedNetwork(kind, [f"S{i}" for i in range(n)], first, second, durations)
+
+
+def grid(n: int, seed: int = 1) -> GeneratedNetwork:
+    """Quadratisches Gitter mit etwa `n` Stationen und zufälligen Fahrzeiten von 1 bis 10 Minuten."""
+    rng = random.Random(seed)
+    side = max(1, isqrt(n))
+    edges = []
+    for row in range(side):
+        for column in range(side):
+            station = row * side + column
+            if column + 1 < side:
+                edges.append((station, station + 1, rng.randint(1, 10)))
+            if row + 1 < side:
+                edges.append((station, station + side, rng.randint(1, 10)))
+    return _network("grid", side * side, edges)
+
+
+def random_geometric(n: int, seed: int = 1, degree: float = 6.0) -> GeneratedNetwork:
+    """
+    Zufälliger geometrischer Graph: `n` Punkte gleichverteilt in einem Quadrat,
+    verbunden sind alle Punkte mit Abstand unter einem Radius, der im Mittel
+    `degree` Nachbarn ergibt. Die Fahrzeit wächst mit dem Abstand.
+    """
+    rng = random.Random(seed)
+    side = sqrt(n)
+    radius = sqrt(degree / pi)
+    points = [(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(n)]
+    # Punkte in Zellen der Kantenlänge `radius` einsortieren
+    cells: Dict[Tuple[int, int], List[int]] = {}
+    for i, (x, y) in enumerate(points):
+        cells.setdefault((int(x / radius), int(y / radius)), []).append(i)
+    edges = []
+    for (cx, cy), members in cells.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in cells.get((cx + dx, cy + dy), ()):
+                    for i in members:
+                        if i < j:
+                            distance = hypot(points[i][0] - points[j][0], points[i][1] - points[j][1])
+                            if distance <= radius:
+                                edges.append((i, j, max(1, round(distance * 3))))
+    return _network("random_geometric", n, edges)
+
+
+def scale_free(n: int, seed: int = 1, links: int = 2) -> GeneratedNetwork:
+    """
+    Skalenfreies, verkehrsnetzähnliches Netz nach Barabási-Albert: Jede neue
+    Station verbindet sich mit `links` bestehenden Stationen, bevorzugt mit
+    bereits stark vernetzten (Umsteigeknoten).
+    """
+    rng = random.Random(seed)
+    edges = []
+    # Jede Station kommt so oft vor, wie sie Verbindungen hat
+    endpoints: List[int] = []
+    for station in range(1, n):
+        targets = set()
+        while len(targets) < min(links, station):
+            targets.add(rng.choice(endpoints) if endpoints and rng.random() < 0.9 else rng.randrange(station))
+        for target in targets:
+            edges.append((station, target, rng.randint(2, 12)))
+            endpoints.extend((station, target))
+    return _network("scale_free", n, edges)
+
+
+GENERATORS: Dict[str, Callable[..., GeneratedNetwork]] = {
+    "grid": grid,
+    "random_geometric": random_geometric,
+    "scale_free": scale_free,
+}
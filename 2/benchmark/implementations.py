@@ -0,0 +1,199 @@
+"""Adapter für die Implementierungen des Verkehrsnetzes.
+
+Die Implementierungen verwenden teils gleichnamige Module (`network`,
+`station`, ...) und werden deshalb jeweils in einem eigenen Prozess
+geladen: Ein Adapter ergänzt erst in build() den Suchpfad um das
+Verzeichnis seiner Implementierung und importiert sie dann.
+
+Jeder Adapter überträgt ein GeneratedNetwork über die öffentliche API der
+Implementierung und liefert Fahrzeiten einheitlich als int oder None
+(kein Weg).
+"""
+
+import csv
+import os
+import sys
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from generators import GeneratedNetwork
+
+# Verzeichnis der Aufgabe 2 mit allen Implementierungen
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class Implementation(ABC):
+    """Basisklasse der Adapter."""
+
+    name = ""
+    directory = ""
+
+    def load(self) -> None:
+        """Macht das Verzeichnis der Implementierung importierbar."""
+        path = os.path.join(_ROOT, self.directory)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    @abstractmethod
+    def build(self, generated: GeneratedNetwork) -> Any:
+        """Baut das Netz in der Implementierung auf und liefert es."""
+
+    @abstractmethod
+    def query(self, network: Any, start: str, end: str) -> Optional[int]:
+        """Fahrzeit des kürzesten Wegs von `start` nach `end` oder None."""
+
+    def batch(self, network: Any, pairs: Sequence[Tuple[str, str]]) -> List[Optional[int]]:
+        """Beantwortet mehrere Anfragen; ohne eigene Batch-API einzeln nacheinander."""
+        return [self.query(network, start, end) for start, end in pairs]
+
+
+class TrafficNetwork(Implementation):
+    """traffic_network (direct/ChatGPT)."""
+
+    name = "traffic_network"
+    directory = os.path.join("direct", "ChatGPT")
+
+    def build(self, generated: GeneratedNetwork) -> Any:
+        self.load()
+        from traffic_network.network import Network
+        from traffic_network.station import Station
+        from traffic_network.connection import Connection
+        self.stations = {name: Station(name) for name in generated.names}
+        stations = [self.stations[name] for name in generated.names]
+        network = Network()
+        for station in stations:
+            network.add_station(station)
+        for a, b, duration in generated.edges():
+            network.add_connection(Connection(stations[a], stations[b], duration))
+        return network
+
+    def query(self, network: Any, start: str, end: str) -> Optional[int]:
+        result = network.shortest_path(self.stations[start], self.stations[end])
+        return result[0] if result is not None else None
+
+    def batch(self, network: Any, pairs: Sequence[Tuple[str, str]]) -> List[Optional[int]]:
+        # Eine one-to-many-Suche je Startstation
+        ends_by_start: Dict[str, List[str]] = {}
+        for start, end in pairs:
+            ends_by_start.setdefault(start, []).append(end)
+        answers: Dict[Tuple[str, str], Optional[int]] = {}
+        for start, ends in ends_by_start.items():
+            results = network.shortest_paths(self.stations[start], [self.stations[end] for end in ends])
+            for end in ends:
+                result = results[self.stations[end]]
+                answers[start, end] = result[0] if result is not None else None
+        return [answers[pair] for pair in pairs]
+
+
+class CopilotNetwork(Implementation):
+    """models/network (direct/Copilot), gerichtet: je Kante zwei Verbindungen."""
+
+    name = "copilot_network"
+    directory = os.path.join("direct", "Copilot")
+
+    def build(self, generated: GeneratedNetwork) -> Any:
+        self.load()
+        from models import Station, Connection
+        from network import Network
+        self.stations = {name: Station(name) for name in generated.names}
+        stations = [self.stations[name] for name in generated.names]
+        network = Network()
+        with network.edit() as editor:
+            for station in stations:
+                editor.add_station(station)
+            for a, b, duration in generated.edges():
+                editor.add_connection(Connection(stations[a], stations[b], duration))
+                editor.add_connection(Connection(stations[b], stations[a], duration))
+        return network
+
+    def query(self, network: Any, start: str, end: str) -> Optional[int]:
+        try:
+            return network.shortest_path(self.stations[start], self.stations[end])[1]
+        except ValueError:
+            return None
+
+
+class CopilotNetzwerk(Implementation):
+    """Netzwerk (chain-of-thought/Copilot), gerichtet: je Kante zwei Verbindungen."""
+
+    name = "copilot_netzwerk"
+    directory = os.path.join("chain-of-thought", "Copilot")
+
+    def build(self, generated: GeneratedNetwork) -> Any:
+        self.load()
+        from netzwerk import Netzwerk
+        network = Netzwerk()
+        for name in generated.names:
+            network.station_hinzufuegen(name)
+        names = generated.names
+        for a, b, duration in generated.edges():
+            network.verbindung_hinzufuegen(names[a], names[b], duration)
+            network.verbindung_hinzufuegen(names[b], names[a], duration)
+        return network
+
+    def query(self, network: Any, start: str, end: str) -> Optional[int]:
+        try:
+            return network.shortest_path(start, end)[1]
+        except ValueError:
+            return None
+
+
+class KompaktesNetzwerk(Implementation):
+    """KompaktesNetzwerk (chain-of-thought/Copilot), per Massenimport aus CSV geladen."""
+
+    name = "copilot_kompaktnetz"
+    directory = os.path.join("chain-of-thought", "Copilot")
+
+    def build(self, generated: GeneratedNetwork) -> Any:
+        self.load()
+        from kompaktnetz import lade_csv
+        with tempfile.TemporaryDirectory() as directory:
+            stations_path = os.path.join(directory, "stationen.csv")
+            connections_path = os.path.join(directory, "verbindungen.csv")
+            with open(stations_path, "w", newline="", encoding="utf-8") as file:
+                writer = csv.writer(file)
+                writer.writerow(["name"])
+                writer.writerows([name] for name in generated.names)
+            with open(connections_path, "w", newline="", encoding="utf-8") as file:
+                writer = csv.writer(file)
+                writer.writerow(["start", "ziel", "fahrzeit"])
+                names = generated.names
+                for a, b, duration in generated.edges():
+                    writer.writerow((names[a], names[b], duration))
+                    writer.writerow((names[b], names[a], duration))
+            return lade_csv(stations_path, connections_path)
+
+    def query(self, network: Any, start: str, end: str) -> Optional[int]:
+        try:
+            return network.shortest_path(start, end)[1]
+        except ValueError:
+            return None
+
+
+class ChatGPTNetzwerk(Implementation):
+    """Netzwerk aus chatgpt.py (chain-of-thought/ChatGPT)."""
+
+    name = "chatgpt_netzwerk"
+    directory = os.path.join("chain-of-thought", "ChatGPT")
+
+    def build(self, generated: GeneratedNetwork) -> Any:
+        self.load()
+        from chatgpt import Netzwerk, Station, Verbindung
+        self.stations = {name: Station(name) for name in generated.names}
+        stations = [self.stations[name] for name in generated.names]
+        network = Netzwerk()
+        for station in stations:
+            network.add_station(station)
+        for a, b, duration in generated.edges():
+            network.add_verbindung(Verbindung(stations[a], stations[b], duration))
+        return network
+
+    def query(self, network: Any, start: str, end: str) -> Optional[int]:
+        result = network.shortest_path(self.stations[start], self.stations[end])
+        return result[1] if result is not None else None
+
+
+IMPLEMENTATIONS: Dict[str, type] = {
+    implementation.name: implementation
+    for implementation in (TrafficNetwork, CopilotNetwork, CopilotNetzwerk, KompaktesNetzwerk, ChatGPTNetzwerk)
+}
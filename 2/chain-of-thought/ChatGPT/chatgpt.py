@@ -1,5 +1,6 @@
 from typing import List, Tuple, Optional, Dict
 import heapq
+from itertools import count
 
 class Station:
     """
@@ -77,10 +78,12 @@ class Netzwerk:
         previous: Dict[Station, Optional[Station]] = {station: None for station in self.stations}
         distances[start] = 0
 
-        # Priority Queue für Dijkstras Algorithmus
-        queue: List[Tuple[int, Station]] = [(0, start)]
+        # Priority Queue für Dijkstras Algorithmus; die laufende Nummer entscheidet
+        # bei gleicher Distanz, da Stationen nicht vergleichbar sind
+        order = count()
+        queue: List[Tuple[int, int, Station]] = [(0, next(order), start)]
         while queue:
-            current_distance, current_station = heapq.heappop(queue)
+            current_distance, _, current_station = heapq.heappop(queue)
             if current_station == end:
                 break  # Ziel erreicht
             if current_distance > distances[current_station]:
@@ -92,7 +95,7 @@ class Netzwerk:
                 if distance < distances[neighbor]:
                     distances[neighbor] = distance
                     previous[neighbor] = current_station
-                    heapq.heappush(queue, (distance, neighbor))
+                    heapq.heappush(queue, (distance, next(order), neighbor))
 
         # Wenn das Ziel nicht erreichbar ist
         if distances[end] == float('inf'):
@@ -0,0 +1,407 @@
+"""Kompakte Graphdarstellung des Verkehrsnetzes mit Massenimport und Snapshots.
+
+Das Modul lädt große Netze direkt aus CSV-Dateien in ein kompaktes,
+ganzzahlig indiziertes Adjazenzformat (CSR) und kann dieses als
+versionierten Binär-Snapshot speichern. Snapshots werden per `mmap`
+geöffnet, ohne die Daten zu kopieren oder Python-Objekte je Station
+anzulegen.
+"""
+
+from __future__ import annotations
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import csv
+import heapq
+import mmap
+import os
+import struct
+import sys
+
+from netzwerk import Netzwerk
+from station import Station
+from verbindung import Verbindung
+
+# Snapshot-Format: Kopf gefolgt von 8-Byte-ausgerichteten Abschnitten
+SNAPSHOT_MAGIC = b"VKNETZ\x00\x00"
+SNAPSHOT_VERSION = 1
+_KOPF = struct.Struct("<8sIIqqqq")
+
+
+class _NamenTabelle:
+    """Stationsnamen im Speicher: Liste für Index -> Name, Dict für Name -> Index."""
+
+    def __init__(self, namen: List[str]) -> None:
+        self.namen = namen
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(namen)}
+
+    def __len__(self) -> int:
+        return len(self.namen)
+
+    def name(self, i: int) -> str:
+        return self.namen[i]
+
+    def suche(self, name: str) -> Optional[int]:
+        return self.index.get(name)
+
+
+class _SnapshotNamen:
+    """Stationsnamen direkt aus dem Snapshot.
+
+    Die Namen liegen als UTF-8-Block mit Offsets vor; eine nach Namen
+    sortierte Permutation erlaubt die Suche per Binärsuche, sodass beim
+    Öffnen kein Dict aufgebaut werden muss.
+    """
+
+    def __init__(self, block: memoryview, offsets: Sequence[int], sortiert: Sequence[int]) -> None:
+        self.block = block
+        self.offsets = offsets
+        self.sortiert = sortiert
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def _bytes(self, i: int) -> bytes:
+        return bytes(self.block[self.offsets[i]:self.offsets[i + 1]])
+
+    def name(self, i: int) -> str:
+        return self._bytes(i).decode("utf-8")
+
+    def suche(self, name: str) -> Optional[int]:
+        gesucht = name.encode("utf-8")
+        links, rechts = 0, len(self.sortiert)
+        while links < rechts:
+            mitte = (links + rechts) // 2
+            if self._bytes(self.sortiert[mitte]) < gesucht:
+                links = mitte + 1
+            else:
+                rechts = mitte
+        if links < len(self.sortiert) and self._bytes(self.sortiert[links]) == gesucht:
+            return self.sortiert[links]
+        return None
+
+
+class KompaktesNetzwerk:
+    """Gerichteter Graph im CSR-Format mit ganzzahligen Stationsindizes.
+
+    Die ausgehenden Verbindungen der Station `i` liegen in
+    `ziele[offsets[i]:offsets[i+1]]` mit den zugehörigen `fahrzeiten`.
+    """
+
+    def __init__(self, name: str, namen: Union[_NamenTabelle, _SnapshotNamen],
+                 offsets: Sequence[int], ziele: Sequence[int], fahrzeiten: Sequence[int],
+                 puffer: Optional[mmap.mmap] = None) -> None:
+        """Initialisiert ein kompaktes Netzwerk.
+
+        Args:
+            name: Der Name des Verkehrsnetzes
+            namen: Tabelle der Stationsnamen
+            offsets: Beginn der Verbindungen je Station (Länge Stationen + 1)
+            ziele: Zielstation je Verbindung
+            fahrzeiten: Fahrzeit je Verbindung in Minuten
+            puffer: Zugrunde liegendes mmap bei geöffneten Snapshots
+        """
+        self.name = name
+        self._namen = namen
+        self.offsets = offsets
+        self.ziele = ziele
+        self.fahrzeiten = fahrzeiten
+        self._puffer = puffer
+
+    @property
+    def station_anzahl(self) -> int:
+        """Anzahl der Stationen im Netzwerk."""
+        return len(self._namen)
+
+    @property
+    def verbindung_anzahl(self) -> int:
+        """Anzahl der Verbindungen im Netzwerk."""
+        return len(self.ziele)
+
+    def stationsname(self, index: int) -> str:
+        """Gibt den Namen der Station mit dem gegebenen Index zurück."""
+        return self._namen.name(index)
+
+    def stationsindex(self, name: str) -> int:
+        """Gibt den Index einer Station anhand ihres Namens zurück.
+
+        Raises:
+            ValueError: Wenn die Station nicht existiert
+        """
+        index = self._namen.suche(name)
+        if index is None:
+            raise ValueError(f"Station '{name}' existiert nicht im Netzwerk")
+        return index
+
+    def shortest_path(self, start: str, end: str) -> Tuple[List[str], int]:
+        """Berechnet den kürzesten Pfad zwischen zwei Stationen (Dijkstra).
+
+        Args:
+            start: Name der Startstation
+            end: Name der Zielstation
+
+        Returns:
+            Tuple mit der Liste der Stationsnamen auf dem kürzesten Pfad
+            und der Gesamtfahrzeit in Minuten
+
+        Raises:
+            ValueError: Wenn Start-/Zielstation nicht existiert oder kein Pfad existiert
+        """
+        start_index = self.stationsindex(start)
+        ziel_index = self.stationsindex(end)
+        offsets, ziele, fahrzeiten = self.offsets, self.ziele, self.fahrzeiten
+
+        distanzen = {start_index: 0}
+        vorgaenger = {start_index: -1}
+        warteschlange = [(0, start_index)]
+        while warteschlange:
+            distanz, station = heapq.heappop(warteschlange)
+            if station == ziel_index:
+                break
+            if distanz > distanzen[station]:
+                continue
+            for kante in range(offsets[station], offsets[station + 1]):
+                nachbar = ziele[kante]
+                neue_distanz = distanz + fahrzeiten[kante]
+                if neue_distanz < distanzen.get(nachbar, neue_distanz + 1):
+                    distanzen[nachbar] = neue_distanz
+                    vorgaenger[nachbar] = station
+                    heapq.heappush(warteschlange, (neue_distanz, nachbar))
+
+        if ziel_index not in distanzen:
+            raise ValueError(f"Es existiert kein Pfad zwischen {start} und {end}")
+
+        pfad = []
+        station = ziel_index
+        while station != -1:
+            pfad.append(self._namen.name(station))
+            station = vorgaenger[station]
+        pfad.reverse()
+        return pfad, distanzen[ziel_index]
+
+    def zu_netzwerk(self) -> Netzwerk:
+        """Erzeugt ein vollständiges Netzwerk mit Station- und Verbindungs-Objekten.
+
+        Die Objekte werden direkt angelegt, ohne die Einzelprüfungen von
+        `station_hinzufuegen` und `verbindung_hinzufuegen` zu durchlaufen.
+
+        Returns:
+            Das entsprechende Netzwerk
+        """
+        netz = Netzwerk(self.name)
+        stationen = [Station(self._namen.name(i)) for i in range(self.station_anzahl)]
+        for station in stationen:
+            netz.stationen[station.name] = station
+        for i, station in enumerate(stationen):
+            for kante in range(self.offsets[i], self.offsets[i + 1]):
+                verbindung = Verbindung(station, stationen[self.ziele[kante]], self.fahrzeiten[kante])
+                station.verbindungen.append(verbindung)
+                netz.verbindungen.append(verbindung)
+        return netz
+
+    def schliessen(self) -> None:
+        """Gibt ein zugrunde liegendes mmap frei (nur bei Snapshots nötig)."""
+        if self._puffer is None:
+            return
+        for ansicht in (self.offsets, self.ziele, self.fahrzeiten,
+                        getattr(self._namen, "offsets", None),
+                        getattr(self._namen, "sortiert", None),
+                        getattr(self._namen, "block", None)):
+            if isinstance(ansicht, memoryview):
+                ansicht.release()
+        self._puffer.close()
+        self._puffer = None
+
+    def __enter__(self) -> KompaktesNetzwerk:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.schliessen()
+
+    def __str__(self) -> str:
+        """Gibt eine lesbare String-Darstellung zurück."""
+        return (f"{self.name} mit {self.station_anzahl} Stationen "
+                f"und {self.verbindung_anzahl} Verbindungen (kompakt)")
+
+
+def _zeilen(pfad: str) -> Iterator[List[str]]:
+    """Liest eine CSV-Datei zeilenweise und überspringt die Kopfzeile."""
+    with open(pfad, newline="", encoding="utf-8") as datei:
+        leser = csv.reader(datei)
+        next(leser, None)
+        for zeile in leser:
+            if zeile:
+                yield zeile
+
+
+def lade_csv(stationen_pfad: str, verbindungen_pfad: str,
+             name: str = "Verkehrsnetz") -> KompaktesNetzwerk:
+    """Lädt ein Netzwerk im Massenimport aus zwei CSV-Dateien.
+
+    Die Stationsdatei enthält eine Spalte `name`, die Verbindungsdatei die
+    Spalten `start,ziel,fahrzeit`; beide beginnen mit einer Kopfzeile. Die
+    Dateien werden gestreamt, die Verbindungen in kompakten Arrays gesammelt
+    und anschließend per Counting Sort direkt in das CSR-Format überführt.
+
+    Args:
+        stationen_pfad: Pfad zur CSV-Datei mit den Stationen
+        verbindungen_pfad: Pfad zur CSV-Datei mit den Verbindungen
+        name: Der Name des Verkehrsnetzes
+
+    Returns:
+        Das geladene kompakte Netzwerk
+
+    Raises:
+        ValueError: Bei unbekannten Stationen oder negativen Fahrzeiten
+    """
+    namen: List[str] = []
+    index: Dict[str, int] = {}
+    for zeile in _zeilen(stationen_pfad):
+        stationsname = zeile[0]
+        if stationsname not in index:
+            index[stationsname] = len(namen)
+            namen.append(stationsname)
+
+    starts = array("q")
+    ziele = array("q")
+    fahrzeiten = array("q")
+    for start_name, ziel_name, fahrzeit_text in _zeilen(verbindungen_pfad):
+        start = index.get(start_name)
+        if start is None:
+            raise ValueError(f"Startstation '{start_name}' existiert nicht im Netzwerk")
+        ziel = index.get(ziel_name)
+        if ziel is None:
+            raise ValueError(f"Zielstation '{ziel_name}' existiert nicht im Netzwerk")
+        fahrzeit = int(fahrzeit_text)
+        if fahrzeit < 0:
+            raise ValueError("Fahrzeit darf nicht negativ sein")
+        starts.append(start)
+        ziele.append(ziel)
+        fahrzeiten.append(fahrzeit)
+
+    # Counting Sort nach Startstation ergibt die CSR-Offsets
+    offsets = array("q", bytes(8 * (len(namen) + 1)))
+    for start in starts:
+        offsets[start + 1] += 1
+    for i in range(len(namen)):
+        offsets[i + 1] += offsets[i]
+    position = array("q", offsets[:-1])
+    csr_ziele = array("q", bytes(8 * len(ziele)))
+    csr_fahrzeiten = array("q", bytes(8 * len(ziele)))
+    for start, ziel, fahrzeit in zip(starts, ziele, fahrzeiten):
+        kante = position[start]
+        csr_ziele[kante] = ziel
+        csr_fahrzeiten[kante] = fahrzeit
+        position[start] = kante + 1
+
+    return KompaktesNetzwerk(name, _NamenTabelle(namen), offsets, csr_ziele, csr_fahrzeiten)
+
+
+def _ausrichten(laenge: int) -> int:
+    """Rundet eine Länge auf das nächste Vielfache von 8 auf."""
+    return (laenge + 7) & ~7
+
+
+def _als_array(werte: Sequence[int]) -> array:
+    """Wandelt Werte in ein Little-Endian-Array mit 64-Bit-Ganzzahlen um."""
+    daten = array("q", werte)
+    if sys.byteorder != "little":
+        daten.byteswap()
+    return daten
+
+
+def _snapshot_groesse(stationen: int, verbindungen: int, namens_laenge: int,
+                      block_laenge: int) -> Optional[int]:
+    """Dateigröße eines Snapshots laut Kopf oder None bei negativen Angaben."""
+    if min(stationen, verbindungen, namens_laenge, block_laenge) < 0:
+        return None
+    arrays = (stationen + 1) + 2 * verbindungen + (stationen + 1) + stationen
+    return _KOPF.size + _ausrichten(namens_laenge) + 8 * arrays + block_laenge
+
+
+def speichere_snapshot(netz: KompaktesNetzwerk, pfad: str) -> None:
+    """Speichert ein kompaktes Netzwerk als versionierten Binär-Snapshot.
+
+    Aufbau: Kopf (Magic, Version, Anzahl Stationen, Anzahl Verbindungen,
+    Länge des Netzwerknamens und der Stationsnamen), danach jeweils auf
+    8 Byte ausgerichtet: Netzwerkname, CSR-Offsets, Ziele, Fahrzeiten,
+    Namens-Offsets, nach Namen sortierte Stationsindizes und die
+    UTF-8-kodierten Stationsnamen. Alle Zahlen sind 64-Bit Little Endian.
+
+    Args:
+        netz: Das zu speichernde Netzwerk
+        pfad: Zieldatei
+    """
+    namen = [netz.stationsname(i).encode("utf-8") for i in range(netz.station_anzahl)]
+    namens_offsets = [0]
+    for kodiert in namen:
+        namens_offsets.append(namens_offsets[-1] + len(kodiert))
+    sortiert = sorted(range(len(namen)), key=namen.__getitem__)
+    netzname = netz.name.encode("utf-8")
+    block = b"".join(namen)
+
+    with open(pfad, "wb") as datei:
+        datei.write(_KOPF.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, netz.station_anzahl,
+                               netz.verbindung_anzahl, len(netzname), len(block)))
+        datei.write(netzname.ljust(_ausrichten(len(netzname)), b"\x00"))
+        for werte in (netz.offsets, netz.ziele, netz.fahrzeiten, namens_offsets, sortiert):
+            datei.write(_als_array(werte).tobytes())
+        datei.write(block)
+
+
+def oeffne_snapshot(pfad: str) -> KompaktesNetzwerk:
+    """Öffnet einen Binär-Snapshot per `mmap`, ohne die Daten zu kopieren.
+
+    Die Arrays des Netzwerks sind direkte Ansichten auf die Datei; das
+    Öffnen ist daher unabhängig von der Netzgröße. Das Netzwerk sollte nach
+    Gebrauch mit `schliessen()` (oder als Context Manager) freigegeben werden.
+
+    Args:
+        pfad: Pfad zur Snapshot-Datei
+
+    Returns:
+        Das kompakte Netzwerk auf Basis des Snapshots
+
+    Raises:
+        ValueError: Wenn die Datei kein gültiger Snapshot ist oder die
+            Version nicht unterstützt wird
+    """
+    with open(pfad, "rb") as datei:
+        # Leere Dateien lassen sich nicht mappen; zu kurze sind ohnehin ungültig
+        if os.fstat(datei.fileno()).st_size < _KOPF.size:
+            raise ValueError(f"'{pfad}' ist kein gültiger Netzwerk-Snapshot")
+        puffer = mmap.mmap(datei.fileno(), 0, access=mmap.ACCESS_READ)
+
+    (magic, version, _, stationen, verbindungen,
+     namens_laenge, block_laenge) = _KOPF.unpack_from(puffer, 0)
+    if magic != SNAPSHOT_MAGIC:
+        puffer.close()
+        raise ValueError(f"'{pfad}' ist kein gültiger Netzwerk-Snapshot")
+    if version != SNAPSHOT_VERSION:
+        puffer.close()
+        raise ValueError(f"Nicht unterstützte Snapshot-Version {version} (erwartet {SNAPSHOT_VERSION})")
+    # Abgeschnittene oder verlängerte Dateien passen nicht zu den Längen im Kopf
+    if _snapshot_groesse(stationen, verbindungen, namens_laenge, block_laenge) != len(puffer):
+        puffer.close()
+        raise ValueError(f"'{pfad}' ist kein gültiger Netzwerk-Snapshot")
+
+    position = _KOPF.size
+    netzname = bytes(puffer[position:position + namens_laenge]).decode("utf-8")
+    position += _ausrichten(namens_laenge)
+
+    ansicht = memoryview(puffer)
+    abschnitte = []
+    for anzahl in (stationen + 1, verbindungen, verbindungen, stationen + 1, stationen):
+        teil = ansicht[position:position + 8 * anzahl]
+        if sys.byteorder == "little":
+            abschnitte.append(teil.cast("q"))
+        else:
+            daten = array("q", teil.tobytes())
+            daten.byteswap()
+            abschnitte.append(daten)
+        position += 8 * anzahl
+    block = ansicht[position:position + block_laenge]
+    ansicht.release()
+
+    offsets, ziele, fahrzeiten, namens_offsets, sortiert = abschnitte
+    namen = _SnapshotNamen(block, namens_offsets, sortiert)
+    return KompaktesNetzwerk(netzname, namen, offsets, ziele, fahrzeiten, puffer)
@@ -1,8 +1,10 @@
 from __future__ import annotations
-from typing import Dict, List, Tuple, Union, Optional
+from typing import Dict, Hashable, List, Tuple, Union, Optional
+from itertools import count
 import heapq
 
 from station import Station
+from stationssuche import StationsIndex
 from verbindung import Verbindung
 
 class Netzwerk:
@@ -17,6 +19,8 @@ class Netzwerk:
         self.name = name
         self.stationen: Dict[str, Station] = {}
         self.verbindungen: List[Verbindung] = []
+        # Suchindex über die Stationsnamen, wird bei der ersten Suche aufgebaut
+        self._suchindex: Optional[StationsIndex] = None
     
     def station_hinzufuegen(self, name: str) -> Station:
         """Fügt eine neue Station zum Netzwerk hinzu.
@@ -30,16 +34,20 @@ class Netzwerk:
         if name not in self.stationen:
             station = Station(name)
             self.stationen[name] = station
+            if self._suchindex is not None:
+                self._suchindex.hinzufuegen(name)
             return station
         return self.stationen[name]
     
-    def verbindung_hinzufuegen(self, start_name: str, ziel_name: str, fahrzeit: int) -> Verbindung:
+    def verbindung_hinzufuegen(self, start_name: str, ziel_name: str, fahrzeit: int,
+                               linie: Optional[str] = None) -> Verbindung:
         """Fügt eine neue Verbindung zwischen zwei Stationen hinzu.
         
         Args:
             start_name: Name der Ausgangsstation
             ziel_name: Name der Zielstation
             fahrzeit: Fahrzeit in Minuten
+            linie: Linie der Verbindung, relevant für Umstiegszeiten (optional)
             
         Returns:
             Die erstellte Verbindung
@@ -55,8 +63,10 @@ class Netzwerk:
         start_station = self.stationen[start_name]
         ziel_station = self.stationen[ziel_name]
         
-        verbindung = start_station.verbinde_mit(ziel_station, fahrzeit)
+        verbindung = start_station.verbinde_mit(ziel_station, fahrzeit, linie)
         self.verbindungen.append(verbindung)
+        if self._suchindex is not None:
+            self._suchindex.hinzufuegen(start_name, len(start_station.verbindungen))
         
         return verbindung
     
@@ -71,6 +81,37 @@ class Netzwerk:
         """
         return self.stationen.get(name)
     
+    def suchindex(self) -> StationsIndex:
+        """Gibt den Suchindex über die Stationsnamen zurück.
+        
+        Der Index wird beim ersten Aufruf in einem Durchgang aufgebaut und
+        danach bei jeder neuen Station und Verbindung aktualisiert. Stationen
+        mit mehr Verbindungen stehen in den Vervollständigungen weiter vorne.
+        
+        Returns:
+            Der Suchindex des Netzwerks
+        """
+        if self._suchindex is None:
+            self._suchindex = StationsIndex.aufbauen(
+                (name, len(station.verbindungen)) for name, station in self.stationen.items())
+        return self._suchindex
+    
+    def stationen_suchen(self, anfrage: str, anzahl: int = 10) -> List[Station]:
+        """Sucht Stationen für die Autovervollständigung.
+        
+        Liefert zuerst Stationen, deren Name mit der Anfrage beginnt, und
+        ergänzt sie um ähnlich geschriebene Stationen (Tippfehlertoleranz).
+        Groß-/Kleinschreibung und Umlaute/Akzente werden ignoriert.
+        
+        Args:
+            anfrage: Bisher eingegebener Stationsname
+            anzahl: Maximale Anzahl der Ergebnisse
+            
+        Returns:
+            Liste der passenden Station-Objekte
+        """
+        return [self.stationen[name] for name in self.suchindex().suchen(anfrage, anzahl)]
+    
     def get_alle_stationen(self) -> List[Station]:
         """Gibt alle Stationen im Netzwerk zurück.
         
@@ -87,7 +128,8 @@ class Netzwerk:
         """
         return self.verbindungen
     
-    def shortest_path(self, start: Union[str, Station], end: Union[str, Station]) -> Tuple[List[Station], int]:
+    def shortest_path(self, start: Union[str, Station], end: Union[str, Station],
+                      umstiegszeiten: Union[int, Dict[str, int], None] = None) -> Tuple[List[Station], int]:
         """Berechnet den kürzesten Pfad zwischen zwei Stationen.
         
         Implementiert den Dijkstra-Algorithmus zur Pfadsuche basierend auf
@@ -96,6 +138,9 @@ class Netzwerk:
         Args:
             start: Startstation (Name oder Station-Objekt)
             end: Zielstation (Name oder Station-Objekt)
+            umstiegszeiten: Zeit in Minuten, die beim Wechsel der Linie
+                hinzukommt, einheitlich oder je Stationsname (optional,
+                siehe _shortest_path_mit_linien)
             
         Returns:
             Tuple mit der Liste der Stationen auf dem kürzesten Pfad 
@@ -107,19 +152,23 @@ class Netzwerk:
         # Eingabeparameter in Station-Objekte umwandeln
         start_station = self._get_station_object(start)
         end_station = self._get_station_object(end)
+        if umstiegszeiten is not None:
+            return self._shortest_path_mit_linien(start_station, end_station, umstiegszeiten)
         
         # Initialisierung für Dijkstra-Algorithmus
         unbesuchte_stationen = []
+        # Laufende Nummer bei gleicher Distanz, da Stationen nicht vergleichbar sind
+        zaehler = count()
         distanzen = {station: float('infinity') for station in self.get_alle_stationen()}
         vorgaenger = {station: None for station in self.get_alle_stationen()}
         
         # Startdistanz auf 0 setzen
         distanzen[start_station] = 0
-        heapq.heappush(unbesuchte_stationen, (0, start_station))
+        heapq.heappush(unbesuchte_stationen, (0, next(zaehler), start_station))
         
         while unbesuchte_stationen:
             # Station mit kleinster Distanz auswählen
-            aktuelle_distanz, aktuelle_station = heapq.heappop(unbesuchte_stationen)
+            aktuelle_distanz, _, aktuelle_station = heapq.heappop(unbesuchte_stationen)
             
             # Wenn die Zielstation erreicht wurde, ist der kürzeste Pfad gefunden
             if aktuelle_station == end_station:
@@ -138,7 +187,7 @@ class Netzwerk:
                 if distanz < distanzen[nachbar]:
                     distanzen[nachbar] = distanz
                     vorgaenger[nachbar] = aktuelle_station
-                    heapq.heappush(unbesuchte_stationen, (distanz, nachbar))
+                    heapq.heappush(unbesuchte_stationen, (distanz, next(zaehler), nachbar))
         
         # Wenn kein Pfad gefunden wurde
         if distanzen[end_station] == float('infinity'):
@@ -155,6 +204,87 @@ class Netzwerk:
         
         return pfad, distanzen[end_station]
     
+    def _shortest_path_mit_linien(self, start_station: Station, end_station: Station,
+                                  umstiegszeiten: Union[int, Dict[str, int]]) -> Tuple[List[Station], int]:
+        """Dijkstra über Zustände (Station, Linie) mit Umstiegszeiten.
+        
+        Der linienexpandierte Graph wird nicht aufgebaut: Ein Zustand entsteht
+        erst, wenn die Suche eine Station tatsächlich über eine Linie erreicht.
+        Wer mit einer anderen Linie weiterfährt, als er angekommen ist, zahlt
+        die Umstiegszeit der Station; an der Startstation ist jede Linie frei.
+        Ein Zustand entfällt, wenn die Station schon mindestens um die
+        Umstiegszeit früher erreicht ist, da von dort jede Weiterfahrt
+        ebenso schnell möglich ist.
+        
+        Args:
+            start_station: Die Startstation
+            end_station: Die Zielstation
+            umstiegszeiten: Einheitliche Umstiegszeit oder Umstiegszeit je
+                Stationsname (fehlende Stationen: 0 Minuten)
+            
+        Returns:
+            Tuple mit der Liste der Stationen und der Gesamtfahrzeit in Minuten
+                
+        Raises:
+            ValueError: Wenn kein Pfad existiert
+        """
+        def umstiegszeit(station: Station) -> int:
+            if isinstance(umstiegszeiten, dict):
+                return umstiegszeiten.get(station.name, 0)
+            return umstiegszeiten
+        
+        # Ankunftslinie an der Startstation: passt zu keiner Linie, kostet aber nichts
+        einstieg = object()
+        Zustand = Tuple[Station, Hashable]
+        distanzen: Dict[Zustand, int] = {(start_station, einstieg): 0}
+        vorgaenger: Dict[Zustand, Optional[Zustand]] = {(start_station, einstieg): None}
+        # Früheste bekannte Ankunft je Station über alle Linien
+        beste: Dict[Station, int] = {start_station: 0}
+        # Der Zähler entscheidet bei gleicher Distanz, damit Stationen nie verglichen werden
+        zaehler = count()
+        warteschlange = [(0, next(zaehler), start_station, einstieg)]
+        ziel: Optional[Zustand] = None
+        
+        while warteschlange:
+            aktuelle_distanz, _, aktuelle_station, aktuelle_linie = heapq.heappop(warteschlange)
+            zustand = (aktuelle_station, aktuelle_linie)
+            if aktuelle_distanz > distanzen[zustand]:
+                continue
+            if aktuelle_station == end_station:
+                ziel = zustand
+                break
+            
+            umstieg = 0 if aktuelle_linie is einstieg else umstiegszeit(aktuelle_station)
+            for verbindung in aktuelle_station.get_verbindungen():
+                nachbar = verbindung.ziel_station
+                distanz = aktuelle_distanz + verbindung.fahrzeit
+                if verbindung.linie != aktuelle_linie:
+                    distanz += umstieg
+                
+                # Eine frühere Ankunft samt Umstieg ist mindestens genauso gut
+                bekannt = beste.get(nachbar)
+                if bekannt is not None and distanz >= bekannt + umstiegszeit(nachbar):
+                    continue
+                naechster = (nachbar, verbindung.linie)
+                if distanz < distanzen.get(naechster, float('infinity')):
+                    distanzen[naechster] = distanz
+                    vorgaenger[naechster] = zustand
+                    if bekannt is None or distanz < bekannt:
+                        beste[nachbar] = distanz
+                    heapq.heappush(warteschlange, (distanz, next(zaehler), nachbar, verbindung.linie))
+        
+        if ziel is None:
+            raise ValueError(f"Es existiert kein Pfad zwischen {start_station.name} und {end_station.name}")
+        
+        pfad = []
+        schritt: Optional[Zustand] = ziel
+        while schritt is not None:
+            pfad.append(schritt[0])
+            schritt = vorgaenger[schritt]
+        pfad.reverse()
+        
+        return pfad, distanzen[ziel]
+    
     def _get_station_object(self, station: Union[str, Station]) -> Station:
         """Hilfsmethod zum Umwandeln von Stationsnamen in Station-Objekte.
         
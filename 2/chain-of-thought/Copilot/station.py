@@ -17,18 +17,20 @@ class Station:
         self.name = name
         self.verbindungen: List[Verbindung] = []
     
-    def verbinde_mit(self, ziel_station: Station, fahrzeit: int) -> Verbindung:
+    def verbinde_mit(self, ziel_station: Station, fahrzeit: int,
+                     linie: Optional[str] = None) -> Verbindung:
         """Erstellt eine neue Verbindung zu einer anderen Station.
         
         Args:
             ziel_station: Die Zielstation
             fahrzeit: Die Fahrzeit in Minuten
+            linie: Die Linie der Verbindung (optional)
             
         Returns:
             Die erstellte Verbindung
         """
         from verbindung import Verbindung
-        verbindung = Verbindung(self, ziel_station, fahrzeit)
+        verbindung = Verbindung(self, ziel_station, fahrzeit, linie)
         self.verbindungen.append(verbindung)
         return verbindung
     
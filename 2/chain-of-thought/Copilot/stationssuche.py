@@ -0,0 +1,306 @@
+"""Präfix- und Unscharfsuche über Stationsnamen.
+
+Ein komprimierter Trie liefert Vervollständigungen zu einem Präfix; jeder
+Knoten hält die bestplatzierten Stationen seines Teilbaums vor, sodass eine
+Anfrage nur den Präfix ablaufen muss. Ein Trigramm-Index findet Stationen
+auch bei Tippfehlern.
+"""
+
+from __future__ import annotations
+from bisect import insort
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import heapq
+import re
+import unicodedata
+
+# Eintrag einer Bestenliste: (negatives Gewicht, Name), aufsteigend sortiert
+_Eintrag = Tuple[int, str]
+
+# Folgen von Satz- und Leerzeichen, die zu einem Leerzeichen werden
+_TRENNER = re.compile(r"[\W_]+")
+
+
+def normalisieren(text: str) -> str:
+    """Vereinheitlicht einen Stationsnamen für die Suche.
+
+    Groß-/Kleinschreibung und diakritische Zeichen werden ignoriert,
+    Satzzeichen werden zu Leerzeichen und mehrfache Leerzeichen zusammengefasst.
+
+    Args:
+        text: Stationsname oder Suchanfrage
+
+    Returns:
+        Der normalisierte Text
+    """
+    if text.isascii():
+        zerlegt = text.lower()
+    else:
+        zerlegt = "".join(z for z in unicodedata.normalize("NFKD", text.casefold())
+                          if not unicodedata.combining(z))
+    return _TRENNER.sub(" ", zerlegt).strip()
+
+
+def _trigramme(schluessel: str) -> Set[str]:
+    """Trigramme eines normalisierten Namens, am Anfang und Ende aufgefüllt."""
+    aufgefuellt = f"  {schluessel} "
+    return {aufgefuellt[i:i + 3] for i in range(len(aufgefuellt) - 2)}
+
+
+class _Knoten:
+    """Knoten des komprimierten Tries."""
+
+    __slots__ = ("kante", "kinder", "namen", "beste")
+
+    def __init__(self, kante: str) -> None:
+        self.kante = kante
+        self.kinder: Dict[str, _Knoten] = {}
+        # Stationsnamen, deren normalisierter Schlüssel genau hier endet
+        self.namen: List[str] = []
+        self.beste: List[_Eintrag] = []
+
+
+class StationsIndex:
+    """Suchindex über Stationsnamen für Autovervollständigung.
+
+    Vervollständigungen sind nach Gewicht (z. B. Anzahl der Verbindungen)
+    und danach alphabetisch geordnet. Gewichte können nur steigen; ein
+    erneutes `hinzufuegen` mit kleinerem Gewicht ändert nichts.
+    """
+
+    def __init__(self, bestenliste: int = 10) -> None:
+        """Initialisiert einen leeren Index.
+
+        Args:
+            bestenliste: Anzahl der Vervollständigungen, die je Trie-Knoten
+                vorgehalten werden
+        """
+        self.bestenliste = bestenliste
+        self._wurzel = _Knoten("")
+        self._gewichte: Dict[str, int] = {}
+        self._namen: List[str] = []
+        self._trigramme: Dict[str, List[int]] = {}
+
+    @classmethod
+    def aufbauen(cls, stationen: Iterable[Tuple[str, int]], bestenliste: int = 10) -> StationsIndex:
+        """Baut einen Index für viele Stationen auf einmal auf.
+
+        Die Bestenlisten werden erst am Ende in einem Durchlauf von den
+        Blättern zur Wurzel berechnet statt bei jedem Einfügen.
+
+        Args:
+            stationen: Paare aus Stationsname und Gewicht
+            bestenliste: Anzahl der vorgehaltenen Vervollständigungen je Knoten
+
+        Returns:
+            Der aufgebaute Index
+        """
+        index = cls(bestenliste)
+        for name, gewicht in stationen:
+            if name in index._gewichte:
+                index._gewichte[name] = max(index._gewichte[name], gewicht)
+                continue
+            index._gewichte[name] = gewicht
+            index._einfuegen(name)
+        index._bestenlisten_berechnen(index._wurzel)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._namen)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._gewichte
+
+    def hinzufuegen(self, name: str, gewicht: int = 0) -> None:
+        """Fügt eine Station hinzu oder erhöht ihr Gewicht.
+
+        Args:
+            name: Name der Station
+            gewicht: Gewicht für die Reihenfolge der Vervollständigungen
+        """
+        bisher = self._gewichte.get(name)
+        if bisher is not None and gewicht <= bisher:
+            return
+        if bisher is None:
+            pfad = self._einfuegen(name)
+        else:
+            pfad = self._pfad(normalisieren(name))
+        self._gewichte[name] = gewicht
+        for knoten in pfad:
+            self._vormerken(knoten, name, bisher, gewicht)
+
+    def _einfuegen(self, name: str) -> List[_Knoten]:
+        """Fügt einen neuen Namen in Trie und Trigramm-Index ein.
+
+        Returns:
+            Die Knoten von der Wurzel bis zum Knoten des Namens
+        """
+        schluessel = normalisieren(name)
+        nummer = len(self._namen)
+        self._namen.append(name)
+        for trigramm in _trigramme(schluessel):
+            self._trigramme.setdefault(trigramm, []).append(nummer)
+
+        knoten, rest = self._wurzel, schluessel
+        pfad = [knoten]
+        while rest:
+            kind = knoten.kinder.get(rest[0])
+            if kind is None:
+                kind = _Knoten(rest)
+                knoten.kinder[rest[0]] = kind
+                pfad.append(kind)
+                knoten = kind
+                break
+            if rest.startswith(kind.kante):
+                gemeinsam = len(kind.kante)
+            else:
+                gemeinsam = 1
+                while gemeinsam < len(rest) and kind.kante[gemeinsam] == rest[gemeinsam]:
+                    gemeinsam += 1
+            if gemeinsam < len(kind.kante):
+                # Kante aufteilen: neuer Zwischenknoten für den gemeinsamen Teil
+                mitte = _Knoten(kind.kante[:gemeinsam])
+                mitte.beste = list(kind.beste)
+                kind.kante = kind.kante[gemeinsam:]
+                mitte.kinder[kind.kante[0]] = kind
+                knoten.kinder[rest[0]] = mitte
+                kind = mitte
+            knoten = kind
+            pfad.append(knoten)
+            rest = rest[gemeinsam:]
+        knoten.namen.append(name)
+        return pfad
+
+    def _pfad(self, schluessel: str) -> List[_Knoten]:
+        """Knoten von der Wurzel bis zum Knoten eines vorhandenen Schlüssels."""
+        knoten, rest = self._wurzel, schluessel
+        pfad = [knoten]
+        while rest:
+            knoten = knoten.kinder[rest[0]]
+            pfad.append(knoten)
+            rest = rest[len(knoten.kante):]
+        return pfad
+
+    def _vormerken(self, knoten: _Knoten, name: str, bisher: Optional[int], gewicht: int) -> None:
+        """Trägt einen Namen mit neuem Gewicht in die Bestenliste eines Knotens ein."""
+        beste = knoten.beste
+        if bisher is not None and (-bisher, name) in beste:
+            beste.remove((-bisher, name))
+        eintrag = (-gewicht, name)
+        if len(beste) < self.bestenliste or eintrag < beste[-1]:
+            insort(beste, eintrag)
+            del beste[self.bestenliste:]
+
+    def _bestenlisten_berechnen(self, wurzel: _Knoten) -> None:
+        """Berechnet alle Bestenlisten von den Blättern zur Wurzel."""
+        reihenfolge = [wurzel]
+        for knoten in reihenfolge:
+            reihenfolge.extend(knoten.kinder.values())
+        for knoten in reversed(reihenfolge):
+            kandidaten = [(-self._gewichte[name], name) for name in knoten.namen]
+            for kind in knoten.kinder.values():
+                kandidaten.extend(kind.beste)
+            knoten.beste = heapq.nsmallest(self.bestenliste, kandidaten)
+
+    def _knoten_zu_praefix(self, praefix: str) -> Optional[_Knoten]:
+        """Knoten, dessen Teilbaum genau die Schlüssel mit dem Präfix enthält."""
+        knoten, rest = self._wurzel, praefix
+        while rest:
+            kind = knoten.kinder.get(rest[0])
+            if kind is None:
+                return None
+            if kind.kante.startswith(rest):
+                return kind
+            if not rest.startswith(kind.kante):
+                return None
+            rest = rest[len(kind.kante):]
+            knoten = kind
+        return knoten
+
+    def vervollstaendigen(self, praefix: str, anzahl: int = 10) -> List[str]:
+        """Liefert Stationen, deren Name mit dem Präfix beginnt.
+
+        Bis zur Größe der Bestenliste wird die vorberechnete Liste des
+        Trie-Knotens zurückgegeben, darüber hinaus wird der Teilbaum
+        durchsucht.
+
+        Args:
+            praefix: Beginn des Stationsnamens
+            anzahl: Maximale Anzahl der Ergebnisse
+
+        Returns:
+            Stationsnamen, absteigend nach Gewicht
+        """
+        knoten = self._knoten_zu_praefix(normalisieren(praefix))
+        if knoten is None:
+            return []
+        if anzahl <= self.bestenliste:
+            return [name for _, name in knoten.beste[:anzahl]]
+        kandidaten: List[_Eintrag] = []
+        offen = [knoten]
+        while offen:
+            aktuell = offen.pop()
+            kandidaten.extend((-self._gewichte[name], name) for name in aktuell.namen)
+            offen.extend(aktuell.kinder.values())
+        return [name for _, name in heapq.nsmallest(anzahl, kandidaten)]
+
+    def unscharf_suchen(self, anfrage: str, anzahl: int = 10,
+                        mindestaehnlichkeit: float = 0.3) -> List[Tuple[str, float]]:
+        """Sucht Stationen mit ähnlichem Namen, auch bei Tippfehlern.
+
+        Kandidaten werden über seltene Trigramme der Anfrage gefunden und
+        anschließend nach dem Dice-Koeffizienten der Trigrammmengen bewertet.
+
+        Args:
+            anfrage: Gesuchter (ggf. falsch geschriebener) Name
+            anzahl: Maximale Anzahl der Ergebnisse
+            mindestaehnlichkeit: Kleinste Ähnlichkeit zwischen 0 und 1
+
+        Returns:
+            Paare aus Stationsname und Ähnlichkeit, absteigend sortiert
+        """
+        gesucht = _trigramme(normalisieren(anfrage))
+        listen = sorted((self._trigramme[t] for t in gesucht if t in self._trigramme), key=len)
+        if not listen:
+            return []
+
+        # Sehr häufige Trigramme tragen kaum zur Auswahl bei und werden
+        # übersprungen, sobald seltenere Trigramme Kandidaten geliefert haben
+        grenze = max(1000, len(self._namen) // 20)
+        treffer: Dict[int, int] = {}
+        for liste in listen:
+            if treffer and len(liste) > grenze:
+                break
+            for nummer in liste:
+                treffer[nummer] = treffer.get(nummer, 0) + 1
+
+        kandidaten = heapq.nlargest(max(anzahl * 20, 200), treffer, key=treffer.__getitem__)
+        bewertet = []
+        for nummer in kandidaten:
+            name = self._namen[nummer]
+            trigramme = _trigramme(normalisieren(name))
+            aehnlichkeit = 2 * len(gesucht & trigramme) / (len(gesucht) + len(trigramme))
+            if aehnlichkeit >= mindestaehnlichkeit:
+                bewertet.append((-aehnlichkeit, -self._gewichte[name], name))
+        return [(name, -aehnlichkeit) for aehnlichkeit, _, name in heapq.nsmallest(anzahl, bewertet)]
+
+    def suchen(self, anfrage: str, anzahl: int = 10) -> List[str]:
+        """Autovervollständigung mit Tippfehlertoleranz.
+
+        Zuerst kommen die Vervollständigungen des Präfixes; reichen sie nicht
+        aus, wird mit Ergebnissen der Unscharfsuche aufgefüllt.
+
+        Args:
+            anfrage: Bisher eingegebener Text
+            anzahl: Maximale Anzahl der Ergebnisse
+
+        Returns:
+            Stationsnamen
+        """
+        ergebnis = self.vervollstaendigen(anfrage, anzahl)
+        if len(ergebnis) < anzahl:
+            vorhanden = set(ergebnis)
+            for name, _ in self.unscharf_suchen(anfrage, anzahl):
+                if name not in vorhanden and len(ergebnis) < anzahl:
+                    ergebnis.append(name)
+                    vorhanden.add(name)
+        return ergebnis
@@ -0,0 +1,157 @@
+"""
+Testmodul für das kompakte Netzwerk: CSV-Import, Snapshots und Routensuche.
+
+Die Suchen werden auf kleinen Zufallsnetzen mit einer unabhängigen
+Referenz (Bellman-Ford über alle gerichteten Verbindungen) verglichen.
+"""
+
+import os
+import random
+import tempfile
+
+from kompaktnetz import SNAPSHOT_MAGIC, lade_csv, oeffne_snapshot, speichere_snapshot
+
+
+def _zufallsnetz(rng, verzeichnis, anzahl_stationen=12, anzahl_verbindungen=25):
+    """Schreibt ein Zufallsnetz als CSV; liefert (Stationsnamen, Verbindungen, Pfade)."""
+    namen = [f"Station {i}" for i in range(anzahl_stationen - 1)] + ["Köln Hbf"]
+    verbindungen = [(*rng.sample(namen, 2), rng.randint(0, 9)) for _ in range(anzahl_verbindungen)]
+    stationen_pfad = os.path.join(verzeichnis, "stationen.csv")
+    verbindungen_pfad = os.path.join(verzeichnis, "verbindungen.csv")
+    with open(stationen_pfad, "w", encoding="utf-8") as datei:
+        datei.write("name\n" + "".join(f"{name}\n" for name in namen))
+    with open(verbindungen_pfad, "w", encoding="utf-8") as datei:
+        datei.write("start,ziel,fahrzeit\n")
+        datei.writelines(f"{start},{ziel},{fahrzeit}\n" for start, ziel, fahrzeit in verbindungen)
+    return namen, verbindungen, (stationen_pfad, verbindungen_pfad)
+
+
+def _referenz_distanzen(verbindungen, start):
+    """Fahrzeiten ab `start` per Bellman-Ford; nicht erreichbare Stationen fehlen."""
+    distanzen = {start: 0}
+    geaendert = True
+    while geaendert:
+        geaendert = False
+        for von, nach, fahrzeit in verbindungen:
+            if von in distanzen and distanzen[von] + fahrzeit < distanzen.get(nach, float('inf')):
+                distanzen[nach] = distanzen[von] + fahrzeit
+                geaendert = True
+    return distanzen
+
+
+def _pfad_fahrzeit(verbindungen, pfad):
+    """Fahrzeit eines Pfads über die jeweils schnellste direkte Verbindung."""
+    return sum(min(fahrzeit for von, nach, fahrzeit in verbindungen if (von, nach) == (a, b))
+               for a, b in zip(pfad, pfad[1:]))
+
+
+def _pruefe_kuerzeste_wege(netz, namen, verbindungen):
+    """Vergleicht alle Paare von Stationen mit der Referenz."""
+    for start in namen:
+        erwartet = _referenz_distanzen(verbindungen, start)
+        for ziel in namen:
+            try:
+                pfad, fahrzeit = netz.shortest_path(start, ziel)
+            except ValueError:
+                assert ziel not in erwartet
+                continue
+            assert fahrzeit == erwartet[ziel]
+            assert pfad[0] == start and pfad[-1] == ziel
+            assert _pfad_fahrzeit(verbindungen, pfad) == fahrzeit
+
+
+def test_lade_csv():
+    """Das geladene Netz entspricht den CSV-Dateien."""
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        for _ in range(20):
+            namen, verbindungen, pfade = _zufallsnetz(rng, verzeichnis)
+            netz = lade_csv(*pfade, name="Testnetz")
+            assert netz.station_anzahl == len(namen)
+            assert netz.verbindung_anzahl == len(verbindungen)
+            assert [netz.stationsname(netz.stationsindex(name)) for name in namen] == namen
+            _pruefe_kuerzeste_wege(netz, namen, verbindungen)
+
+            # Die Objektdarstellung liefert dieselben Fahrzeiten
+            objektnetz = netz.zu_netzwerk()
+            start = rng.choice(namen)
+            erwartet = _referenz_distanzen(verbindungen, start)
+            for ziel in erwartet:
+                assert objektnetz.shortest_path(start, ziel)[1] == erwartet[ziel]
+
+
+def test_lade_csv_fehler():
+    """Unbekannte Stationen und negative Fahrzeiten werden abgewiesen."""
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        _, _, (stationen_pfad, verbindungen_pfad) = _zufallsnetz(random.Random(1), verzeichnis)
+        for zeile, meldung in [("A,Station 0,3", "Startstation 'A'"),
+                               ("Station 0,B,3", "Zielstation 'B'"),
+                               ("Station 0,Station 1,-1", "negativ")]:
+            with open(verbindungen_pfad, "a", encoding="utf-8") as datei:
+                datei.write(zeile + "\n")
+            try:
+                lade_csv(stationen_pfad, verbindungen_pfad)
+            except ValueError as fehler:
+                assert meldung in str(fehler)
+            else:
+                raise AssertionError(f"'{zeile}' muss einen Fehler auslösen")
+            _zufallsnetz(random.Random(1), verzeichnis)
+
+        netz = lade_csv(stationen_pfad, verbindungen_pfad)
+        try:
+            netz.stationsindex("Unbekannt")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Unbekannte Station muss einen Fehler auslösen")
+
+
+def test_snapshot():
+    """Ein geöffneter Snapshot verhält sich wie das gespeicherte Netz."""
+    rng = random.Random(2)
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        snapshot_pfad = os.path.join(verzeichnis, "netz.bin")
+        for _ in range(20):
+            namen, verbindungen, pfade = _zufallsnetz(rng, verzeichnis)
+            original = lade_csv(*pfade, name="Netz äöü")
+            speichere_snapshot(original, snapshot_pfad)
+            with oeffne_snapshot(snapshot_pfad) as netz:
+                assert netz.name == "Netz äöü"
+                assert list(netz.offsets) == list(original.offsets)
+                assert list(netz.ziele) == list(original.ziele)
+                assert list(netz.fahrzeiten) == list(original.fahrzeiten)
+                for name in namen:
+                    assert netz.stationsindex(name) == original.stationsindex(name)
+                _pruefe_kuerzeste_wege(netz, namen, verbindungen)
+            assert netz._puffer is None
+
+
+def test_snapshot_ungueltig():
+    """Fremde, abgeschnittene Dateien und unbekannte Versionen werden abgewiesen."""
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        pfad = os.path.join(verzeichnis, "netz.bin")
+        _, _, pfade = _zufallsnetz(random.Random(3), verzeichnis)
+        speichere_snapshot(lade_csv(*pfade), pfad)
+        with open(pfad, "rb") as datei:
+            inhalt = datei.read()
+
+        for daten, meldung in [(b"", "kein gültiger"), (inhalt[:20], "kein gültiger"),
+                               (b"X" + inhalt[1:], "kein gültiger"),
+                               (inhalt[:-5], "kein gültiger"), (inhalt[:200], "kein gültiger"),
+                               (inhalt[:100], "kein gültiger"), (inhalt + b"\0", "kein gültiger"),
+                               (SNAPSHOT_MAGIC + b"\x63" + inhalt[9:], "Version 99")]:
+            with open(pfad, "wb") as datei:
+                datei.write(daten)
+            try:
+                oeffne_snapshot(pfad)
+            except ValueError as fehler:
+                assert meldung in str(fehler)
+            else:
+                raise AssertionError(f"'{meldung}' muss einen Fehler auslösen")
+
+
+if __name__ == "__main__":
+    test_lade_csv()
+    test_lade_csv_fehler()
+    test_snapshot()
+    test_snapshot_ungueltig()
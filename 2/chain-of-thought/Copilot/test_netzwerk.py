@@ -0,0 +1,92 @@
+"""
+Testmodul für die Routensuche im Netzwerk.
+
+Die Suchen werden auf kleinen gerichteten Zufallsnetzen mit einer
+unabhängigen Referenz (Bellman-Ford über alle Verbindungen bzw. über alle
+Zustände aus Station und Linie) verglichen.
+"""
+
+import random
+
+from netzwerk import Netzwerk
+
+
+def _zufallsnetz(rng, anzahl_stationen=10, anzahl_verbindungen=20, linien=3):
+    """Gerichtetes Zufallsnetz; liefert (Netz, Stationsnamen)."""
+    netz = Netzwerk("Testnetz")
+    namen = [f"S{i}" for i in range(anzahl_stationen)]
+    for name in namen:
+        netz.station_hinzufuegen(name)
+    for _ in range(anzahl_verbindungen):
+        start, ziel = rng.sample(namen, 2)
+        netz.verbindung_hinzufuegen(start, ziel, rng.randint(1, 9), f"L{rng.randrange(linien)}")
+    return netz, namen
+
+
+def _referenz_fahrzeit(netz, start, ziel, umstiegszeiten):
+    """Fahrzeit per Bellman-Ford über alle Zustände (Station, Ankunftslinie)."""
+    def umstiegszeit(name):
+        if isinstance(umstiegszeiten, dict):
+            return umstiegszeiten.get(name, 0)
+        return umstiegszeiten
+
+    einstieg = object()
+    distanzen = {(start, einstieg): 0}
+    geaendert = True
+    while geaendert:
+        geaendert = False
+        for (station, linie), distanz in list(distanzen.items()):
+            for verbindung in netz.stationen[station].get_verbindungen():
+                neu = distanz + verbindung.fahrzeit
+                if linie is not einstieg and linie != verbindung.linie:
+                    neu += umstiegszeit(station)
+                zustand = (verbindung.ziel_station.name, verbindung.linie)
+                if neu < distanzen.get(zustand, float('infinity')):
+                    distanzen[zustand] = neu
+                    geaendert = True
+    return min((d for (station, _), d in distanzen.items() if station == ziel), default=None)
+
+
+def _pruefe_pfad(netz, pfad, start, ziel):
+    """Der Pfad beginnt und endet richtig und folgt vorhandenen Verbindungen."""
+    assert pfad[0].name == start and pfad[-1].name == ziel
+    for a, b in zip(pfad, pfad[1:]):
+        assert any(verbindung.ziel_station is b for verbindung in a.get_verbindungen())
+
+
+def test_shortest_path():
+    """Kürzeste Wege ohne Umstiegszeiten entsprechen der Referenz."""
+    rng = random.Random(0)
+    for _ in range(50):
+        netz, namen = _zufallsnetz(rng)
+        start, ziel = rng.choice(namen), rng.choice(namen)
+        erwartet = _referenz_fahrzeit(netz, start, ziel, 0)
+        try:
+            pfad, fahrzeit = netz.shortest_path(start, ziel)
+        except ValueError:
+            assert erwartet is None
+            continue
+        assert fahrzeit == erwartet
+        _pruefe_pfad(netz, pfad, start, ziel)
+
+
+def test_umstiegszeiten():
+    """Routen mit Umstiegszeiten entsprechen der Suche über alle Linienzustände."""
+    rng = random.Random(1)
+    for _ in range(80):
+        netz, namen = _zufallsnetz(rng)
+        start, ziel = rng.choice(namen), rng.choice(namen)
+        umstiegszeiten = rng.choice([0, 3, 20, {name: rng.randint(0, 10) for name in namen[:6]}])
+        erwartet = _referenz_fahrzeit(netz, start, ziel, umstiegszeiten)
+        try:
+            pfad, fahrzeit = netz.shortest_path(start, ziel, umstiegszeiten)
+        except ValueError:
+            assert erwartet is None
+            continue
+        assert fahrzeit == erwartet
+        _pruefe_pfad(netz, pfad, start, ziel)
+
+
+if __name__ == "__main__":
+    test_shortest_path()
+    test_umstiegszeiten()
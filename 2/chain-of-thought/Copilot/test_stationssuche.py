@@ -0,0 +1,88 @@
+"""
+Testmodul für die Stationssuche.
+
+Die Vervollständigungen werden auf zufälligen Namen aus einem kleinen
+Alphabet gegen eine Suche über alle Namen geprüft.
+"""
+
+import random
+
+from netzwerk import Netzwerk
+from stationssuche import StationsIndex, normalisieren
+
+
+def _zufallsname(rng):
+    """Kurzer Name mit vielen gemeinsamen Präfixen, Umlauten und Satzzeichen."""
+    teile = ["Ab", "ab", "Äb", "c", "-", " ", "ba", "ç", "A"]
+    return "".join(rng.choice(teile) for _ in range(rng.randint(1, 5))) or "A"
+
+
+def _erwartet(gewichte, praefix, anzahl):
+    """Alle Namen mit dem Präfix, absteigend nach Gewicht, dann alphabetisch."""
+    schluessel = normalisieren(praefix)
+    passend = [(-gewicht, name) for name, gewicht in gewichte.items()
+               if normalisieren(name).startswith(schluessel)]
+    return [name for _, name in sorted(passend)[:anzahl]]
+
+
+def test_vervollstaendigen():
+    """Vervollständigungen entsprechen der Suche über alle Namen."""
+    rng = random.Random(0)
+    for _ in range(30):
+        gewichte = {}
+        eintraege = []
+        for _ in range(rng.randint(1, 60)):
+            name = _zufallsname(rng)
+            gewicht = rng.randint(0, 5)
+            eintraege.append((name, gewicht))
+            gewichte[name] = max(gewichte.get(name, gewicht), gewicht)
+
+        aufgebaut = StationsIndex.aufbauen(eintraege, bestenliste=4)
+        schrittweise = StationsIndex(bestenliste=4)
+        for name, gewicht in eintraege:
+            schrittweise.hinzufuegen(name, gewicht)
+        assert len(aufgebaut) == len(schrittweise) == len(gewichte)
+
+        praefixe = ["", "a", "ab", "AB-", "äb c", "c", "x"] + [name[:3] for name, _ in eintraege[:5]]
+        for praefix in praefixe:
+            for anzahl in (1, 4, 10):
+                erwartet = _erwartet(gewichte, praefix, anzahl)
+                assert aufgebaut.vervollstaendigen(praefix, anzahl) == erwartet
+                assert schrittweise.vervollstaendigen(praefix, anzahl) == erwartet
+
+
+def test_unscharf_suchen():
+    """Tippfehler finden die gemeinte Station, exakte Namen stehen vorne."""
+    namen = ["Hauptbahnhof", "Hauptstraße", "Alexanderplatz", "Ostbahnhof",
+             "Zoologischer Garten", "Köln Messe/Deutz"]
+    index = StationsIndex.aufbauen((name, 0) for name in namen)
+    assert index.unscharf_suchen("Hauptbahnhfo")[0][0] == "Hauptbahnhof"
+    assert index.unscharf_suchen("alexanderplaz")[0][0] == "Alexanderplatz"
+    assert index.unscharf_suchen("koln messe deutz")[0] == ("Köln Messe/Deutz", 1.0)
+    assert index.unscharf_suchen("qqq") == []
+    for _, aehnlichkeit in index.unscharf_suchen("bahnhof", mindestaehnlichkeit=0.0):
+        assert 0.0 <= aehnlichkeit <= 1.0
+
+    # Präfixtreffer zuerst, danach wird mit ähnlichen Namen aufgefüllt
+    assert index.suchen("Haupt", 3) == ["Hauptbahnhof", "Hauptstraße"]
+    assert index.suchen("Ostbahnhof", 2) == ["Ostbahnhof", "Hauptbahnhof"]
+
+
+def test_stationen_suchen():
+    """Der Suchindex des Netzwerks folgt neuen Stationen und Verbindungen."""
+    netz = Netzwerk("Testnetz")
+    for name in ["Berg", "Bergen", "Bernau", "Bremen"]:
+        netz.station_hinzufuegen(name)
+    assert [s.name for s in netz.stationen_suchen("ber")] == ["Berg", "Bergen", "Bernau"]
+
+    netz.verbindung_hinzufuegen("Bernau", "Bremen", 5)
+    netz.station_hinzufuegen("Berlin")
+    assert [s.name for s in netz.stationen_suchen("BER", 2)] == ["Bernau", "Berg"]
+    assert "Berlin" in [s.name for s in netz.stationen_suchen("ber")]
+    assert netz.stationen_suchen("Brmen", 1)[0].name == "Bremen"
+
+
+if __name__ == "__main__":
+    test_vervollstaendigen()
+    test_unscharf_suchen()
+    test_stationen_suchen()
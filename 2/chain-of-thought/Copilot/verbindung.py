@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 # Vermeidung zirkulärer Importe
 if TYPE_CHECKING:
@@ -8,13 +8,15 @@ if TYPE_CHECKING:
 class Verbindung:
     """Repräsentiert eine Verbindung zwischen zwei Stationen im Verkehrsnetz."""
     
-    def __init__(self, start_station: Station, ziel_station: Station, fahrzeit: int) -> None:
+    def __init__(self, start_station: Station, ziel_station: Station, fahrzeit: int,
+                 linie: Optional[str] = None) -> None:
         """Initialisiert eine neue Verbindung.
         
         Args:
             start_station: Die Ausgangsstation
             ziel_station: Die Zielstation
             fahrzeit: Die Fahrzeit in Minuten
+            linie: Die Linie, die diese Verbindung bedient (optional)
         
         Raises:
             ValueError: Wenn die Fahrzeit negativ ist
@@ -25,13 +27,16 @@ class Verbindung:
         self.start_station = start_station
         self.ziel_station = ziel_station
         self.fahrzeit = fahrzeit
+        self.linie = linie
     
     def __str__(self) -> str:
         """Gibt eine lesbare String-Darstellung zurück."""
+        linie = f", Linie {self.linie}" if self.linie is not None else ""
         return (f"Verbindung von {self.start_station.name} nach "
-                f"{self.ziel_station.name} ({self.fahrzeit} Minuten)")
+                f"{self.ziel_station.name} ({self.fahrzeit} Minuten{linie})")
     
     def __repr__(self) -> str:
         """Gibt eine eindeutige String-Darstellung zurück."""
+        linie = f", {self.linie!r}" if self.linie is not None else ""
         return (f"Verbindung({self.start_station!r}, "
-                f"{self.ziel_station!r}, {self.fahrzeit})")
\ No newline at end of file
+                f"{self.ziel_station!r}, {self.fahrzeit}{linie})")
\ No newline at end of file
@@ -0,0 +1,265 @@
+"""
+Routenserver für das Verkehrsnetz.
+
+Lädt ein Netzwerk einmalig und beantwortet Anfragen über ein zeilenbasiertes
+JSON-Protokoll per TCP. Jede Zeile ist eine Anfrage, jede Antwortzeile trägt
+die `id` der zugehörigen Anfrage (Antworten können in anderer Reihenfolge
+eintreffen):
+
+    {"id": 1, "type": "shortest_path", "start": "A", "end": "D"}
+    {"id": 2, "type": "distance_matrix", "origins": ["A", "B"], "destinations": ["C", "D"]}
+    {"id": 3, "type": "isochrone", "start": "A", "max_minutes": 20}
+
+Die Suchen laufen in einem Prozesspool, dessen Worker das Netzwerk beim Start
+selbst laden. Kürzeste-Wege-Anfragen mit demselben Start, die innerhalb eines
+kurzen Zeitfensters eintreffen, werden zu einer one-to-many-Suche gebündelt.
+
+Aufruf: python server.py netz.csv [--host HOST] [--port PORT] [--workers N] [--window-ms MS]
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from traffic_network.station import Station
+from traffic_network.connection import Connection
+from traffic_network.network import Network
+
+# Netzwerk des jeweiligen Worker-Prozesses, wird im Initializer geladen
+_network: Optional[Network] = None
+
+
+def load_network(path: str) -> Network:
+    """
+    Lädt ein Netzwerk aus einer CSV-Datei mit den Spalten
+    station1,station2,duration und optional line (die erste Zeile ist die
+    Kopfzeile).
+    """
+    network = Network()
+    stations: Dict[str, Station] = {}
+    with open(path, newline="", encoding="utf-8") as file:
+        reader = csv.reader(file)
+        next(reader, None)
+        for row in reader:
+            if not row:
+                continue
+            name1, name2, duration, *line = row
+            station1 = stations.setdefault(name1, Station(name1))
+            station2 = stations.setdefault(name2, Station(name2))
+            network.add_connection(Connection(station1, station2, int(duration), line[0] if line else None))
+    return network
+
+
+def _init_worker(path: str) -> None:
+    """Initialisiert einen Worker-Prozess mit dem Netzwerk aus `path`."""
+    global _network
+    _network = load_network(path)
+
+
+def _station(name: str) -> Station:
+    """Liefert die Station zu einem Namen oder löst einen ValueError aus."""
+    station = Station(name)
+    if station not in _network.stations:
+        raise ValueError(f"Unbekannte Station: {name}")
+    return station
+
+
+def _one_to_many(start: str, ends: List[str]) -> Dict[str, Any]:
+    """Beantwortet mehrere Kürzeste-Wege-Anfragen mit gemeinsamem Start."""
+    results: Dict[str, Any] = {}
+    origin = _station(start)
+    known = [Station(end) for end in ends if Station(end) in _network.stations]
+    for end, result in _network.shortest_paths(origin, known).items():
+        results[end.name] = None if result is None else {
+            "duration": result[0],
+            "path": [station.name for station in result[1]],
+        }
+    for end in ends:
+        if end not in results:
+            results[end] = {"error": f"Unbekannte Station: {end}"}
+    return results
+
+
+def _distance_matrix(origins: List[str], destinations: List[str]) -> List[List[Optional[int]]]:
+    """Berechnet die Reisedauern zwischen allen Start- und Zielstationen."""
+    targets = [_station(name) for name in destinations]
+    matrix: List[List[Optional[int]]] = []
+    for name in origins:
+        results = _network.shortest_paths(_station(name), targets)
+        matrix.append([None if results[end] is None else results[end][0] for end in targets])
+    return matrix
+
+
+def _isochrone(start: str, max_minutes: float) -> Dict[str, int]:
+    """Ermittelt alle innerhalb von `max_minutes` erreichbaren Stationen."""
+    reachable = _network.reachable_within(_station(start), max_minutes)
+    return {station.name: duration for station, duration in reachable.items()}
+
+
+# Erwartete Felder je Anfragetyp: Name -> Art des Werts
+_FIELDS: Dict[str, Dict[str, str]] = {
+    "shortest_path": {"start": "station", "end": "station"},
+    "distance_matrix": {"origins": "stations", "destinations": "stations"},
+    "isochrone": {"start": "station", "max_minutes": "number"},
+}
+
+
+def _validate(request: Dict[str, Any]) -> None:
+    """
+    Prüft Typ und Felder einer Anfrage, bevor sie gebündelt oder an den
+    Prozesspool übergeben wird. Löst bei Fehlern einen ValueError aus.
+    """
+    kind = request.get("type")
+    fields = _FIELDS.get(kind) if isinstance(kind, str) else None
+    if fields is None:
+        raise ValueError(f"Unbekannter Anfragetyp: {kind}")
+    for field, expected in fields.items():
+        if field not in request:
+            raise ValueError(f"Fehlendes Feld: {field}")
+        value = request[field]
+        if expected == "station":
+            valid = isinstance(value, str)
+        elif expected == "stations":
+            valid = isinstance(value, list) and all(isinstance(name, str) for name in value)
+        else:
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+        if not valid:
+            raise ValueError(f"Ungültiger Wert für {field}")
+
+
+class RouteServer:
+    """Nimmt Anfragen entgegen, bündelt sie und verteilt sie auf den Prozesspool."""
+
+    def __init__(self, network_path: str, workers: Optional[int] = None,
+                 window_ms: float = 5.0) -> None:
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                        initargs=(network_path,))
+        self.window = window_ms / 1000
+        # Offene Bündel je Startstation: Liste von (Ziel, Future)
+        self._batches: Dict[str, List[Tuple[str, asyncio.Future]]] = {}
+        # Laufende Hintergrund-Tasks; die Schleife hält nur schwache Referenzen
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _spawn(self, coroutine) -> asyncio.Task:
+        """Startet eine Coroutine als Task und hält sie bis zum Ende fest."""
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def shortest_path(self, start: str, end: str) -> Any:
+        """Reiht eine Anfrage in das Bündel ihrer Startstation ein."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._batches.get(start)
+        if batch is None:
+            batch = self._batches[start] = []
+            loop.call_later(self.window, lambda: self._spawn(self._flush(start)))
+        batch.append((end, future))
+        return await future
+
+    async def _flush(self, start: str) -> None:
+        """Führt eine gebündelte one-to-many-Suche aus und verteilt die Ergebnisse."""
+        batch = self._batches.pop(start)
+        loop = asyncio.get_running_loop()
+        try:
+            ends = list({end for end, _ in batch})
+            results = await loop.run_in_executor(self.pool, _one_to_many, start, ends)
+            for end, future in batch:
+                if future.done():
+                    continue
+                result = results[end]
+                if isinstance(result, dict) and "error" in result:
+                    future.set_exception(ValueError(result["error"]))
+                else:
+                    future.set_result(result)
+        except Exception as error:
+            # Jede Anfrage des Bündels muss beantwortet werden
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+
+    async def handle_request(self, request: Dict[str, Any]) -> Any:
+        """Beantwortet eine einzelne, bereits dekodierte Anfrage."""
+        kind = request.get("type")
+        loop = asyncio.get_running_loop()
+        if kind == "shortest_path":
+            return await self.shortest_path(request["start"], request["end"])
+        if kind == "distance_matrix":
+            return await loop.run_in_executor(self.pool, _distance_matrix,
+                                              request["origins"], request["destinations"])
+        if kind == "isochrone":
+            return await loop.run_in_executor(self.pool, _isochrone,
+                                              request["start"], request["max_minutes"])
+        raise ValueError(f"Unbekannter Anfragetyp: {kind}")
+
+    async def _answer(self, line: bytes, writer: asyncio.StreamWriter) -> None:
+        """Dekodiert eine Anfragezeile und schreibt die Antwortzeile."""
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Anfrage muss ein JSON-Objekt sein")
+            request_id = request.get("id")
+            _validate(request)
+            response = {"id": request_id, "result": await self.handle_request(request)}
+        except Exception as error:
+            response = {"id": request_id, "error": str(error)}
+        try:
+            writer.write(json.dumps(response).encode("utf-8") + b"\n")
+            await writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            # Der Client ist weg; weitere Antworten an ihn sind zwecklos
+            writer.close()
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Liest Anfragen einer Verbindung und beantwortet sie nebenläufig."""
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(self._answer(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> None:
+        """Startet den TCP-Server und bedient Verbindungen bis zum Abbruch."""
+        server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        """Beendet den Prozesspool."""
+        self.pool.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Routenserver für das Verkehrsnetz")
+    parser.add_argument("network", help="CSV-Datei mit den Spalten station1,station2,duration")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl der Worker-Prozesse")
+    parser.add_argument("--window-ms", type=float, default=5.0,
+                        help="Zeitfenster für das Bündeln von Anfragen gleicher Startstation")
+    args = parser.parse_args()
+
+    server = RouteServer(args.network, args.workers, args.window_ms)
+    print(f"Routenserver lauscht auf {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Testmodul für die Netzkennzahlen.
+
+Betweenness, Closeness, Exzentrizität und Durchmesser werden auf kleinen
+Zufallsnetzen ohne parallele Verbindungen gegen eine vollständige
+Aufzählung aller kürzesten Wege geprüft.
+"""
+
+import itertools
+import random
+
+from test_network import reference_distances, simple_paths
+from traffic_network.analytics import analyze, diameter, eccentricity
+from traffic_network.connection import Connection
+from traffic_network.network import Network
+from traffic_network.station import Station
+
+
+def _simple_network(rng: random.Random, stations: int = 8, connections: int = 11):
+    """Zufallsnetz ohne parallele Verbindungen, mit häufig gleich langen Wegen."""
+    network = Network()
+    names = [Station(f"S{i}") for i in range(stations)]
+    for station in names:
+        network.add_station(station)
+    for a, b in rng.sample(list(itertools.combinations(names, 2)), connections):
+        network.add_connection(Connection(a, b, rng.randint(1, 3)))
+    return network, names
+
+
+def _brute_force(network: Network, stations: list):
+    """Kennzahlen aus allen kürzesten schleifenfreien Wegen je Stationspaar."""
+    n = len(stations)
+    betweenness = dict.fromkeys(stations, 0.0)
+    closeness = {}
+    eccentricity = {}
+    for a, b in itertools.combinations(stations, 2):
+        paths = simple_paths(network, a, b)
+        if not paths:
+            continue
+        shortest = min(duration for duration, _ in paths)
+        paths = [path for duration, path in paths if duration == shortest]
+        for path in paths:
+            for station in path[1:-1]:
+                betweenness[station] += 1 / len(paths)
+    for station in stations:
+        distances = reference_distances(network, station)
+        reachable = len(distances) - 1
+        total = sum(distances.values())
+        closeness[station] = (reachable / total) * (reachable / (n - 1)) if total else 0.0
+        eccentricity[station] = max(distances.values())
+    return betweenness, closeness, eccentricity
+
+
+def _assert_close(result: dict, expected: dict) -> None:
+    """Vergleicht zwei Kennzahlen je Station bis auf Rundungsfehler."""
+    assert result.keys() == expected.keys()
+    for station, value in expected.items():
+        assert abs(result[station] - value) < 1e-9, (station, result[station], value)
+
+
+def test_analyze():
+    """Alle Kennzahlen entsprechen der vollständigen Aufzählung."""
+    rng = random.Random(0)
+    for _ in range(40):
+        network, stations = _simple_network(rng, connections=rng.randint(5, 14))
+        betweenness, closeness, eccentricity = _brute_force(network, stations)
+        analytics = analyze(network, workers=1)
+        _assert_close(analytics.betweenness, betweenness)
+        _assert_close(analytics.closeness, closeness)
+        _assert_close(analytics.eccentricity, eccentricity)
+        assert analytics.diameter == max(eccentricity.values())
+        assert analytics.sources == len(stations)
+        assert abs(analytics.most_central(1)[0][1] - max(betweenness.values())) < 1e-9
+
+
+def test_analyze_parallel_and_sampled():
+    """Der Prozesspool ändert nichts; eine Stichprobe liefert untere Schranken."""
+    rng = random.Random(1)
+    network, stations = _simple_network(rng, stations=12, connections=20)
+    exact = analyze(network, workers=1)
+    parallel = analyze(network, workers=2)
+    _assert_close(parallel.betweenness, exact.betweenness)
+    _assert_close(parallel.closeness, exact.closeness)
+    assert parallel.eccentricity == exact.eccentricity
+
+    sampled = analyze(network, workers=1, samples=4, seed=7)
+    assert sampled.sources == 4
+    assert sampled.diameter <= exact.diameter
+    assert all(sampled.eccentricity[s] <= exact.eccentricity[s] for s in stations)
+
+
+
+def test_eccentricity_and_diameter():
+    """Die reine Distanzsuche liefert dieselben Werte wie analyze."""
+    rng = random.Random(2)
+    for workers in (1, 2):
+        network, stations = _simple_network(rng, stations=12, connections=20)
+        exact = analyze(network, workers=1)
+        assert eccentricity(network, workers) == exact.eccentricity
+        assert diameter(network, workers) == exact.diameter
+    assert diameter(Network()) == 0.0
+
+if __name__ == "__main__":
+    test_analyze()
+    test_analyze_parallel_and_sampled()
+    test_eccentricity_and_diameter()
@@ -0,0 +1,73 @@
+"""
+Testmodul für den komprimierten Graphen.
+
+Kettenreiche Zufallsnetze (Linien mit wenigen Querverbindungen, isolierte
+Ringe) werden mit der Bellman-Ford-Referenz aus test_network verglichen.
+"""
+
+import random
+
+from test_network import path_duration, reference_distances
+from traffic_network.connection import Connection
+from traffic_network.network import Network
+from traffic_network.station import Station
+
+
+def _line_network(rng: random.Random):
+    """Netz aus Linien mit wenigen Querverbindungen und einem isolierten Ring."""
+    network = Network()
+    stations = [Station(f"S{i}") for i in range(30)]
+    for station in stations:
+        network.add_station(station)
+    order = stations[:24]
+    rng.shuffle(order)
+    for line in (order[:8], order[8:16], order[16:24]):
+        for a, b in zip(line, line[1:]):
+            network.add_connection(Connection(a, b, rng.randint(1, 9)))
+    for _ in range(rng.randint(0, 4)):
+        a, b = rng.sample(order, 2)
+        network.add_connection(Connection(a, b, rng.randint(1, 9)))
+    # Isolierter Ring ohne Kernstation, zum Teil mit paralleler Verbindung
+    ring = stations[24:28]
+    for a, b in zip(ring, ring[1:] + ring[:1]):
+        network.add_connection(Connection(a, b, rng.randint(1, 9)))
+    network.add_connection(Connection(ring[0], ring[1], rng.randint(1, 9)))
+    return network, stations
+
+
+def test_compressed_shortest_path():
+    """Der komprimierte Graph liefert die kürzesten Wege der Referenz."""
+    rng = random.Random(0)
+    for _ in range(60):
+        network, stations = _line_network(rng)
+        compressed = network.compress()
+        assert network.compress() is compressed
+        assert len(compressed.core) + len(compressed.inner) == len(stations)
+        for start in rng.sample(stations, 6):
+            expected = reference_distances(network, start)
+            for end in stations:
+                result = compressed.shortest_path(start, end)
+                if end not in expected:
+                    assert result is None
+                    continue
+                duration, path = result
+                assert duration == expected[end]
+                assert path[0] == start and path[-1] == end
+                assert path_duration(network, path) == duration
+
+
+def test_compression_invalidated():
+    """Änderungen am Netz verwerfen den komprimierten Graphen."""
+    a, b, c = Station("A"), Station("B"), Station("C")
+    network = Network()
+    network.add_connection(Connection(a, b, 5))
+    network.add_connection(Connection(b, c, 5))
+    assert network.compress().shortest_path(a, c) == (10, [a, b, c])
+    network.add_connection(Connection(a, c, 3))
+    assert network.compress().shortest_path(a, c) == (3, [a, c])
+    assert network.compress().shortest_path(a, Station("X")) is None
+
+
+if __name__ == "__main__":
+    test_compressed_shortest_path()
+    test_compression_invalidated()
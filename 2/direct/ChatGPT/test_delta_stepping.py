@@ -0,0 +1,61 @@
+"""
+Testmodul für das parallele Delta-Stepping.
+
+Distanzen und Vorgänger werden mit der Bellman-Ford-Referenz aus
+test_network verglichen. Damit auch kleine Netze den Prozesspool nutzen,
+wird die Grenze für die sequentielle Ausführung vorübergehend aufgehoben.
+"""
+
+import random
+
+from test_network import random_network, reference_distances
+from traffic_network import delta_stepping
+from traffic_network.delta_stepping import ParallelDeltaStepping
+from traffic_network.station import Station
+
+
+def _check_tree(network, start, distances, parents):
+    """Distanzen entsprechen der Referenz, jeder Vorgänger liegt auf einem kürzesten Weg."""
+    assert distances == reference_distances(network, start)
+    assert parents.keys() == distances.keys() and parents[start] is None
+    for station, parent in parents.items():
+        if station != start:
+            assert any({c.station1, c.station2} == {station, parent}
+                       and distances[parent] + c.duration == distances[station]
+                       for c in network.connections)
+
+
+def test_delta_stepping():
+    """Ergebnisse stimmen für verschiedene Worker-Anzahlen und Bucket-Breiten."""
+    rng = random.Random(0)
+    sequential_edges = delta_stepping._SEQUENTIAL_EDGES
+    delta_stepping._SEQUENTIAL_EDGES = 0
+    try:
+        for workers, delta in ((1, None), (2, 1), (3, 4), (2, 100)):
+            network, stations = random_network(rng, stations=40, connections=rng.randint(30, 80))
+            graph = network.indexed()
+            with ParallelDeltaStepping(graph, workers, delta) as search:
+                for start in rng.sample(stations, 5):
+                    distances, parents = search.shortest_path_tree(graph.index[start])
+                    reached = [i for i, d in enumerate(distances) if d != search.infinity]
+                    _check_tree(network, start,
+                                {graph.stations[i]: distances[i] for i in reached},
+                                {graph.stations[i]: graph.stations[parents[i]] if parents[i] != -1 else None
+                                 for i in reached})
+    finally:
+        delta_stepping._SEQUENTIAL_EDGES = sequential_edges
+
+
+def test_parallel_shortest_path_tree():
+    """Die Methode des Netzwerks liefert den Baum der kürzesten Wege."""
+    rng = random.Random(1)
+    network, stations = random_network(rng)
+    for start in stations[:3]:
+        distances, parents = network.parallel_shortest_path_tree(start, workers=2)
+        _check_tree(network, start, distances, parents)
+    assert network.parallel_shortest_path_tree(Station("X")) == ({}, {})
+
+
+if __name__ == "__main__":
+    test_delta_stepping()
+    test_parallel_shortest_path_tree()
@@ -0,0 +1,73 @@
+"""
+Testmodul für den Hub-Labeling-Index.
+
+Die Distanzen werden für alle Stationspaare kleiner Zufallsnetze mit der
+Bellman-Ford-Referenz aus test_network verglichen.
+"""
+
+import os
+import random
+import tempfile
+
+from test_network import random_network, reference_distances
+from traffic_network.connection import Connection
+from traffic_network.hub_labels import HubLabelIndex
+from traffic_network.station import Station
+
+
+def _check_distances(network, stations, distance):
+    """Vergleicht `distance(start, ziel)` für alle Paare mit der Referenz."""
+    for start in stations:
+        expected = reference_distances(network, start)
+        for end in stations:
+            assert distance(start, end) == expected.get(end)
+
+
+def test_hub_label_distance():
+    """Die Label-Distanzen entsprechen den kürzesten Reisedauern."""
+    rng = random.Random(0)
+    for _ in range(30):
+        # Wenige Verbindungen ergeben auch nicht zusammenhängende Netze
+        network, stations = random_network(rng, connections=rng.randint(10, 40))
+        index = network.build_hub_labels()
+        _check_distances(network, stations, index.distance)
+        _check_distances(network, stations, network.distance)
+        assert index.distance(stations[0], Station("X")) is None
+
+
+def test_hub_labels_save_and_load():
+    """Ein gespeicherter Index liefert nach dem Laden dieselben Distanzen."""
+    rng = random.Random(1)
+    network, stations = random_network(rng)
+    index = network.build_hub_labels()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "labels.bin")
+        index.save(path)
+        loaded = HubLabelIndex.load(path)
+        assert loaded.stations == index.stations
+        network.use_hub_labels(loaded)
+        _check_distances(network, stations, network.distance)
+
+        with open(path, "r+b") as file:
+            file.write(b"X")
+        try:
+            HubLabelIndex.load(path)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Eine fremde Datei muss einen Fehler auslösen")
+
+
+def test_hub_labels_invalidated():
+    """Nach einer Änderung am Netz wird der Index nicht mehr verwendet."""
+    rng = random.Random(2)
+    network, stations = random_network(rng)
+    network.build_hub_labels()
+    network.add_connection(Connection(stations[0], stations[1], 1))
+    _check_distances(network, stations, network.distance)
+
+
+if __name__ == "__main__":
+    test_hub_label_distance()
+    test_hub_labels_save_and_load()
+    test_hub_labels_invalidated()
@@ -0,0 +1,281 @@
+"""
+Testmodul für das Verkehrsnetz.
+
+Die Suchen werden auf kleinen Zufallsnetzen mit einer unabhängigen
+Referenz (Bellman-Ford über alle Verbindungen) verglichen.
+"""
+
+import itertools
+import random
+
+from traffic_network.connection import Connection
+from traffic_network.instrumentation import SearchStatistics
+from traffic_network.network import Network
+from traffic_network.station import Station
+from traffic_network.waypoints import EXACT_LIMIT, order_waypoints
+
+
+def random_network(rng: random.Random, stations: int = 20, connections: int = 35,
+                   max_duration: int = 9, lines: int = 0):
+    """Zufallsnetz; liefert (Netz, Liste der Stationen in Namensreihenfolge)."""
+    network = Network()
+    names = [Station(f"S{i}") for i in range(stations)]
+    for station in names:
+        network.add_station(station)
+    for _ in range(connections):
+        station1, station2 = rng.sample(names, 2)
+        line = f"L{rng.randrange(lines)}" if lines else None
+        network.add_connection(Connection(station1, station2, rng.randint(1, max_duration), line))
+    return network, names
+
+
+def reference_distances(network: Network, start: Station) -> dict:
+    """Reisedauern ab `start` per Bellman-Ford; nicht erreichbare Stationen fehlen."""
+    distances = {start: 0}
+    changed = True
+    while changed:
+        changed = False
+        for connection in network.connections:
+            for a, b in ((connection.station1, connection.station2),
+                         (connection.station2, connection.station1)):
+                if a in distances and distances[a] + connection.duration < distances.get(b, float('inf')):
+                    distances[b] = distances[a] + connection.duration
+                    changed = True
+    return distances
+
+
+def reference_line_duration(network: Network, start: Station, end: Station, penalties):
+    """
+    Reisedauer mit Umstiegszeiten per Bellman-Ford über alle Zustände
+    (Station, Ankunftslinie); an der Startstation ist jede Linie frei.
+    """
+    def penalty_of(station):
+        return penalties.get(station, 0) if isinstance(penalties, dict) else penalties
+
+    boarding = object()
+    distances = {(start, boarding): 0}
+    changed = True
+    while changed:
+        changed = False
+        for (station, line), distance in list(distances.items()):
+            for connection in network.connections:
+                for a, b in ((connection.station1, connection.station2),
+                             (connection.station2, connection.station1)):
+                    if a != station:
+                        continue
+                    total = distance + connection.duration
+                    if line is not boarding and line != connection.line:
+                        total += penalty_of(station)
+                    if total < distances.get((b, connection.line), float('inf')):
+                        distances[b, connection.line] = total
+                        changed = True
+    return min((d for (station, _), d in distances.items() if station == end), default=None)
+
+
+def path_duration(network: Network, path: list) -> int:
+    """Dauer eines Pfads über die jeweils kürzeste direkte Verbindung."""
+    total = 0
+    for a, b in zip(path, path[1:]):
+        total += min(c.duration for c in network.connections
+                     if {c.station1, c.station2} == {a, b})
+    return total
+
+
+def simple_paths(network: Network, start: Station, end: Station) -> list:
+    """Alle schleifenfreien Pfade von `start` nach `end` als (Dauer, Pfad), per Tiefensuche."""
+    neighbors = {station: set() for station in network.stations}
+    for connection in network.connections:
+        neighbors[connection.station1].add(connection.station2)
+        neighbors[connection.station2].add(connection.station1)
+    paths = []
+
+    def extend(path):
+        if path[-1] == end:
+            paths.append((path_duration(network, path), path))
+            return
+        for neighbor in neighbors[path[-1]]:
+            if neighbor not in path:
+                extend(path + [neighbor])
+
+    extend([start])
+    return paths
+
+
+def test_shortest_path():
+    """Kürzeste Wege entsprechen der Referenz."""
+    rng = random.Random(0)
+    for _ in range(50):
+        network, stations = random_network(rng)
+        start = rng.choice(stations)
+        expected = reference_distances(network, start)
+        for end in stations:
+            result = network.shortest_path(start, end)
+            if end not in expected:
+                assert result is None
+                continue
+            duration, path = result
+            assert duration == expected[end]
+            assert path[0] == start and path[-1] == end
+            assert path_duration(network, path) == duration
+
+
+def test_reachable_within():
+    """Isochronen enthalten genau die Stationen innerhalb der Zeitgrenze."""
+    rng = random.Random(2)
+    for _ in range(50):
+        network, stations = random_network(rng)
+        starts = rng.sample(stations, 3)
+        max_minutes = rng.choice([-1, 0, 4.5, 10, 25])
+        expected = {}
+        for start in starts:
+            expected[start] = {station: duration
+                               for station, duration in reference_distances(network, start).items()
+                               if duration <= max_minutes}
+            assert network.reachable_within(start, max_minutes) == expected[start]
+        assert network.reachable_within_many(starts + starts[:1], max_minutes) == expected
+
+
+def test_k_shortest_paths():
+    """Yen liefert die k kürzesten der vollständig aufgezählten schleifenfreien Pfade."""
+    rng = random.Random(3)
+    for _ in range(100):
+        network, stations = random_network(rng, stations=8, connections=14)
+        start, end = rng.sample(stations, 2)
+        k = rng.randint(1, 12)
+        expected = sorted(duration for duration, _ in simple_paths(network, start, end))[:k]
+        result = network.k_shortest_paths(start, end, k)
+        assert [duration for duration, _ in result] == expected
+        assert len({tuple(path) for _, path in result}) == len(result)
+        for duration, path in result:
+            assert path[0] == start and path[-1] == end
+            assert len(set(path)) == len(path)
+            assert path_duration(network, path) == duration
+    assert network.k_shortest_paths(start, end, 0) == []
+
+
+def test_pareto_paths():
+    """Pareto-Routen entsprechen der Pareto-Menge aller schleifenfreien Pfade."""
+    rng = random.Random(4)
+    for _ in range(100):
+        network, stations = random_network(rng, stations=8, connections=14)
+        start, end = rng.sample(stations, 2)
+        criteria = {(duration, len(path) - 1) for duration, path in simple_paths(network, start, end)}
+        expected = sorted((duration, hops) for duration, hops in criteria
+                          if not any(d <= duration and h <= hops and (d, h) != (duration, hops)
+                                     for d, h in criteria))
+        result = network.pareto_paths(start, end)
+        assert [(duration, hops) for duration, hops, _ in result] == expected
+        for duration, hops, path in result:
+            assert path[0] == start and path[-1] == end and len(path) == hops + 1
+            assert path_duration(network, path) == duration
+
+
+def test_route_via():
+    """Routen über Zwischenhalte entsprechen der Summe der kürzesten Abschnitte."""
+    rng = random.Random(5)
+    for _ in range(60):
+        network, stations = random_network(rng, connections=rng.randint(15, 35))
+        points = [rng.choice(stations) for _ in range(rng.randint(2, 6))]
+        start, *vias, end = points
+        # Ein Teil der Bäume liegt bereits im Zwischenspeicher
+        for point in rng.sample(points, rng.randint(0, 2)):
+            network.shortest_path_tree(point)
+        distances = {point: reference_distances(network, point) for point in points}
+
+        def total(order):
+            legs = [distances[a].get(b) for a, b in zip(order, order[1:])]
+            return None if None in legs else sum(legs)
+
+        for optimize_order in (False, True):
+            result = network.route_via(start, vias, end, optimize_order=optimize_order)
+            if optimize_order:
+                totals = [total([start, *order, end]) for order in itertools.permutations(vias)]
+                totals = [duration for duration in totals if duration is not None]
+                expected = min(totals) if totals else None
+            else:
+                expected = total(points)
+            if expected is None:
+                assert result is None
+                continue
+            duration, path = result
+            assert duration == expected
+            assert path[0] == start and path[-1] == end
+            assert path_duration(network, path) == duration
+            if not optimize_order:
+                # Alle Halte werden in der angegebenen Reihenfolge besucht
+                visits = [point for i, point in enumerate(points) if i == 0 or point != points[i - 1]]
+                remaining = iter(path)
+                assert all(point in remaining for point in visits)
+
+
+def test_order_waypoints():
+    """Held-Karp ist exakt, die Heuristik liefert eine gültige Reihenfolge."""
+    rng = random.Random(6)
+
+    def total(matrix, order):
+        return sum(matrix[a][b] for a, b in zip(order, order[1:]))
+
+    for size in list(range(1, 9)) * 5 + [EXACT_LIMIT + 4] * 5:
+        matrix = [[0 if i == j else rng.randint(1, 50) for j in range(size)] for i in range(size)]
+        order = order_waypoints(matrix)
+        assert order[0] == 0 and order[-1] == size - 1 and sorted(order) == list(range(size))
+        if size <= 8:
+            assert total(matrix, order) == min(total(matrix, [0, *middle, size - 1])
+                                               for middle in itertools.permutations(range(1, size - 1)))
+        else:
+            assert total(matrix, order) <= total(matrix, list(range(size)))
+
+
+def test_transfer_penalties():
+    """Routen mit Umstiegszeiten entsprechen der Suche über alle Linienzustände."""
+    rng = random.Random(7)
+    for _ in range(60):
+        network, stations = random_network(rng, stations=10, connections=18, lines=3)
+        start, end = rng.choice(stations), rng.choice(stations)
+        penalties = rng.choice([0, 3, 20, {station: rng.randint(0, 10) for station in stations[:6]}])
+        expected = reference_line_duration(network, start, end, penalties)
+        statistics = SearchStatistics()
+        result = network.shortest_path(start, end, statistics=statistics, transfer_penalties=penalties)
+        if expected is None:
+            assert result is None
+            continue
+        duration, path = result
+        assert duration == expected
+        assert path[0] == start and path[-1] == end
+        assert path_duration(network, path) <= duration
+        assert statistics.settled >= 1
+        if penalties == 0:
+            assert duration == network.shortest_path(start, end)[0]
+
+
+def test_search_statistics():
+    """Mit Statistik liefert die Suche dasselbe Ergebnis und plausible Kennzahlen."""
+    rng = random.Random(1)
+    observed = []
+    for _ in range(50):
+        network, stations = random_network(rng)
+        start, end = rng.sample(stations, 2)
+        statistics = SearchStatistics()
+        assert network.shortest_path(start, end, statistics=statistics) == network.shortest_path(start, end)
+        assert 1 <= statistics.settled <= len(stations)
+        assert statistics.settled + statistics.stale_pops <= statistics.pushes
+        assert 1 <= statistics.peak_queue <= statistics.pushes
+        assert statistics.relaxations <= 2 * len(network.connections)
+        assert statistics.total_seconds >= 0
+
+        network.search_observer = observed.append
+        network.shortest_path(start, end)
+        assert observed[-1].settled == statistics.settled
+        assert observed[-1].relaxations == statistics.relaxations
+    assert len(observed) == 50
+
+
+if __name__ == "__main__":
+    test_shortest_path()
+    test_reachable_within()
+    test_k_shortest_paths()
+    test_pareto_paths()
+    test_route_via()
+    test_order_waypoints()
+    test_transfer_penalties()
+    test_search_statistics()
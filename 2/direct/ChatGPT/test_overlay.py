@@ -0,0 +1,71 @@
+"""
+Testmodul für das Zell-Overlay (Customizable Route Planning).
+
+Mit kleinen Zellgrößen entstehen auch auf kleinen Zufallsnetzen mehrere
+Ebenen; jede Metrik wird mit der Bellman-Ford-Referenz aus test_network auf
+einem Netz mit denselben Reisedauern verglichen.
+"""
+
+import random
+
+from test_network import path_duration, random_network, reference_distances
+from traffic_network.connection import Connection
+from traffic_network.network import Network
+from traffic_network.overlay import CellOverlay
+
+
+def _with_durations(network: Network, durations: dict) -> Network:
+    """Kopie des Netzes, in der einzelne Verbindungen andere Dauern haben."""
+    copy = Network()
+    for station in network.stations:
+        copy.add_station(station)
+    for connection in network.connections:
+        copy.add_connection(Connection(connection.station1, connection.station2,
+                                       durations.get(connection, connection.duration)))
+    return copy
+
+
+def _check_metric(metric, network: Network, stations: list, rng: random.Random) -> None:
+    """Vergleicht die Overlay-Suche ab einigen Startstationen mit der Referenz."""
+    for start in rng.sample(stations, 4):
+        expected = reference_distances(network, start)
+        for end in stations:
+            result = metric.shortest_path(start, end)
+            if end not in expected:
+                assert result is None
+                continue
+            duration, path = result
+            assert duration == expected[end]
+            assert path[0] == start and path[-1] == end
+            assert path_duration(network, path) == duration
+
+
+def test_overlay_shortest_path():
+    """Die Overlay-Suche entspricht der Referenz, auch nach neuer Customization."""
+    rng = random.Random(0)
+    for _ in range(10):
+        network, stations = random_network(rng, stations=50, connections=rng.randint(45, 90))
+        overlay = CellOverlay(stations, network.connections, cell_sizes=(4, 12, 30))
+        assert overlay.levels == 3
+        _check_metric(overlay.customize(), network, stations, rng)
+
+        durations = {connection: rng.randint(1, 20)
+                     for connection in rng.sample(network.connections, 15)}
+        _check_metric(overlay.customize(durations), _with_durations(network, durations),
+                      stations, rng)
+
+
+def test_overlay_reused():
+    """Das Overlay des Netzes wird bis zur nächsten Änderung wiederverwendet."""
+    rng = random.Random(1)
+    network, stations = random_network(rng)
+    overlay = network.overlay()
+    assert network.overlay() is overlay
+    network.add_connection(Connection(stations[0], stations[1], 1))
+    assert network.overlay() is not overlay
+    _check_metric(network.overlay().customize(), network, stations, rng)
+
+
+if __name__ == "__main__":
+    test_overlay_shortest_path()
+    test_overlay_reused()
@@ -0,0 +1,136 @@
+"""
+Testmodul für den Routenserver.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+
+from server import RouteServer
+
+NETWORK = "station1,station2,duration\nA,B,5\nB,C,10\nA,C,15\nC,D,20\n"
+
+
+class _Writer:
+    """Sammelt die Antwortzeilen anstelle einer TCP-Verbindung."""
+
+    def __init__(self) -> None:
+        self.lines = []
+
+    def write(self, data: bytes) -> None:
+        self.lines.append(json.loads(data))
+
+    async def drain(self) -> None:
+        pass
+
+
+class _ClosedWriter(_Writer):
+    """Verbindung, die der Client bereits geschlossen hat."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.closed = False
+
+    async def drain(self) -> None:
+        raise ConnectionResetError("Verbindung vom Client getrennt")
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _run(requests: list) -> dict:
+    """Beantwortet die Anfragezeilen gleichzeitig; liefert die Antworten je id."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "netz.csv")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(NETWORK)
+        server = RouteServer(path, workers=1, window_ms=20)
+        writer = _Writer()
+
+        async def answer_all() -> None:
+            await asyncio.wait_for(asyncio.gather(*(server._answer(line, writer) for line in requests)), 30)
+
+        try:
+            asyncio.run(answer_all())
+        finally:
+            server.close()
+    assert len(writer.lines) == len(requests)
+    assert not server._tasks
+    return {response["id"]: response for response in writer.lines}
+
+
+def test_malformed_lines():
+    """Ungültige Zeilen erhalten eine Fehlerantwort statt keiner Antwort."""
+    responses = _run([
+        b"[1, 2]",
+        b"kein json",
+        b'"text"',
+        b'{"id": 4, "type": "shortest_path", "start": "A"}',
+        b'{"id": 5, "type": "unbekannt"}',
+        b'{"id": 6, "type": "isochrone", "start": "A", "max_minutes": "20"}',
+        b'{"id": 7, "type": "distance_matrix", "origins": ["A"], "destinations": "D"}',
+    ])
+    assert set(responses[None]) == {"id", "error"}
+    for request_id in range(4, 8):
+        assert "error" in responses[request_id]
+
+
+def test_mixed_batch():
+    """Gültige Anfragen im selben Bündel werden trotz ungültiger Nachbarn beantwortet."""
+    responses = _run([
+        b'{"id": 1, "type": "shortest_path", "start": "A", "end": "D"}',
+        b'{"id": 2, "type": "shortest_path", "start": "A", "end": ["D"]}',
+        b'{"id": 3, "type": "shortest_path", "start": "A", "end": {"x": 1}}',
+        b'{"id": 4, "type": "shortest_path", "start": "A", "end": "Z"}',
+        b'{"id": 5, "type": "shortest_path", "start": "A", "end": "C"}',
+    ])
+    assert responses[1]["result"] == {"duration": 35, "path": ["A", "C", "D"]}
+    assert responses[5]["result"] == {"duration": 15, "path": ["A", "C"]}
+    for request_id in (2, 3, 4):
+        assert "error" in responses[request_id]
+
+
+def test_failed_batch_answers_everyone():
+    """Scheitert ein ganzes Bündel, erhalten alle wartenden Anfragen den Fehler."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "netz.csv")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(NETWORK)
+        server = RouteServer(path, workers=1, window_ms=20)
+
+        async def run() -> list:
+            # An der Prüfung vorbei: ein nicht hashbares Ziel im Bündel
+            return await asyncio.wait_for(asyncio.gather(
+                server.shortest_path("A", "D"),
+                server.shortest_path("A", ["D"]),
+                return_exceptions=True), 30)
+
+        try:
+            results = asyncio.run(run())
+        finally:
+            server.close()
+    assert all(isinstance(result, Exception) for result in results)
+
+
+def test_closed_connection():
+    """Ein getrennter Client beendet die Antwort ohne Ausnahme und schließt den Writer."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "netz.csv")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(NETWORK)
+        server = RouteServer(path, workers=1, window_ms=20)
+        writer = _ClosedWriter()
+        line = b'{"id": 1, "type": "shortest_path", "start": "A", "end": "D"}'
+        try:
+            asyncio.run(asyncio.wait_for(server._answer(line, writer), 30))
+        finally:
+            server.close()
+    assert writer.closed
+
+
+if __name__ == "__main__":
+    test_malformed_lines()
+    test_mixed_batch()
+    test_failed_batch_answers_everyone()
+    test_closed_connection()
@@ -0,0 +1,94 @@
+"""
+Testmodul für die Umkreissuche und die Routensuche ab einer Koordinate.
+
+Der KD-Baum wird mit einer linearen Suche über die Haversine-Distanz
+verglichen, die Routensuche mit der Bellman-Ford-Referenz aus test_network.
+"""
+
+import math
+import random
+
+from test_network import random_network, reference_distances
+from traffic_network.spatial import EARTH_RADIUS, SpatialIndex
+from traffic_network.station import Station
+
+
+def _haversine(latitude1, longitude1, latitude2, longitude2):
+    """Großkreisdistanz in Metern."""
+    phi1, phi2 = math.radians(latitude1), math.radians(latitude2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(longitude2 - longitude1) / 2) ** 2)
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(a))
+
+
+def _nearest(stations, latitude, longitude, k, max_distance=None):
+    """Lineare Suche: bis zu k Stationen mit Koordinaten, aufsteigend nach Distanz."""
+    distances = sorted((_haversine(latitude, longitude, s.latitude, s.longitude), s.name, s)
+                       for s in stations if s.has_coordinates)
+    if max_distance is not None:
+        distances = [entry for entry in distances if entry[0] <= max_distance]
+    return [(station, meters) for meters, _, station in distances[:k]]
+
+
+def _random_location(rng, region):
+    """Zufällige Koordinate: weltweit, in einer Stadt, am Pol oder an der Datumsgrenze."""
+    if region == "city":
+        return 52.5 + rng.uniform(-0.1, 0.1), 13.4 + rng.uniform(-0.1, 0.1)
+    if region == "pole":
+        return rng.uniform(85, 90), rng.uniform(-180, 180)
+    if region == "dateline":
+        return rng.uniform(-10, 10), rng.choice([-1, 1]) * rng.uniform(179, 180)
+    return rng.uniform(-90, 90), rng.uniform(-180, 180)
+
+
+def test_nearest():
+    """Der KD-Baum liefert dieselben Stationen wie die lineare Suche."""
+    rng = random.Random(0)
+    for region in ("world", "city", "pole", "dateline"):
+        for _ in range(20):
+            stations = [Station(f"S{i}", *_random_location(rng, region)) for i in range(rng.randint(0, 60))]
+            stations.append(Station("ohne Koordinaten"))
+            index = SpatialIndex(stations)
+            assert len(index) == len(stations) - 1
+            for _ in range(10):
+                latitude, longitude = _random_location(rng, region)
+                k = rng.randint(0, 8)
+                max_distance = rng.choice([None, 50, 5000, 2_000_000])
+                expected = _nearest(stations, latitude, longitude, k, max_distance)
+                result = index.nearest(latitude, longitude, k, max_distance)
+                assert [s for s, _ in result] == [s for s, _ in expected]
+                for (_, meters), (_, expected_meters) in zip(result, expected):
+                    assert abs(meters - expected_meters) < 1e-3
+
+
+def test_shortest_path_from_location():
+    """Die Route ab einer Koordinate nutzt den besten der nahen Startpunkte."""
+    rng = random.Random(1)
+    for _ in range(40):
+        network, names = random_network(rng)
+        for station in names[:-2]:
+            station.latitude, station.longitude = _random_location(rng, "city")
+        latitude, longitude = _random_location(rng, "city")
+        end = rng.choice(names)
+        k = rng.randint(1, 5)
+
+        meters_per_minute = 4.5 * 1000 / 60
+        candidates = []
+        for origin, meters in _nearest(names, latitude, longitude, k):
+            to_end = reference_distances(network, origin).get(end)
+            if to_end is not None:
+                candidates.append(meters / meters_per_minute + to_end)
+        result = network.shortest_path_from_location(latitude, longitude, end, k=k)
+        if not candidates:
+            assert result is None
+            continue
+        duration, path = result
+        assert abs(duration - min(candidates)) < 1e-9
+        assert path[-1] == end and path[0].has_coordinates
+
+    assert network.shortest_path_from_location(0.0, 0.0, end, max_walking_distance=1000) is None
+
+
+if __name__ == "__main__":
+    test_nearest()
+    test_shortest_path_from_location()
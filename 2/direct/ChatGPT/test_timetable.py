@@ -0,0 +1,97 @@
+"""
+Testmodul für den Fahrplanmodus (Connection Scan Algorithm).
+
+Früheste Ankunft und Profilanfragen werden auf kleinen Zufallsfahrplänen
+mit einer vollständigen Aufzählung aller Reisen verglichen.
+"""
+
+import random
+
+from traffic_network.station import Station
+from traffic_network.timetable import Timetable, TimetableConnection
+
+
+def _journeys(connections: list, start: Station, end: Station) -> set:
+    """Alle Reisen von `start` nach `end` als Paare (Abfahrt, Ankunft)."""
+    found = set()
+
+    def extend(connection: TimetableConnection, departure: int, used: set) -> None:
+        if connection.arrival_station == end:
+            found.add((departure, connection.arrival))
+        for i, following in enumerate(connections):
+            if (i not in used and following.departure_station == connection.arrival_station
+                    and following.departure >= connection.arrival):
+                extend(following, departure, used | {i})
+
+    for i, connection in enumerate(connections):
+        if connection.departure_station == start:
+            extend(connection, connection.departure, {i})
+    return found
+
+
+def _random_timetable(rng: random.Random):
+    stations = [Station(str(i)) for i in range(5)]
+    timetable = Timetable()
+    connections = []
+    for _ in range(rng.randint(1, 14)):
+        departure_station, arrival_station = rng.sample(stations, 2)
+        departure = rng.randint(0, 50)
+        connection = TimetableConnection(departure_station, arrival_station,
+                                         departure, departure + rng.randint(0, 15))
+        connections.append(connection)
+        timetable.add_connection(connection)
+    return stations, timetable, connections
+
+
+def test_earliest_arrival():
+    """Früheste Ankunft entspricht der besten aufgezählten Reise."""
+    rng = random.Random(1)
+    for _ in range(500):
+        stations, timetable, connections = _random_timetable(rng)
+        start, end = rng.sample(stations, 2)
+        departure_time = rng.randint(0, 40)
+        arrivals = [arrival for departure, arrival in _journeys(connections, start, end)
+                    if departure >= departure_time]
+        result = timetable.earliest_arrival(start, end, departure_time)
+        if not arrivals:
+            assert result is None
+            continue
+        arrival, journey = result
+        assert arrival == min(arrivals)
+        assert journey[0].departure_station == start and journey[-1].arrival_station == end
+        assert journey[0].departure >= departure_time and journey[-1].arrival == arrival
+        for previous, following in zip(journey, journey[1:]):
+            assert previous.arrival_station == following.departure_station
+            assert previous.arrival <= following.departure
+
+
+def test_profile_window():
+    """Profilanfrage liefert genau die Pareto-Menge der Abfahrten im Zeitraum."""
+    rng = random.Random(0)
+    for _ in range(2000):
+        stations, timetable, connections = _random_timetable(rng)
+        start, end = rng.sample(stations, 2)
+        earliest = rng.randint(0, 30)
+        latest = earliest + rng.randint(0, 20)
+        journeys = {journey for journey in _journeys(connections, start, end)
+                    if earliest <= journey[0] <= latest}
+        expected = sorted(journey for journey in journeys
+                          if not any(other != journey and other[0] >= journey[0] and other[1] <= journey[1]
+                                     for other in journeys))
+        assert timetable.profile(start, end, earliest, latest) == expected
+
+
+def test_profile_dominated_after_window():
+    """Eine Abfahrt im Zeitraum bleibt erhalten, auch wenn eine spätere sie dominiert."""
+    a, b = Station("A"), Station("B")
+    timetable = Timetable()
+    timetable.add_connection(TimetableConnection(a, b, 23, 49))
+    timetable.add_connection(TimetableConnection(a, b, 30, 40))
+    assert timetable.profile(a, b, 0, 25) == [(23, 49)]
+    assert timetable.profile(a, b, 0, 30) == [(30, 40)]
+
+
+if __name__ == "__main__":
+    test_earliest_arrival()
+    test_profile_window()
+    test_profile_dominated_after_window()
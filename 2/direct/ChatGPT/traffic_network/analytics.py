@@ -0,0 +1,243 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+import heapq
+import os
+import random
+
+from traffic_network.station import Station
+from traffic_network.network import Network
+
+# Graph des jeweiligen Worker-Prozesses als (offsets, targets, weights)
+_worker_graph: Optional[Tuple[array, array, array]] = None
+
+class NetworkAnalytics:
+    """
+    Kennzahlen eines Verkehrsnetzes: Betweenness- und Closeness-Zentralität,
+    Exzentrizität je Station sowie der Durchmesser des Netzes. Bei einer
+    Stichprobe von Startstationen sind alle Werte Näherungen (die
+    Exzentrizitäten und der Durchmesser dann untere Schranken).
+    """
+
+    def __init__(self, betweenness: Dict[Station, float], closeness: Dict[Station, float],
+                 eccentricity: Dict[Station, float], diameter: float, sources: int) -> None:
+        self.betweenness = betweenness
+        self.closeness = closeness
+        self.eccentricity = eccentricity
+        self.diameter = diameter
+        self.sources = sources
+
+    def most_central(self, count: int = 10) -> List[Tuple[Station, float]]:
+        """Liefert die Stationen mit der höchsten Betweenness-Zentralität."""
+        return sorted(self.betweenness.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def __repr__(self) -> str:
+        return (f"NetworkAnalytics({len(self.betweenness)} stations, "
+                f"diameter={self.diameter}, sources={self.sources})")
+
+
+def _init_worker(graph: Tuple[array, array, array]) -> None:
+    """Übergibt den Graphen einmalig an einen Worker-Prozess."""
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _accumulate(graph: Tuple[array, array, array], sources: Sequence[int]
+                ) -> Tuple[List[float], List[float], List[int], List[float]]:
+    """
+    Führt für jede Startstation eine Dijkstra-Suche mit Zählung der kürzesten
+    Wege aus (Brandes) und sammelt Teilsummen: Betweenness-Abhängigkeiten,
+    Summe der Distanzen, Anzahl erreichender Startstationen und größte
+    Distanz je Station.
+    """
+    offsets, targets, weights = graph
+    n = len(offsets) - 1
+    betweenness = [0.0] * n
+    distance_sum = [0.0] * n
+    reached_by = [0] * n
+    farthest = [0.0] * n
+
+    for source in sources:
+        distances = {source: 0}
+        paths = {source: 1}
+        predecessors: Dict[int, List[int]] = {source: []}
+        order: List[int] = []
+        queue = [(0, source)]
+        while queue:
+            distance, station = heapq.heappop(queue)
+            if distance > distances[station]:
+                continue
+            order.append(station)
+            for edge in range(offsets[station], offsets[station + 1]):
+                neighbor = targets[edge]
+                new_distance = distance + weights[edge]
+                known = distances.get(neighbor)
+                if known is None or new_distance < known:
+                    distances[neighbor] = new_distance
+                    paths[neighbor] = paths[station]
+                    predecessors[neighbor] = [station]
+                    heapq.heappush(queue, (new_distance, neighbor))
+                elif new_distance == known:
+                    paths[neighbor] += paths[station]
+                    predecessors[neighbor].append(station)
+
+        # Abhängigkeiten in umgekehrter Reihenfolge der Abarbeitung aufsummieren
+        dependency = dict.fromkeys(order, 0.0)
+        for station in reversed(order):
+            share = (1.0 + dependency[station]) / paths[station]
+            for predecessor in predecessors[station]:
+                dependency[predecessor] += paths[predecessor] * share
+            if station != source:
+                betweenness[station] += dependency[station]
+                distance = distances[station]
+                distance_sum[station] += distance
+                reached_by[station] += 1
+                if distance > farthest[station]:
+                    farthest[station] = distance
+
+    return betweenness, distance_sum, reached_by, farthest
+
+
+def _accumulate_in_worker(sources: Sequence[int]) -> Tuple[List[float], List[float], List[int], List[float]]:
+    """Teilsummen für einen Block von Startstationen im Worker-Prozess."""
+    return _accumulate(_worker_graph, sources)
+
+
+def _farthest(graph: Tuple[array, array, array], sources: Sequence[int]) -> List[float]:
+    """
+    Größte Distanz je Station über Dijkstra-Suchen von allen Startstationen,
+    ohne die Zählung der kürzesten Wege für die Betweenness.
+    """
+    offsets, targets, weights = graph
+    farthest = [0.0] * (len(offsets) - 1)
+
+    for source in sources:
+        distances = {source: 0}
+        queue = [(0, source)]
+        while queue:
+            distance, station = heapq.heappop(queue)
+            if distance > distances[station]:
+                continue
+            if distance > farthest[station]:
+                farthest[station] = distance
+            for edge in range(offsets[station], offsets[station + 1]):
+                neighbor = targets[edge]
+                new_distance = distance + weights[edge]
+                known = distances.get(neighbor)
+                if known is None or new_distance < known:
+                    distances[neighbor] = new_distance
+                    heapq.heappush(queue, (new_distance, neighbor))
+
+    return farthest
+
+
+def _farthest_in_worker(sources: Sequence[int]) -> List[float]:
+    """Größte Distanzen für einen Block von Startstationen im Worker-Prozess."""
+    return _farthest(_worker_graph, sources)
+
+
+def _distribute(graph: Tuple[array, array, array], sources: List[int], workers: Optional[int],
+                local, in_worker) -> list:
+    """
+    Verteilt die Startstationen auf einen Prozesspool und liefert die
+    Teilergebnisse. Jeder Worker erhält genau einen Block und sammelt darin
+    alle seine Startstationen in einem Ergebnis, sodass nur so viele
+    Teilergebnisse zusammengeführt werden wie es Worker gibt. Die Blöcke
+    nehmen jede `workers`-te Station, damit sich große und kleine Suchen
+    gleichmäßig verteilen. `workers=1` rechnet mit `local` im aktuellen Prozess.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(sources))
+    if workers <= 1:
+        return [local(graph, sources)]
+    chunks = [sources[i::workers] for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(graph,)) as pool:
+        return list(pool.map(in_worker, chunks))
+
+
+def analyze(network: Network, workers: Optional[int] = None, samples: Optional[int] = None,
+            seed: Optional[int] = None) -> NetworkAnalytics:
+    """
+    Berechnet Betweenness, Closeness, Exzentrizität und Durchmesser des Netzes
+    auf demselben gewichteten Graphen wie shortest_path.
+
+    Die Suchen von allen Startstationen werden auf einen Prozesspool verteilt;
+    jeder Worker liefert einmal Teilsummen, die am Ende zusammengeführt
+    werden. Mit `samples` wird nur eine zufällige Stichprobe von Startstationen
+    verwendet und die Ergebnisse werden hochgerechnet. `workers=1` rechnet
+    ohne Prozesspool im aktuellen Prozess.
+    """
+    indexed = network.indexed()
+    n = len(indexed)
+    graph = (indexed.offsets, indexed.targets, indexed.weights)
+
+    sources = list(range(n))
+    if samples is not None and samples < n:
+        sources = sorted(random.Random(seed).sample(sources, samples))
+    sampled = set(sources) if len(sources) < n else None
+
+    partials = _distribute(graph, sources, workers, _accumulate, _accumulate_in_worker)
+
+    betweenness = [0.0] * n
+    distance_sum = [0.0] * n
+    reached_by = [0] * n
+    farthest = [0.0] * n
+    for part_betweenness, part_distance_sum, part_reached_by, part_farthest in partials:
+        for i in range(n):
+            betweenness[i] += part_betweenness[i]
+            distance_sum[i] += part_distance_sum[i]
+            reached_by[i] += part_reached_by[i]
+            if part_farthest[i] > farthest[i]:
+                farthest[i] = part_farthest[i]
+
+    # Ungerichteter Graph: jeder Weg wurde von beiden Enden aus gezählt
+    scale = n / len(sources) if sources else 0.0
+    betweenness_result: Dict[Station, float] = {}
+    closeness_result: Dict[Station, float] = {}
+    eccentricity_result: Dict[Station, float] = {}
+    for i, station in enumerate(indexed.stations):
+        betweenness_result[station] = betweenness[i] * scale / 2
+        # Hochrechnung von den (übrigen) Startstationen auf alle anderen Stationen
+        other_sources = len(sources) - (1 if sampled is None or i in sampled else 0)
+        factor = (n - 1) / other_sources if other_sources else 0.0
+        reachable = reached_by[i] * factor
+        total = distance_sum[i] * factor
+        # Closeness nach Wasserman und Faust, auch für nicht zusammenhängende Netze
+        closeness_result[station] = (reachable / total) * (reachable / (n - 1)) if total > 0 else 0.0
+        eccentricity_result[station] = farthest[i]
+
+    diameter = max(farthest, default=0.0)
+    return NetworkAnalytics(betweenness_result, closeness_result, eccentricity_result, diameter, len(sources))
+
+
+def betweenness_centrality(network: Network, workers: Optional[int] = None,
+                           samples: Optional[int] = None, seed: Optional[int] = None) -> Dict[Station, float]:
+    """Betweenness-Zentralität aller Stationen (siehe analyze)."""
+    return analyze(network, workers, samples, seed).betweenness
+
+
+def closeness_centrality(network: Network, workers: Optional[int] = None,
+                         samples: Optional[int] = None, seed: Optional[int] = None) -> Dict[Station, float]:
+    """Closeness-Zentralität aller Stationen (siehe analyze)."""
+    return analyze(network, workers, samples, seed).closeness
+
+
+def eccentricity(network: Network, workers: Optional[int] = None) -> Dict[Station, float]:
+    """
+    Exzentrizität aller Stationen: größte kürzeste Reisedauer zu einer
+    erreichbaren Station. Anders als analyze werden nur Distanzen berechnet.
+    """
+    indexed = network.indexed()
+    n = len(indexed)
+    farthest = [0.0] * n
+    for part in _distribute((indexed.offsets, indexed.targets, indexed.weights), list(range(n)),
+                            workers, _farthest, _farthest_in_worker):
+        for i in range(n):
+            if part[i] > farthest[i]:
+                farthest[i] = part[i]
+    return dict(zip(indexed.stations, farthest))
+
+
+def diameter(network: Network, workers: Optional[int] = None) -> float:
+    """Durchmesser des Netzes: größte kürzeste Reisedauer zwischen zwei verbundenen Stationen."""
+    return max(eccentricity(network, workers).values(), default=0.0)
@@ -0,0 +1,213 @@
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+import heapq
+
+from traffic_network.station import Station
+
+class Chain:
+    """
+    Eine Kette von Stationen zwischen zwei Kernstationen, deren innere
+    Stationen genau zwei Nachbarn haben. Im komprimierten Graphen wird sie
+    durch eine einzige gewichtete Kante ersetzt.
+    """
+
+    def __init__(self, stations: List[Station], offsets: List[int]) -> None:
+        # stations[0] und stations[-1] sind Kernstationen, offsets[i] ist die
+        # Reisedauer von stations[0] bis stations[i]
+        self.stations = stations
+        self.offsets = offsets
+
+    @property
+    def duration(self) -> int:
+        return self.offsets[-1]
+
+    def __repr__(self) -> str:
+        return f"Chain({self.stations[0]!r} -> {self.stations[-1]!r}, {len(self.stations) - 2} inner, {self.duration} min)"
+
+
+class CompressedGraph:
+    """
+    Komprimierter Graph eines Netzwerks: Ketten von Stationen mit genau zwei
+    Nachbarn werden zu einzelnen Kanten zwischen Kernstationen zusammengefasst.
+    Die Dijkstra-Suche läuft nur über die Kernstationen; die vollständige
+    Stationsfolge wird bei der Pfadrekonstruktion wieder ausgepackt.
+    """
+
+    def __init__(self, graph: Dict[Station, List[Tuple[Station, int]]]) -> None:
+        # Einfacher Graph: parallele Verbindungen auf die kürzeste reduzieren, Schleifen entfernen
+        neighbors: Dict[Station, Dict[Station, int]] = {}
+        for station, edges in graph.items():
+            best: Dict[Station, int] = {}
+            for neighbor, duration in edges:
+                if neighbor != station and duration < best.get(neighbor, duration + 1):
+                    best[neighbor] = duration
+            neighbors[station] = best
+
+        self.chains: List[Chain] = []
+        # Kernstation -> [(Nachbar-Kernstation, Dauer, Kettenindex, vorwärts)]
+        self.core: Dict[Station, List[Tuple[Station, int, int, bool]]] = {
+            station: [] for station, best in neighbors.items() if len(best) != 2
+        }
+        # Innere Station -> (Kettenindex, Position in der Kette)
+        self.inner: Dict[Station, Tuple[int, int]] = {}
+        # Bereits erfasste direkte Kanten zwischen zwei Kernstationen
+        self._direct_edges: set = set()
+
+        for station in list(self.core):
+            for neighbor in neighbors[station]:
+                self._follow_chain(neighbors, station, neighbor)
+
+        # Isolierte Kreise ohne Kernstation: eine beliebige Station wird zum Kern
+        for station in neighbors:
+            if station not in self.core and station not in self.inner:
+                self.core[station] = []
+                for neighbor in neighbors[station]:
+                    self._follow_chain(neighbors, station, neighbor)
+
+    def _follow_chain(self, neighbors: Dict[Station, Dict[Station, int]],
+                      start: Station, first: Station) -> None:
+        """Verfolgt eine Kette ab der Kernstation `start` über den Nachbarn `first`."""
+        if first in self.inner:
+            return  # Kette wurde bereits vom anderen Ende aus erfasst
+        if first in self.core:
+            # Direkte Kante zwischen zwei Kernstationen; nur einmal je Stationspaar anlegen
+            if (first, start) in self._direct_edges:
+                return
+            self._direct_edges.add((start, first))
+        stations = [start, first]
+        offsets = [0, neighbors[start][first]]
+        previous, current = start, first
+        while current not in self.core:
+            following = next(n for n in neighbors[current] if n != previous)
+            offsets.append(offsets[-1] + neighbors[current][following])
+            stations.append(following)
+            previous, current = current, following
+
+        index = len(self.chains)
+        self.chains.append(Chain(stations, offsets))
+        for position in range(1, len(stations) - 1):
+            self.inner[stations[position]] = (index, position)
+        end = stations[-1]
+        self.core[start].append((end, offsets[-1], index, True))
+        self.core[end].append((start, offsets[-1], index, False))
+
+    def _anchors(self, station: Station) -> List[Tuple[Station, int, int, bool]]:
+        """
+        Liefert die Kernstationen, über die eine Station erreicht wird:
+        (Kernstation, Dauer, Kettenindex, Kette vorwärts von der Kernstation aus).
+        """
+        if station in self.core:
+            return [(station, 0, -1, True)]
+        index, position = self.inner[station]
+        chain = self.chains[index]
+        return [(chain.stations[0], chain.offsets[position], index, True),
+                (chain.stations[-1], chain.duration - chain.offsets[position], index, False)]
+
+    @staticmethod
+    def _segment(chain: Chain, position_from: int, position_to: int) -> List[Station]:
+        """Stationen einer Kette zwischen zwei Positionen (beide inklusive)."""
+        if position_from <= position_to:
+            return chain.stations[position_from:position_to + 1]
+        return chain.stations[position_to:position_from + 1][::-1]
+
+    def shortest_path(self, start: Station, end: Station) -> Optional[Tuple[int, List[Station]]]:
+        """
+        Berechnet die kürzeste Reisedauer zwischen zwei Stationen auf dem
+        komprimierten Graphen. Gibt wie Network.shortest_path ein Tupel
+        (Gesamtdauer, [Liste der Stationen im Pfad]) oder None zurück.
+        """
+        if start not in self.core and start not in self.inner:
+            return None
+        if end not in self.core and end not in self.inner:
+            return None
+        if start == end:
+            return 0, [start]
+
+        best: float = float('inf')
+        meeting: Optional[Station] = None
+        direct: List[Station] = []
+        # Start und Ziel auf derselben Kette: direkter Weg entlang der Kette
+        if start in self.inner and end in self.inner and self.inner[start][0] == self.inner[end][0]:
+            index, position_start = self.inner[start]
+            position_end = self.inner[end][1]
+            chain = self.chains[index]
+            best = abs(chain.offsets[position_end] - chain.offsets[position_start])
+            direct = self._segment(chain, position_start, position_end)
+
+        # Zielanker: Kernstation -> (Restdauer bis zum Ziel, Kettenindex, vorwärts)
+        targets: Dict[Station, Tuple[int, int, bool]] = {}
+        for core, duration, index, forward in self._anchors(end):
+            if core not in targets or duration < targets[core][0]:
+                targets[core] = (duration, index, forward)
+
+        infinity = float('inf')
+        distances: Dict[Station, int] = {}
+        # Vorgänger je Kernstation: (vorige Kernstation, Kettenindex, vorwärts) oder Startanker
+        previous: Dict[Station, Tuple[Optional[Station], int, bool]] = {}
+        tie_breaker = count()
+        queue: List[Tuple[int, int, Station]] = []
+        for core, duration, index, forward in self._anchors(start):
+            if duration < distances.get(core, infinity):
+                distances[core] = duration
+                previous[core] = (None, index, forward)
+                heapq.heappush(queue, (duration, next(tie_breaker), core))
+
+        while queue:
+            current_distance, _, current = heapq.heappop(queue)
+            if current_distance >= best:
+                break
+            if current_distance > distances[current]:
+                continue
+            if current in targets:
+                total = current_distance + targets[current][0]
+                if total < best:
+                    best = total
+                    meeting = current
+            for neighbor, duration, index, forward in self.core[current]:
+                distance = current_distance + duration
+                if distance < distances.get(neighbor, infinity):
+                    distances[neighbor] = distance
+                    previous[neighbor] = (current, index, forward)
+                    heapq.heappush(queue, (distance, next(tie_breaker), neighbor))
+
+        if best == infinity:
+            return None
+        if meeting is None:
+            return best, direct
+        return best, self._expand(start, end, meeting, previous, targets)
+
+    def _expand(self, start: Station, end: Station, meeting: Station,
+                previous: Dict[Station, Tuple[Optional[Station], int, bool]],
+                targets: Dict[Station, Tuple[int, int, bool]]) -> List[Station]:
+        """Packt den Pfad über die Kernstationen wieder in die vollständige Stationsfolge aus."""
+        # Rückwärts über die Kernstationen bis zum Startanker
+        segments: List[List[Station]] = []
+        current = meeting
+        while True:
+            before, index, forward = previous[current]
+            if before is None:
+                if index != -1:
+                    # Erstes Teilstück: von der inneren Startstation bis zur ersten Kernstation
+                    chain = self.chains[index]
+                    position = self.inner[start][1]
+                    segments.append(self._segment(chain, position, 0 if forward else len(chain.stations) - 1))
+                else:
+                    segments.append([current])
+                break
+            chain = self.chains[index]
+            stations = chain.stations if forward else chain.stations[::-1]
+            segments.append(stations)
+            current = before
+        segments.reverse()
+
+        path: List[Station] = list(segments[0])
+        for segment in segments[1:]:
+            path.extend(segment[1:])
+
+        # Letztes Teilstück: von der Kernstation bis zur inneren Zielstation
+        _, index, forward = targets[meeting]
+        if index != -1:
+            chain = self.chains[index]
+            position = self.inner[end][1]
+            path.extend(self._segment(chain, 0 if forward else len(chain.stations) - 1, position)[1:])
+        return path
@@ -1,13 +1,21 @@
+from typing import Optional
+
 from traffic_network.station import Station
 
 class Connection:
-    """Verbindet zwei Stationen mit einer Reisedauer in Minuten."""
+    """
+    Verbindet zwei Stationen mit einer Reisedauer in Minuten. Die optionale
+    Linie wird bei der Suche mit Umstiegszeiten berücksichtigt.
+    """
     
-    def __init__(self, station1: Station, station2: Station, duration: int) -> None:
+    def __init__(self, station1: Station, station2: Station, duration: int,
+                 line: Optional[str] = None) -> None:
         self.station1 = station1
         self.station2 = station2
         self.duration = duration
+        self.line = line
 
     def __repr__(self) -> str:
+        line = f", {self.line!r}" if self.line is not None else ""
         return (f"Connection({self.station1!r}, {self.station2!r}, "
-                f"{self.duration} min)")
+                f"{self.duration} min{line})")
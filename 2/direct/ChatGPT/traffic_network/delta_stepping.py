@@ -0,0 +1,285 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple, Union
+import heapq
+import os
+
+from traffic_network.indexed import IndexedGraph
+
+# Gemeinsame Speicherblöcke des jeweiligen Worker-Prozesses
+_worker_blocks: List[shared_memory.SharedMemory] = []
+_worker_views: Dict[str, memoryview] = {}
+_worker_layout: Dict[str, int] = {}
+
+# Phasen mit weniger Kanten laufen ohne Prozesspool im aktuellen Prozess
+_SEQUENTIAL_EDGES = 4096
+
+def _attach(names: Dict[str, Tuple[str, str]], layout: Dict[str, int]) -> None:
+    """Verbindet einen Worker mit den gemeinsamen Speicherblöcken."""
+    for key, (name, typecode) in names.items():
+        block = shared_memory.SharedMemory(name=name)
+        _worker_blocks.append(block)
+        _worker_views[key] = block.buf.cast(typecode)
+    _worker_layout.update(layout)
+
+
+def _relax(views: Dict[str, memoryview], layout: Dict[str, int], slot: int,
+           lo: int, hi: int, light: bool, delta: Union[int, float]) -> None:
+    """
+    Phase 1: Untersucht die leichten oder schweren Kanten der Stationen
+    frontier[lo:hi] und schreibt Verbesserungen als Anfragen, nach
+    Eigentümer der Zielstation sortiert, in den Puffer von `slot`.
+    """
+    offsets, targets, weights = views["offsets"], views["targets"], views["weights"]
+    distances, frontier = views["distances"], views["frontier"]
+    owners = layout["workers"]
+    per_owner: List[List[Tuple[int, Union[int, float], int]]] = [[] for _ in range(owners)]
+    for position in range(lo, hi):
+        station = frontier[position]
+        distance = distances[station]
+        for edge in range(offsets[station], offsets[station + 1]):
+            weight = weights[edge]
+            if (weight <= delta) != light:
+                continue
+            neighbor = targets[edge]
+            candidate = distance + weight
+            if candidate < distances[neighbor]:
+                per_owner[neighbor % owners].append((neighbor, candidate, station))
+
+    request_targets, request_distances = views["request_targets"], views["request_distances"]
+    request_sources, segments = views["request_sources"], views["segments"]
+    base = slot * layout["capacity"]
+    row = slot * (owners + 1)
+    position = base
+    segments[row] = 0
+    for owner, requests in enumerate(per_owner):
+        for neighbor, candidate, station in requests:
+            request_targets[position] = neighbor
+            request_distances[position] = candidate
+            request_sources[position] = station
+            position += 1
+        segments[row + owner + 1] = position - base
+
+
+def _apply(views: Dict[str, memoryview], layout: Dict[str, int], owner: int, slots: int) -> int:
+    """
+    Phase 2: Übernimmt alle Anfragen an die Stationen des Eigentümers
+    `owner`. Da jede Station genau einen Eigentümer hat, schreiben die
+    Worker nie gleichzeitig auf dieselbe Distanz. Die verbesserten
+    Stationen landen im Bereich `owner` des Puffers `improved`.
+    """
+    distances, parents = views["distances"], views["parents"]
+    request_targets, request_distances = views["request_targets"], views["request_distances"]
+    request_sources, segments, improved = views["request_sources"], views["segments"], views["improved"]
+    owners, capacity = layout["workers"], layout["capacity"]
+    base = owner * layout["owned"]
+    seen = set()
+    count = 0
+    for slot in range(slots):
+        row = slot * (owners + 1)
+        start = slot * capacity
+        for position in range(start + segments[row + owner], start + segments[row + owner + 1]):
+            neighbor = request_targets[position]
+            candidate = request_distances[position]
+            if candidate < distances[neighbor]:
+                distances[neighbor] = candidate
+                parents[neighbor] = request_sources[position]
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    improved[base + count] = neighbor
+                    count += 1
+    return count
+
+
+def _relax_in_worker(slot: int, lo: int, hi: int, light: bool, delta: Union[int, float]) -> None:
+    _relax(_worker_views, _worker_layout, slot, lo, hi, light, delta)
+
+
+def _apply_in_worker(owner: int, slots: int) -> int:
+    return _apply(_worker_views, _worker_layout, owner, slots)
+
+
+class ParallelDeltaStepping:
+    """
+    Delta-Stepping für vollständige Kürzeste-Wege-Bäume auf sehr großen
+    Netzen, verteilt auf mehrere Prozesse.
+
+    Graph, Distanzen und Vorgänger liegen in gemeinsamem Speicher. Jede
+    Phase läuft in zwei Schritten: Zuerst untersuchen die Worker je einen
+    Teil der aktuellen Bucket-Stationen und erzeugen Anfragen, danach
+    übernimmt jeder Worker die Anfragen an die Stationen, die ihm gehören
+    (Station mod Anzahl Worker). So sind keine Sperren nötig. Kleine Phasen
+    werden direkt im aktuellen Prozess berechnet.
+
+    Die Instanz hält Prozesspool und Speicher bis close() bzw. bis zum Ende
+    eines with-Blocks und kann für mehrere Suchen verwendet werden.
+    """
+
+    def __init__(self, graph: IndexedGraph, workers: Optional[int] = None,
+                 delta: Optional[Union[int, float]] = None) -> None:
+        self.graph = graph
+        self.workers = workers or os.cpu_count() or 1
+        n = len(graph)
+        edges = len(graph.targets)
+        if delta is None:
+            # Mittleres Kantengewicht: genug Parallelität je Bucket bei wenigen Wiederholungen
+            average = sum(graph.weights) / edges if edges else 1
+            delta = max(1, round(average)) if graph.weights.typecode == 'q' else average or 1.0
+        self.delta = delta
+        self.infinity: Union[int, float] = 2 ** 62 if graph.weights.typecode == 'q' else float('inf')
+
+        max_degree = max((graph.offsets[i + 1] - graph.offsets[i] for i in range(n)), default=0)
+        self._layout = {
+            "workers": self.workers,
+            # Ein Arbeitspaket umfasst höchstens ceil(E / P) + maximaler Grad Kanten
+            "capacity": -(-edges // self.workers) + max_degree,
+            "owned": -(-n // self.workers),
+        }
+        distance_code = graph.weights.typecode
+        sizes = {
+            "offsets": ('q', n + 1), "targets": ('q', edges), "weights": (distance_code, edges),
+            "distances": (distance_code, n), "parents": ('q', n), "frontier": ('q', n),
+            "request_targets": ('q', self.workers * self._layout["capacity"]),
+            "request_distances": (distance_code, self.workers * self._layout["capacity"]),
+            "request_sources": ('q', self.workers * self._layout["capacity"]),
+            "segments": ('q', self.workers * (self.workers + 1)),
+            "improved": ('q', self.workers * self._layout["owned"]),
+        }
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self._views: Dict[str, memoryview] = {}
+        names: Dict[str, Tuple[str, str]] = {}
+        for key, (typecode, length) in sizes.items():
+            block = shared_memory.SharedMemory(create=True, size=max(1, length) * 8)
+            self._blocks.append(block)
+            self._views[key] = block.buf.cast(typecode)
+            names[key] = (block.name, typecode)
+        # Blöcke können größer als angefordert sein; kopiert wird nur der genutzte Anfang
+        self._views["offsets"][:n + 1] = graph.offsets
+        self._views["targets"][:edges] = graph.targets
+        self._views["weights"][:edges] = graph.weights
+        self._pool: Optional[ProcessPoolExecutor] = None
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_attach,
+                                             initargs=(names, self._layout))
+
+    def __enter__(self) -> "ParallelDeltaStepping":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Beendet den Prozesspool und gibt den gemeinsamen Speicher frei."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks.clear()
+
+    def _bucket(self, distance: Union[int, float]) -> int:
+        return int(distance // self.delta)
+
+    def _phase(self, stations: List[int], light: bool) -> List[int]:
+        """Relaxiert die leichten oder schweren Kanten der Stationen; liefert die verbesserten Stationen."""
+        views, offsets = self._views, self.graph.offsets
+        degrees = [offsets[station + 1] - offsets[station] for station in stations]
+        total = sum(degrees)
+        if self._pool is None or total < _SEQUENTIAL_EDGES:
+            return self._sequential_phase(stations, light)
+
+        frontier = views["frontier"]
+        for position, station in enumerate(stations):
+            frontier[position] = station
+        # Arbeitspakete mit etwa gleich vielen Kanten
+        target = -(-total // self.workers)
+        chunks: List[Tuple[int, int]] = []
+        lo, load = 0, 0
+        for position, degree in enumerate(degrees):
+            load += degree
+            if load >= target:
+                chunks.append((lo, position + 1))
+                lo, load = position + 1, 0
+        if lo < len(stations):
+            chunks.append((lo, len(stations)))
+
+        pool = self._pool
+        list(pool.map(_relax_in_worker, range(len(chunks)), [lo for lo, _ in chunks], [hi for _, hi in chunks],
+                      [light] * len(chunks), [self.delta] * len(chunks)))
+        counts = list(pool.map(_apply_in_worker, range(self.workers), [len(chunks)] * self.workers))
+        improved = views["improved"]
+        owned = self._layout["owned"]
+        result: List[int] = []
+        for owner, count in enumerate(counts):
+            result.extend(improved[owner * owned:owner * owned + count])
+        return result
+
+    def _sequential_phase(self, stations: List[int], light: bool) -> List[int]:
+        """Eine Phase ohne Prozesspool, direkt auf den gemeinsamen Arrays."""
+        views = self._views
+        offsets, targets, weights = views["offsets"], views["targets"], views["weights"]
+        distances, parents = views["distances"], views["parents"]
+        delta = self.delta
+        improved: List[int] = []
+        for station in stations:
+            distance = distances[station]
+            for edge in range(offsets[station], offsets[station + 1]):
+                weight = weights[edge]
+                if (weight <= delta) != light:
+                    continue
+                neighbor = targets[edge]
+                candidate = distance + weight
+                if candidate < distances[neighbor]:
+                    distances[neighbor] = candidate
+                    parents[neighbor] = station
+                    improved.append(neighbor)
+        return improved
+
+    def shortest_path_tree(self, start: int) -> Tuple[array, array]:
+        """
+        Berechnet den vollständigen Kürzeste-Wege-Baum ab der Station mit
+        Index `start`. Liefert zwei Arrays, indiziert wie der IndexedGraph:
+        Distanzen (self.infinity für nicht erreichbare Stationen) und
+        Vorgänger (-1 für Start und nicht erreichbare Stationen).
+        """
+        views = self._views
+        distances, parents = views["distances"], views["parents"]
+        n = len(self.graph)
+        for i in range(n):
+            distances[i] = self.infinity
+            parents[i] = -1
+        distances[start] = 0
+
+        buckets: Dict[int, set] = {0: {start}}
+        pending = [0]
+        while pending:
+            index = heapq.heappop(pending)
+            if index not in buckets:
+                continue
+            settled: set = set()
+            while index in buckets:
+                # Veraltete Einträge: Station liegt inzwischen in einem kleineren Bucket
+                frontier = [station for station in buckets.pop(index)
+                            if self._bucket(distances[station]) == index]
+                settled.update(frontier)
+                self._distribute(self._phase(frontier, light=True), buckets, pending)
+            self._distribute(self._phase(list(settled), light=False), buckets, pending)
+
+        return array(distances.format, distances[:n]), array('q', parents[:n])
+
+    def _distribute(self, stations: List[int], buckets: Dict[int, set], pending: List[int]) -> None:
+        """Sortiert verbesserte Stationen in ihre Buckets ein."""
+        distances = self._views["distances"]
+        for station in stations:
+            index = self._bucket(distances[station])
+            bucket = buckets.get(index)
+            if bucket is None:
+                buckets[index] = {station}
+                heapq.heappush(pending, index)
+            else:
+                bucket.add(station)
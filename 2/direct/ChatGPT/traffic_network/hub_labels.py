@@ -0,0 +1,203 @@
+from array import array
+from itertools import count
+from typing import Dict, List, Optional, Union
+import heapq
+import struct
+
+from traffic_network.station import Station
+from traffic_network.indexed import IndexedGraph
+
+# Dateiformat: Kopf, Namens-Offsets, Namen (UTF-8), Label-Offsets, Hubs, Distanzen
+_MAGIC = b"TNHUBLBL"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIcxxxqqq")
+
+class HubLabelIndex:
+    """
+    Hub-Labeling-Index (Pruned Landmark Labeling) für Distanzanfragen in
+    nahezu konstanter Zeit. Jede Station besitzt ein nach Hub-Rang sortiertes
+    Label aus Paaren (Hub, Distanz); die Distanz zweier Stationen ist das
+    Minimum über die gemeinsamen Hubs beider Labels.
+
+    Die Labels liegen kompakt in drei flachen Arrays: Label-Offsets je
+    Station, Hub-Ränge und Distanzen.
+    """
+
+    def __init__(self, stations: List[Station], offsets: array, hubs: array, distances: array) -> None:
+        self.stations = stations
+        self.index: Dict[Station, int] = {station: i for i, station in enumerate(stations)}
+        self.offsets = offsets
+        self.hubs = hubs
+        self.distances = distances
+
+    @classmethod
+    def build(cls, graph: IndexedGraph) -> "HubLabelIndex":
+        """
+        Berechnet die Labels offline mit Pruned Landmark Labeling. Die Stationen
+        werden in der Reihenfolge von _hub_order() als Hubs verarbeitet; jede
+        Dijkstra-Suche wird an Stationen abgeschnitten, deren Distanz bereits
+        durch die vorhandenen Labels abgedeckt ist.
+        """
+        n = len(graph)
+        order = cls._hub_order(graph)
+        label_hubs: List[List[int]] = [[] for _ in range(n)]
+        label_distances: List[List[Union[int, float]]] = [[] for _ in range(n)]
+        infinity = float('inf')
+        # Distanzen des aktuellen Wurzel-Labels, indiziert nach Hub-Rang
+        root_label: List[Union[int, float]] = [infinity] * n
+
+        for rank, root in enumerate(order):
+            for hub, distance in zip(label_hubs[root], label_distances[root]):
+                root_label[hub] = distance
+
+            distances: Dict[int, Union[int, float]] = {root: 0}
+            tie_breaker = count()
+            queue = [(0, next(tie_breaker), root)]
+            while queue:
+                distance, _, station = heapq.heappop(queue)
+                if distance > distances[station]:
+                    continue
+                # Pruning: Ist die Distanz bereits über frühere Hubs abgedeckt, endet die Suche hier
+                covered = False
+                for hub, hub_distance in zip(label_hubs[station], label_distances[station]):
+                    if root_label[hub] + hub_distance <= distance:
+                        covered = True
+                        break
+                if covered:
+                    continue
+                label_hubs[station].append(rank)
+                label_distances[station].append(distance)
+                for neighbor, duration in graph.neighbors(station):
+                    new_distance = distance + duration
+                    if new_distance < distances.get(neighbor, infinity):
+                        distances[neighbor] = new_distance
+                        heapq.heappush(queue, (new_distance, next(tie_breaker), neighbor))
+
+            for hub in label_hubs[root]:
+                root_label[hub] = infinity
+
+        offsets = array('q', [0])
+        hubs = array('l')
+        flat_distances = array(graph.weights.typecode)
+        for station in range(n):
+            hubs.extend(label_hubs[station])
+            flat_distances.extend(label_distances[station])
+            offsets.append(len(hubs))
+        return cls(list(graph.stations), offsets, hubs, flat_distances)
+
+    @staticmethod
+    def _hub_order(graph: IndexedGraph, samples: int = 16) -> List[int]:
+        """
+        Bestimmt die Reihenfolge der Hubs. Stationen, die in den Bäumen
+        kürzester Wege einiger Stichproben-Wurzeln viele Nachfahren haben,
+        liegen auf vielen kürzesten Wegen und werden zuerst verarbeitet;
+        bei Gleichstand entscheidet der Grad.
+        """
+        n = len(graph)
+        coverage = [0] * n
+        step = max(1, n // samples)
+        infinity = float('inf')
+        for root in range(0, n, step):
+            distances: Dict[int, Union[int, float]] = {root: 0}
+            parent = {root: -1}
+            settled: List[int] = []
+            queue = [(0, root)]
+            while queue:
+                distance, station = heapq.heappop(queue)
+                if distance > distances[station]:
+                    continue
+                settled.append(station)
+                for neighbor, duration in graph.neighbors(station):
+                    new_distance = distance + duration
+                    if new_distance < distances.get(neighbor, infinity):
+                        distances[neighbor] = new_distance
+                        parent[neighbor] = station
+                        heapq.heappush(queue, (new_distance, neighbor))
+            # Nachfahren je Station in umgekehrter Abarbeitungsreihenfolge aufsummieren
+            descendants = dict.fromkeys(settled, 1)
+            for station in reversed(settled):
+                if parent[station] != -1:
+                    descendants[parent[station]] += descendants[station]
+            for station, size in descendants.items():
+                coverage[station] += size
+        return sorted(range(n), key=lambda i: (-coverage[i], graph.offsets[i] - graph.offsets[i + 1]))
+
+    def distance(self, start: Station, end: Station) -> Optional[Union[int, float]]:
+        """
+        Liefert die kürzeste Reisedauer zwischen zwei Stationen durch
+        Zusammenführen der beiden sortierten Labels oder None, falls die
+        Stationen nicht verbunden sind.
+        """
+        if start not in self.index or end not in self.index:
+            return None
+        a, b = self.index[start], self.index[end]
+        hubs, distances = self.hubs, self.distances
+        i, i_end = self.offsets[a], self.offsets[a + 1]
+        j, j_end = self.offsets[b], self.offsets[b + 1]
+        best = None
+        while i < i_end and j < j_end:
+            hub_a, hub_b = hubs[i], hubs[j]
+            if hub_a == hub_b:
+                total = distances[i] + distances[j]
+                if best is None or total < best:
+                    best = total
+                i += 1
+                j += 1
+            elif hub_a < hub_b:
+                i += 1
+            else:
+                j += 1
+        return best
+
+    @property
+    def average_label_size(self) -> float:
+        """Durchschnittliche Anzahl der Einträge je Label."""
+        return len(self.hubs) / len(self.stations) if self.stations else 0.0
+
+    def save(self, path: str) -> None:
+        """Speichert den Index im Binärformat."""
+        names = [station.name.encode("utf-8") for station in self.stations]
+        name_offsets = array('q', [0])
+        for name in names:
+            name_offsets.append(name_offsets[-1] + len(name))
+        hubs = array('q', self.hubs)
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, self.distances.typecode.encode("ascii"),
+                                    len(self.stations), len(hubs), name_offsets[-1]))
+            name_offsets.tofile(file)
+            file.write(b"".join(names))
+            array('q', self.offsets).tofile(file)
+            hubs.tofile(file)
+            self.distances.tofile(file)
+
+    @classmethod
+    def load(cls, path: str) -> "HubLabelIndex":
+        """
+        Lädt einen mit save() gespeicherten Index.
+
+        Raises:
+            ValueError: Wenn die Datei kein Hub-Label-Index in einer
+                unterstützten Version ist
+        """
+        with open(path, "rb") as file:
+            header = file.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError(f"'{path}' ist kein Hub-Label-Index")
+            magic, version, typecode, station_count, entry_count, names_size = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                raise ValueError(f"'{path}' ist kein Hub-Label-Index")
+            if version != _VERSION:
+                raise ValueError(f"Nicht unterstützte Version {version} des Hub-Label-Index")
+
+            name_offsets = array('q')
+            name_offsets.fromfile(file, station_count + 1)
+            names = file.read(names_size)
+            stations = [Station(names[name_offsets[i]:name_offsets[i + 1]].decode("utf-8"))
+                        for i in range(station_count)]
+            offsets = array('q')
+            offsets.fromfile(file, station_count + 1)
+            stored_hubs = array('q')
+            stored_hubs.fromfile(file, entry_count)
+            distances = array(typecode.decode("ascii"))
+            distances.fromfile(file, entry_count)
+        return cls(stations, offsets, array('l', stored_hubs), distances)
@@ -0,0 +1,33 @@
+from array import array
+from typing import Dict, List, Tuple
+
+from traffic_network.station import Station
+
+class IndexedGraph:
+    """
+    Ganzzahlig indizierte, array-basierte Kopie des Netzwerkgraphen im
+    CSR-Format. Die Nachbarn der Station `i` liegen in
+    targets[offsets[i]:offsets[i + 1]] mit den Dauern in `weights`.
+    """
+
+    def __init__(self, graph: Dict[Station, List[Tuple[Station, int]]]) -> None:
+        self.stations: List[Station] = list(graph)
+        self.index: Dict[Station, int] = {station: i for i, station in enumerate(self.stations)}
+        # Ganzzahlige Dauern werden als 64-Bit-Ganzzahlen gespeichert, sonst als float
+        integral = all(isinstance(duration, int) for edges in graph.values() for _, duration in edges)
+        self.offsets = array('q', [0])
+        self.targets = array('q')
+        self.weights = array('q' if integral else 'd')
+        for station in self.stations:
+            for neighbor, duration in graph[station]:
+                self.targets.append(self.index[neighbor])
+                self.weights.append(duration)
+            self.offsets.append(len(self.targets))
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def neighbors(self, i: int) -> zip:
+        """Liefert Paare (Nachbarindex, Dauer) der Station mit Index `i`."""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
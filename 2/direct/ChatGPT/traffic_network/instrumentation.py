@@ -0,0 +1,41 @@
+from typing import Dict, Union
+
+class SearchStatistics:
+    """
+    Kennzahlen einer Dijkstra-Suche. Ein Objekt wird auf Wunsch an
+    shortest_path übergeben und während der Suche gefüllt; ohne Objekt
+    läuft die Suche ohne Zählung.
+
+    Attributes:
+        settled: Abgeschlossene Stationen (gültige Entnahmen aus der Warteschlange)
+        relaxations: Untersuchte Kanten
+        pushes: Einfügungen in die Warteschlange
+        stale_pops: Entnahmen veralteter Einträge
+        peak_queue: Größte Länge der Warteschlange
+        setup_seconds: Aufbau des Graphen und Initialisierung
+        search_seconds: Eigentliche Suche
+        reconstruction_seconds: Rekonstruktion des Pfads
+    """
+
+    def __init__(self) -> None:
+        self.settled = 0
+        self.relaxations = 0
+        self.pushes = 0
+        self.stale_pops = 0
+        self.peak_queue = 0
+        self.setup_seconds = 0.0
+        self.search_seconds = 0.0
+        self.reconstruction_seconds = 0.0
+
+    @property
+    def total_seconds(self) -> float:
+        return self.setup_seconds + self.search_seconds + self.reconstruction_seconds
+
+    def as_dict(self) -> Dict[str, Union[int, float]]:
+        """Liefert alle Kennzahlen als Dictionary, z. B. für Logging oder JSON."""
+        return {**vars(self), "total_seconds": self.total_seconds}
+
+    def __repr__(self) -> str:
+        return (f"SearchStatistics(settled={self.settled}, relaxations={self.relaxations}, "
+                f"pushes={self.pushes}, stale_pops={self.stale_pops}, peak_queue={self.peak_queue}, "
+                f"total={self.total_seconds * 1000:.3f} ms)")
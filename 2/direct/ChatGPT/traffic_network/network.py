@@ -1,19 +1,55 @@
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Sequence, Set, Tuple, Optional, Union
+from collections import OrderedDict
+from itertools import count
 import heapq
+import time
 
 from traffic_network.station import Station
 from traffic_network.connection import Connection
+from traffic_network.compression import CompressedGraph
+from traffic_network.delta_stepping import ParallelDeltaStepping
+from traffic_network.hub_labels import HubLabelIndex
+from traffic_network.indexed import IndexedGraph
+from traffic_network.instrumentation import SearchStatistics
+from traffic_network.overlay import CellOverlay
+from traffic_network.spatial import SpatialIndex
+from traffic_network.waypoints import order_waypoints
 
 class Network:
     """Modelliert ein Verkehrsnetz mit Stationen und Verbindungen."""
-    
+
     def __init__(self) -> None:
         self.stations: set[Station] = set()
         self.connections: List[Connection] = []
+        # Zwischengespeicherte Adjazenzliste, wird bei Änderungen verworfen
+        self._graph: Optional[Dict[Station, List[Tuple[Station, int]]]] = None
+        self._line_graph: Optional[Dict[Station, List[Tuple[Station, int, Optional[str]]]]] = None
+        self._compressed: Optional[CompressedGraph] = None
+        self._indexed: Optional[IndexedGraph] = None
+        self._hub_labels: Optional[HubLabelIndex] = None
+        self._overlay: Optional[CellOverlay] = None
+        self._spatial: Optional[SpatialIndex] = None
+        # Vollständige Kürzeste-Wege-Bäume je Startstation, zuletzt genutzte zuletzt
+        self._trees: OrderedDict = OrderedDict()
+        self.tree_cache_size = 32
+        # Wird, falls gesetzt, nach jeder shortest_path-Anfrage mit deren Kennzahlen aufgerufen
+        self.search_observer: Optional[Callable[[SearchStatistics], None]] = None
+
+    def _invalidate(self) -> None:
+        """Verwirft alle aus Stationen und Verbindungen abgeleiteten Strukturen."""
+        self._graph = None
+        self._line_graph = None
+        self._compressed = None
+        self._indexed = None
+        self._hub_labels = None
+        self._overlay = None
+        self._spatial = None
+        self._trees.clear()
 
     def add_station(self, station: Station) -> None:
         """Fügt eine Station dem Netzwerk hinzu."""
         self.stations.add(station)
+        self._invalidate()
 
     def add_connection(self, connection: Connection) -> None:
         """
@@ -23,30 +59,164 @@ class Network:
         self.add_station(connection.station1)
         self.add_station(connection.station2)
         self.connections.append(connection)
+        self._invalidate()
 
-    def shortest_path(self, start: Station, end: Station) -> Optional[Tuple[int, List[Station]]]:
+    def _adjacency(self) -> Dict[Station, List[Tuple[Station, int]]]:
         """
-        Berechnet mit dem Dijkstra-Algorithmus die kürzeste Reisedauer zwischen
-        zwei Stationen. Gibt ein Tupel (Gesamtdauer, [Liste der Stationen im Pfad])
-        zurück. Falls kein Pfad existiert, wird None zurückgegeben.
+        Liefert den Graphen als Adjazenzliste. Der Graph wird nur nach
+        Änderungen am Netzwerk neu aufgebaut und ansonsten wiederverwendet.
+        """
+        if self._graph is None:
+            graph: Dict[Station, List[Tuple[Station, int]]] = {station: [] for station in self.stations}
+            for connection in self.connections:
+                # Da die Verbindung bidirektional ist, beide Richtungen hinzufügen
+                graph[connection.station1].append((connection.station2, connection.duration))
+                graph[connection.station2].append((connection.station1, connection.duration))
+            self._graph = graph
+        return self._graph
+
+    def _line_adjacency(self) -> Dict[Station, List[Tuple[Station, int, Optional[str]]]]:
+        """Wie _adjacency, jede Kante trägt zusätzlich die Linie ihrer Verbindung."""
+        if self._line_graph is None:
+            graph: Dict[Station, List[Tuple[Station, int, Optional[str]]]] = {station: [] for station in self.stations}
+            for connection in self.connections:
+                graph[connection.station1].append((connection.station2, connection.duration, connection.line))
+                graph[connection.station2].append((connection.station1, connection.duration, connection.line))
+            self._line_graph = graph
+        return self._line_graph
+
+    def indexed(self) -> IndexedGraph:
+        """
+        Liefert eine ganzzahlig indizierte, array-basierte Kopie des Graphen.
+        Die Kopie wird bis zur nächsten Änderung wiederverwendet.
+        """
+        if self._indexed is None:
+            self._indexed = IndexedGraph(self._adjacency())
+        return self._indexed
+
+    def parallel_shortest_path_tree(self, start: Station, workers: Optional[int] = None
+                                    ) -> Tuple[Dict[Station, int], Dict[Station, Optional[Station]]]:
+        """
+        Berechnet den vollständigen Kürzeste-Wege-Baum ab `start` mit
+        parallelem Delta-Stepping auf mehreren Prozessen. Lohnt sich nur für
+        sehr große Netze; für mehrere Bäume auf demselben Netz sollte
+        ParallelDeltaStepping direkt verwendet werden, damit Prozesspool und
+        gemeinsamer Speicher nur einmal aufgebaut werden.
+
+        Gibt wie _dijkstra Distanzen und Vorgänger der erreichbaren Stationen zurück.
+        """
+        graph = self.indexed()
+        if start not in graph.index:
+            return {}, {}
+        with ParallelDeltaStepping(graph, workers) as search:
+            distances, parents = search.shortest_path_tree(graph.index[start])
+            infinity = search.infinity
+        stations = graph.stations
+        reached = [i for i, distance in enumerate(distances) if distance != infinity]
+        return ({stations[i]: distances[i] for i in reached},
+                {stations[i]: stations[parents[i]] if parents[i] != -1 else None for i in reached})
+
+    def build_hub_labels(self) -> HubLabelIndex:
         """
-        # Aufbau des Graphen als Adjazenzliste
-        graph: Dict[Station, List[Tuple[Station, int]]] = {station: [] for station in self.stations}
-        for connection in self.connections:
-            # Da die Verbindung bidirektional ist, beide Richtungen hinzufügen
-            graph[connection.station1].append((connection.station2, connection.duration))
-            graph[connection.station2].append((connection.station1, connection.duration))
+        Berechnet einen Hub-Labeling-Index für das Netzwerk und verwendet ihn
+        ab sofort für distance(). Die Berechnung ist aufwendig und eignet sich
+        für selten veränderte Netze; der Index kann mit save() gespeichert und
+        später per use_hub_labels() wieder eingesetzt werden.
+        """
+        self._hub_labels = HubLabelIndex.build(self.indexed())
+        return self._hub_labels
 
-        # Initialisierung der Dijkstra-Datenstrukturen
-        distances: Dict[Station, int] = {station: float('inf') for station in self.stations}
-        previous: Dict[Station, Optional[Station]] = {station: None for station in self.stations}
-        distances[start] = 0
-        queue: List[Tuple[int, Station]] = [(0, start)]
+    def use_hub_labels(self, index: HubLabelIndex) -> None:
+        """
+        Verwendet einen (z. B. von der Festplatte geladenen) Hub-Labeling-Index
+        für distance(). Der Index muss zum aktuellen Stand des Netzwerks passen;
+        bei jeder Änderung am Netzwerk wird er wieder verworfen.
+        """
+        self._hub_labels = index
+
+    def distance(self, start: Station, end: Station) -> Optional[int]:
+        """
+        Liefert nur die kürzeste Reisedauer zwischen zwei Stationen oder None,
+        falls kein Pfad existiert. Mit einem Hub-Labeling-Index ist dies ein
+        Zusammenführen zweier sortierter Labels, ansonsten eine Dijkstra-Suche.
+        """
+        if self._hub_labels is not None:
+            return self._hub_labels.distance(start, end)
+        distances, _ = self._dijkstra(start, (end,))
+        return distances.get(end)
+
+    def compress(self) -> CompressedGraph:
+        """
+        Liefert den komprimierten Graphen des Netzwerks, in dem Ketten von
+        Stationen mit genau zwei Nachbarn zu einzelnen Kanten zusammengefasst
+        sind. Auf linienlastigen Netzen besucht dessen shortest_path deutlich
+        weniger Stationen. Der Graph wird bis zur nächsten Änderung wiederverwendet.
+        """
+        if self._compressed is None:
+            self._compressed = CompressedGraph(self._adjacency())
+        return self._compressed
+
+    def overlay(self) -> CellOverlay:
+        """
+        Liefert die metrikunabhängige Zellzerlegung des Netzwerks für
+        Customizable Route Planning. Sie hängt nur von Stationen und
+        Verbindungen ab und wird bis zur nächsten Änderung wiederverwendet;
+        neue Reisedauern werden mit overlay().customize(...) eingespielt.
+        """
+        if self._overlay is None:
+            self._overlay = CellOverlay(list(self.stations), self.connections)
+        return self._overlay
+
+    def _dijkstra(self, start: Station, ends: Optional[Iterable[Station]] = None,
+                  max_minutes: Optional[float] = None, statistics: Optional[SearchStatistics] = None
+                  ) -> Tuple[Dict[Station, int], Dict[Station, Optional[Station]]]:
+        """
+        Führt den Dijkstra-Algorithmus ab einer Startstation aus.
+
+        Die Suche endet vorzeitig, sobald alle `ends` erreicht sind. Mit `max_minutes`
+        werden nur Stationen bis zu dieser Reisedauer untersucht. Zurückgegeben
+        werden die gefundenen Distanzen und Vorgänger; Stationen, die nicht
+        erreicht wurden, fehlen in beiden Dictionaries. Mit `statistics` wird
+        die Suche gezählt und gemessen.
+        """
+        return self._multi_source_dijkstra({start: 0}, ends, max_minutes, statistics)
+
+    def _multi_source_dijkstra(self, origins: Dict[Station, float], ends: Optional[Iterable[Station]] = None,
+                               max_minutes: Optional[float] = None,
+                               statistics: Optional[SearchStatistics] = None
+                               ) -> Tuple[Dict[Station, int], Dict[Station, Optional[Station]]]:
+        """
+        Wie _dijkstra, die Suche beginnt aber gleichzeitig an mehreren
+        Stationen mit jeweils eigener Anfangsdauer (z. B. Fußweg zur Station).
+        Mit `statistics` übernimmt _counted_search die Hauptschleife; die
+        Schleife hier zählt nichts.
+        """
+        begin = time.perf_counter() if statistics is not None else 0.0
+        graph = self._adjacency()
+        remaining: Optional[Set[Station]] = set(ends) if ends is not None else None
+        distances: Dict[Station, int] = {}
+        previous: Dict[Station, Optional[Station]] = {}
+        # Der Zähler entscheidet bei gleicher Distanz, damit Stationen nie verglichen werden
+        tie_breaker = count()
+        queue: List[Tuple[int, int, Station]] = []
+        infinity = float('inf')
+        for origin, offset in origins.items():
+            if offset < distances.get(origin, infinity):
+                distances[origin] = offset
+                previous[origin] = None
+                heapq.heappush(queue, (offset, next(tie_breaker), origin))
+        if statistics is not None:
+            statistics.setup_seconds += time.perf_counter() - begin
+            self._counted_search(graph, queue, distances, previous, remaining, max_minutes,
+                                 tie_breaker, statistics)
+            return distances, previous
 
         while queue:
-            current_distance, current_station = heapq.heappop(queue)
-            if current_station == end:
-                break
+            current_distance, _, current_station = heapq.heappop(queue)
+            if remaining is not None and current_station in remaining:
+                remaining.discard(current_station)
+                if not remaining:
+                    break
 
             # Falls ein bereits besserer Weg gefunden wurde, diesen Eintrag überspringen
             if current_distance > distances[current_station]:
@@ -54,21 +224,557 @@ class Network:
 
             for neighbor, duration in graph[current_station]:
                 distance = current_distance + duration
-                if distance < distances[neighbor]:
+                if max_minutes is not None and distance > max_minutes:
+                    continue
+                if distance < distances.get(neighbor, infinity):
                     distances[neighbor] = distance
                     previous[neighbor] = current_station
-                    heapq.heappush(queue, (distance, neighbor))
+                    heapq.heappush(queue, (distance, next(tie_breaker), neighbor))
+        return distances, previous
 
-        # Kein erreichbarer Pfad
-        if distances[end] == float('inf'):
-            return None
+    @staticmethod
+    def _counted_search(graph: Dict[Station, List[Tuple[Station, int]]],
+                        queue: List[Tuple[int, int, Station]], distances: Dict[Station, int],
+                        previous: Dict[Station, Optional[Station]],
+                        remaining: Optional[Set[Station]], max_minutes: Optional[float],
+                        tie_breaker: Iterator[int], statistics: SearchStatistics) -> None:
+        """
+        Hauptschleife von _multi_source_dijkstra mit Zählern und Zeitmessung.
+        Getrennt von der Schleife ohne Statistik, damit diese nichts zählt.
+        """
+        searching = time.perf_counter()
+        infinity = float('inf')
+        settled = relaxations = stale_pops = 0
+        pushes = peak_queue = len(queue)
+
+        while queue:
+            current_distance, _, current_station = heapq.heappop(queue)
+            if remaining is not None and current_station in remaining:
+                remaining.discard(current_station)
+                if not remaining:
+                    settled += 1
+                    break
+
+            if current_distance > distances[current_station]:
+                stale_pops += 1
+                continue
+            settled += 1
+
+            edges = graph[current_station]
+            relaxations += len(edges)
+            for neighbor, duration in edges:
+                distance = current_distance + duration
+                if max_minutes is not None and distance > max_minutes:
+                    continue
+                if distance < distances.get(neighbor, infinity):
+                    distances[neighbor] = distance
+                    previous[neighbor] = current_station
+                    heapq.heappush(queue, (distance, next(tie_breaker), neighbor))
+                    pushes += 1
+            if len(queue) > peak_queue:
+                peak_queue = len(queue)
 
-        # Rekonstruktion des Pfads
+        statistics.search_seconds += time.perf_counter() - searching
+        statistics.settled += settled
+        statistics.relaxations += relaxations
+        statistics.pushes += pushes
+        statistics.stale_pops += stale_pops
+        statistics.peak_queue = max(statistics.peak_queue, peak_queue)
+
+    @staticmethod
+    def _reconstruct_path(previous: Dict[Station, Optional[Station]], end: Station) -> List[Station]:
+        """Rekonstruiert den Pfad zur Station `end` anhand der Vorgänger."""
         path: List[Station] = []
         current: Optional[Station] = end
         while current is not None:
             path.append(current)
             current = previous[current]
         path.reverse()
+        return path
+
+    def shortest_path(self, start: Station, end: Station,
+                      statistics: Optional[SearchStatistics] = None,
+                      transfer_penalties: Union[int, Dict[Station, int], None] = None
+                      ) -> Optional[Tuple[int, List[Station]]]:
+        """
+        Berechnet mit dem Dijkstra-Algorithmus die kürzeste Reisedauer zwischen
+        zwei Stationen. Gibt ein Tupel (Gesamtdauer, [Liste der Stationen im Pfad])
+        zurück. Falls kein Pfad existiert, wird None zurückgegeben.
+
+        Mit `transfer_penalties` wird beim Wechsel der Linie (Connection.line)
+        eine Umstiegszeit addiert, entweder einheitlich oder je Station als
+        Dictionary (fehlende Stationen: 0 Minuten); siehe _line_dijkstra.
+
+        Wird ein SearchStatistics-Objekt übergeben oder ist `search_observer`
+        gesetzt, werden die Kennzahlen der Suche erfasst; der Beobachter wird
+        danach mit ihnen aufgerufen.
+        """
+        if statistics is None and self.search_observer is not None:
+            statistics = SearchStatistics()
+        if transfer_penalties is not None:
+            result = self._line_dijkstra(start, end, transfer_penalties, statistics)
+            if statistics is not None and self.search_observer is not None:
+                self.search_observer(statistics)
+            return result
+        distances, previous = self._dijkstra(start, (end,), statistics=statistics)
+
+        # Kein erreichbarer Pfad
+        if end not in distances:
+            result = None
+        elif statistics is None:
+            return distances[end], self._reconstruct_path(previous, end)
+        else:
+            begin = time.perf_counter()
+            result = distances[end], self._reconstruct_path(previous, end)
+            statistics.reconstruction_seconds += time.perf_counter() - begin
+
+        if statistics is not None and self.search_observer is not None:
+            self.search_observer(statistics)
+        return result
+
+    def _line_dijkstra(self, start: Station, end: Station, penalties: Union[int, Dict[Station, int]],
+                       statistics: Optional[SearchStatistics] = None) -> Optional[Tuple[int, List[Station]]]:
+        """
+        Dijkstra über Zustände (Station, Linie), ohne den linienexpandierten
+        Graphen aufzubauen: Ein Zustand entsteht erst, wenn die Suche die
+        Station tatsächlich über diese Linie erreicht. Fährt man von einer
+        Station mit einer anderen Linie weiter, als man angekommen ist, kostet
+        das die Umstiegszeit der Station; an der Startstation ist jede Linie frei.
+
+        Ein Zustand wird verworfen, sobald die Station auf anderem Weg
+        mindestens um die Umstiegszeit früher erreicht ist, denn von dort
+        ist jede Weiterfahrt ebenso schnell. Dadurch bleiben auf den meisten
+        Stationen nur ein oder zwei Zustände übrig.
+        """
+        begin = time.perf_counter()
+        graph = self._line_adjacency()
+        if start not in graph or end not in graph:
+            return None
+        def penalty_of(station: Station) -> int:
+            return penalties.get(station, 0) if isinstance(penalties, dict) else penalties
+
+        # Linie, mit der man an der Startstation "angekommen" ist: passt zu keiner Linie,
+        # wird aber nie bestraft
+        boarding = object()
+        State = Tuple[Station, Hashable]
+        distances: Dict[State, int] = {(start, boarding): 0}
+        previous: Dict[State, Optional[State]] = {(start, boarding): None}
+        # Beste bekannte Ankunft je Station über alle Linien
+        best: Dict[Station, int] = {start: 0}
+        tie_breaker = count()
+        queue: List[Tuple[int, int, Station, Hashable]] = [(0, next(tie_breaker), start, boarding)]
+        settled = relaxations = stale_pops = 0
+        pushes = peak_queue = 1
+        searching = time.perf_counter()
+        found: Optional[State] = None
+
+        while queue:
+            current_distance, _, current_station, current_line = heapq.heappop(queue)
+            state = (current_station, current_line)
+            if current_distance > distances[state]:
+                stale_pops += 1
+                continue
+            settled += 1
+            if current_station == end:
+                found = state
+                break
+            penalty = 0 if current_line is boarding else penalty_of(current_station)
+            for neighbor, duration, line in graph[current_station]:
+                relaxations += 1
+                distance = current_distance + duration
+                if line != current_line:
+                    distance += penalty
+                # Dominiert von einer früheren Ankunft an `neighbor` mit Umstieg
+                known = best.get(neighbor)
+                if known is not None and distance >= known + penalty_of(neighbor):
+                    continue
+                successor = (neighbor, line)
+                if distance < distances.get(successor, float('inf')):
+                    distances[successor] = distance
+                    previous[successor] = state
+                    if known is None or distance < known:
+                        best[neighbor] = distance
+                    heapq.heappush(queue, (distance, next(tie_breaker), neighbor, line))
+                    pushes += 1
+            if len(queue) > peak_queue:
+                peak_queue = len(queue)
+
+        reconstructing = time.perf_counter()
+        if statistics is not None:
+            statistics.setup_seconds += searching - begin
+            statistics.search_seconds += reconstructing - searching
+            statistics.settled += settled
+            statistics.relaxations += relaxations
+            statistics.pushes += pushes
+            statistics.stale_pops += stale_pops
+            statistics.peak_queue = max(statistics.peak_queue, peak_queue)
+        if found is None:
+            return None
+        path: List[Station] = []
+        current: Optional[State] = found
+        while current is not None:
+            path.append(current[0])
+            current = previous[current]
+        path.reverse()
+        if statistics is not None:
+            statistics.reconstruction_seconds += time.perf_counter() - reconstructing
+        return distances[found], path
+
+    def shortest_path_tree(self, start: Station
+                           ) -> Tuple[Dict[Station, int], Dict[Station, Optional[Station]]]:
+        """
+        Liefert den vollständigen Kürzeste-Wege-Baum ab `start` als Distanzen
+        und Vorgänger wie _dijkstra. Die zuletzt verwendeten `tree_cache_size`
+        Bäume werden bis zur nächsten Änderung zwischengespeichert und von
+        route_via() wiederverwendet. Die Dictionaries dürfen nicht verändert werden.
+        """
+        tree = self._trees.get(start)
+        if tree is not None:
+            self._trees.move_to_end(start)
+            return tree
+        tree = self._dijkstra(start)
+        self._trees[start] = tree
+        while len(self._trees) > self.tree_cache_size:
+            self._trees.popitem(last=False)
+        return tree
+
+    def route_via(self, start: Station, vias: Sequence[Station], end: Station,
+                  optimize_order: bool = False) -> Optional[Tuple[int, List[Station]]]:
+        """
+        Berechnet die kürzeste Route von `start` über alle Zwischenhalte `vias`
+        nach `end`. Gibt wie shortest_path ein Tupel (Gesamtdauer, [Liste der
+        Stationen im Pfad]) zurück oder None, falls ein Abschnitt nicht
+        erreichbar ist.
+
+        Da die Verbindungen bidirektional sind, kann ein Abschnitt aus einem
+        Baum an einem seiner beiden Enden abgelesen werden. Zwischengespeicherte
+        Bäume (siehe shortest_path_tree) werden bevorzugt; für die übrigen
+        Abschnitte genügt eine one-to-many-Suche ab jedem zweiten Halt, die
+        beide angrenzenden Abschnitte abdeckt.
+
+        Mit `optimize_order` wird die Reihenfolge der Zwischenhalte frei
+        gewählt: Eine one-to-many-Suche je Halt liefert die Distanzmatrix, auf
+        der die kürzeste Reihenfolge bestimmt wird (siehe order_waypoints).
+        """
+        points = [start, *vias, end]
+        # Bereits vorliegende Suchen je Station: (Distanzen, Vorgänger)
+        searches: Dict[Station, Tuple[Dict[Station, int], Dict[Station, Optional[Station]]]] = {}
+        for point in points:
+            if point in self._trees:
+                self._trees.move_to_end(point)
+                searches[point] = self._trees[point]
+
+        if optimize_order:
+            distinct = list(dict.fromkeys(points))
+            for point in distinct:
+                if point not in searches:
+                    searches[point] = self._dijkstra(point, distinct)
+            infinity = float('inf')
+            matrix = [[searches[a][0].get(b, infinity) for b in points] for a in points]
+            points = [points[i] for i in order_waypoints(matrix)]
+            legs = [(a, b, False) for a, b in zip(points, points[1:])]
+        else:
+            # Jeder Abschnitt wird an einem Ende gesucht: bevorzugt an einem
+            # vorhandenen Baum, sonst am Halt mit ungeradem Index
+            legs = []
+            targets: Dict[Station, Set[Station]] = {}
+            for i, (a, b) in enumerate(zip(points, points[1:])):
+                if a in searches:
+                    reverse = False
+                elif b in searches:
+                    reverse = True
+                else:
+                    reverse = i % 2 == 0
+                    targets.setdefault(b if reverse else a, set()).add(a if reverse else b)
+                legs.append((a, b, reverse))
+            for source, ends in targets.items():
+                searches[source] = self._dijkstra(source, ends)
+
+        total = 0
+        path: List[Station] = [start]
+        for a, b, reverse in legs:
+            source, other = (b, a) if reverse else (a, b)
+            distances, previous = searches[source]
+            if other not in distances:
+                return None
+            leg = self._reconstruct_path(previous, other)
+            if reverse:
+                leg.reverse()
+            total += distances[other]
+            path.extend(leg[1:])
+        return total, path
+
+    def nearest_stations(self, latitude: float, longitude: float, k: int = 5,
+                         max_distance: Optional[float] = None) -> List[Tuple[Station, float]]:
+        """
+        Liefert die bis zu `k` nächstgelegenen Stationen zu einer Koordinate als
+        Paare (Station, Luftlinie in Metern). Berücksichtigt werden nur Stationen
+        mit Koordinaten; der räumliche Index wird bis zur nächsten Änderung
+        wiederverwendet.
+        """
+        if self._spatial is None:
+            self._spatial = SpatialIndex(self.stations)
+        return self._spatial.nearest(latitude, longitude, k, max_distance)
+
+    def shortest_path_from_location(self, latitude: float, longitude: float, end: Station,
+                                    k: int = 5, walking_speed: float = 4.5,
+                                    max_walking_distance: Optional[float] = None
+                                    ) -> Optional[Tuple[float, List[Station]]]:
+        """
+        Berechnet die kürzeste Reisedauer von einer beliebigen Koordinate zu
+        einer Station. Die `k` nächstgelegenen Stationen werden mit ihrer
+        Fußwegdauer (Luftlinie bei `walking_speed` km/h) als Startpunkte einer
+        gemeinsamen Dijkstra-Suche verwendet.
+
+        Gibt ein Tupel (Gesamtdauer inklusive Fußweg, [Liste der Stationen im
+        Pfad]) zurück oder None, falls keine Station in Reichweite ist oder
+        kein Pfad existiert.
+        """
+        meters_per_minute = walking_speed * 1000 / 60
+        origins = {station: meters / meters_per_minute
+                   for station, meters in self.nearest_stations(latitude, longitude, k, max_walking_distance)}
+        if not origins:
+            return None
+        distances, previous = self._multi_source_dijkstra(origins, (end,))
+        if end not in distances:
+            return None
+        return distances[end], self._reconstruct_path(previous, end)
+
+    def shortest_paths(self, start: Station, ends: Iterable[Station]
+                       ) -> Dict[Station, Optional[Tuple[int, List[Station]]]]:
+        """
+        Berechnet die kürzesten Pfade von einer Startstation zu mehreren
+        Zielstationen mit einer einzigen Dijkstra-Suche (one-to-many), die endet,
+        sobald alle Ziele erreicht sind.
+
+        Gibt ein Dictionary {Zielstation: (Gesamtdauer, [Pfad]) oder None} zurück.
+        """
+        ends = list(ends)
+        if not ends:
+            return {}
+        distances, previous = self._dijkstra(start, ends)
+        return {end: (distances[end], self._reconstruct_path(previous, end)) if end in distances else None
+                for end in ends}
+
+    def reachable_within(self, start: Station, max_minutes: float) -> Dict[Station, int]:
+        """
+        Ermittelt alle Stationen, die von `start` aus innerhalb von `max_minutes`
+        erreichbar sind (Isochrone). Die Dijkstra-Suche bricht an der Zeitgrenze
+        ab, statt das gesamte Netz zu durchsuchen.
+
+        Gibt ein Dictionary {Station: Reisedauer} zurück, das auch die
+        Startstation selbst mit der Dauer 0 enthält.
+        """
+        if max_minutes < 0:
+            return {}
+        distances, _ = self._dijkstra(start, max_minutes=max_minutes)
+        return distances
+
+    def reachable_within_many(self, starts: Iterable[Station],
+                              max_minutes: float) -> Dict[Station, Dict[Station, int]]:
+        """
+        Berechnet die Isochronen für mehrere Startstationen auf einmal.
+        Der Graph wird dabei nur einmal aufgebaut und für alle Suchen
+        gemeinsam genutzt; doppelte Startstationen werden nur einmal berechnet.
+
+        Gibt ein Dictionary {Startstation: {Station: Reisedauer}} zurück.
+        """
+        result: Dict[Station, Dict[Station, int]] = {}
+        for start in starts:
+            if start not in result:
+                result[start] = self.reachable_within(start, max_minutes)
+        return result
+
+    def k_shortest_paths(self, start: Station, end: Station, k: int) -> List[Tuple[int, List[Station]]]:
+        """
+        Berechnet bis zu `k` kürzeste schleifenfreie Pfade von `start` nach `end`
+        mit dem Algorithmus von Yen. Gibt eine nach Gesamtdauer sortierte Liste
+        von Tupeln (Gesamtdauer, [Liste der Stationen im Pfad]) zurück.
+
+        Ein einmal berechneter Kürzeste-Wege-Baum zum Ziel dient gleichzeitig
+        als erster Pfad, als untere Schranke für die Abzweig-Suchen (A*) und als
+        Abkürzung: Ist der Baumpfad ab dem Abzweig nicht blockiert, wird er ohne
+        weitere Suche übernommen.
+        """
+        if k <= 0 or start not in self.stations or end not in self.stations:
+            return []
+
+        # Baum der kürzesten Wege zum Ziel; previous zeigt hier in Richtung Ziel
+        to_end, towards_end = self._dijkstra(end)
+        if start not in to_end:
+            return []
+
+        first_path = self._reconstruct_path(towards_end, start)
+        first_path.reverse()
+        found: List[Tuple[int, List[Station]]] = [(to_end[start], first_path)]
+        seen: Set[Tuple[Station, ...]] = {tuple(first_path)}
+        candidates: List[Tuple[int, int, List[Station]]] = []
+        tie_breaker = count()
+
+        while len(found) < k:
+            _, previous_path = found[-1]
+            prefix_costs = self._prefix_costs(previous_path)
+
+            for i in range(len(previous_path) - 1):
+                spur = previous_path[i]
+                root = previous_path[:i + 1]
+                root_cost = prefix_costs[i]
+
+                # Kandidaten, die schlechter sind als alle noch benötigten, verwerfen
+                missing = k - len(found)
+                bound: Optional[int] = None
+                if len(candidates) >= missing:
+                    bound = heapq.nsmallest(missing, candidates)[-1][0]
+                    if root_cost + to_end[spur] >= bound:
+                        continue
+
+                blocked_nodes = set(root[:-1])
+                blocked_next = {path[i + 1] for _, path in found
+                                if len(path) > i + 1 and path[:i + 1] == root}
+
+                spur_result = self._spur_path(spur, end, to_end, towards_end, blocked_nodes,
+                                              blocked_next, root_cost, bound)
+                if spur_result is None:
+                    continue
+                spur_cost, spur_path = spur_result
+                path = root[:-1] + spur_path
+                key = tuple(path)
+                if key not in seen:
+                    seen.add(key)
+                    heapq.heappush(candidates, (root_cost + spur_cost, next(tie_breaker), path))
+
+            if not candidates:
+                break
+            cost, _, path = heapq.heappop(candidates)
+            found.append((cost, path))
+
+        return found
+
+    def _prefix_costs(self, path: List[Station]) -> List[int]:
+        """Liefert die aufsummierten Reisedauern entlang eines Pfads."""
+        graph = self._adjacency()
+        costs = [0]
+        for current, following in zip(path, path[1:]):
+            costs.append(costs[-1] + min(d for neighbor, d in graph[current] if neighbor == following))
+        return costs
+
+    def _spur_path(self, spur: Station, end: Station, to_end: Dict[Station, int],
+                   towards_end: Dict[Station, Optional[Station]], blocked_nodes: Set[Station],
+                   blocked_next: Set[Station], root_cost: int,
+                   bound: Optional[int]) -> Optional[Tuple[int, List[Station]]]:
+        """
+        Sucht den kürzesten Pfad von `spur` nach `end`, der die Stationen in
+        `blocked_nodes` meidet und `spur` nicht in Richtung `blocked_next`
+        verlässt. Die Distanzen zum Ziel aus dem Wurzelbaum dienen als
+        zulässige Heuristik für A*.
+        """
+        # Abkürzung: Der Baumpfad zum Ziel ist optimal, sofern er nicht blockiert ist
+        tree_path = self._reconstruct_path(towards_end, spur)
+        tree_path.reverse()
+        if (len(tree_path) < 2 or tree_path[1] not in blocked_next) and blocked_nodes.isdisjoint(tree_path):
+            return to_end[spur], tree_path
+
+        graph = self._adjacency()
+        distances: Dict[Station, int] = {spur: 0}
+        previous: Dict[Station, Optional[Station]] = {spur: None}
+        tie_breaker = count()
+        queue: List[Tuple[int, int, int, Station]] = [(to_end[spur], 0, next(tie_breaker), spur)]
+        infinity = float('inf')
+
+        while queue:
+            _, current_distance, _, current_station = heapq.heappop(queue)
+            if current_station == end:
+                return current_distance, self._reconstruct_path(previous, end)
+            if current_distance > distances[current_station]:
+                continue
+
+            for neighbor, duration in graph[current_station]:
+                if neighbor in blocked_nodes or neighbor not in to_end:
+                    continue
+                if current_station == spur and neighbor in blocked_next:
+                    continue
+                distance = current_distance + duration
+                estimate = distance + to_end[neighbor]
+                if bound is not None and root_cost + estimate >= bound:
+                    continue
+                if distance < distances.get(neighbor, infinity):
+                    distances[neighbor] = distance
+                    previous[neighbor] = current_station
+                    heapq.heappush(queue, (estimate, distance, next(tie_breaker), neighbor))
+
+        return None
+
+    def pareto_paths(self, start: Station, end: Station) -> List[Tuple[int, int, List[Station]]]:
+        """
+        Berechnet alle Pareto-optimalen Routen von `start` nach `end` bezüglich
+        Gesamtdauer und Anzahl genutzter Verbindungen. Eine Route ist optimal,
+        wenn keine andere Route höchstens genauso lange dauert und höchstens
+        genauso viele Verbindungen nutzt.
+
+        Gibt eine nach Dauer aufsteigend sortierte Liste von Tupeln
+        (Gesamtdauer, Anzahl Verbindungen, [Liste der Stationen im Pfad]) zurück.
+        """
+        if start not in self.stations or end not in self.stations:
+            return []
+
+        graph = self._adjacency()
+        # Untere Schranken zum Ziel: Reisedauer (Dijkstra) und Anzahl Verbindungen (Breitensuche)
+        to_end, _ = self._dijkstra(end)
+        if start not in to_end:
+            return []
+        hops_to_end: Dict[Station, int] = {end: 0}
+        frontier = [end]
+        while frontier:
+            next_frontier = []
+            for station in frontier:
+                for neighbor, _ in graph[station]:
+                    if neighbor not in hops_to_end:
+                        hops_to_end[neighbor] = hops_to_end[station] + 1
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+
+        # Labels werden kompakt in parallelen Listen abgelegt: Station und Vorgänger-Label
+        label_station: List[Station] = [start]
+        label_previous: List[int] = [-1]
+        # Labels einer Station werden nach steigender Dauer entnommen (A* mit fester
+        # Schranke je Station). Daher genügt pro Station die kleinste bisher gesetzte
+        # Anzahl Verbindungen als Pareto-Menge: Jedes spätere Label mit mindestens
+        # so vielen Verbindungen ist dominiert.
+        fewest_hops: Dict[Station, int] = {}
+        queue: List[Tuple[int, int, int, int]] = [(to_end[start], 0, 0, 0)]
+        result: List[Tuple[int, int, List[Station]]] = []
+        infinity = float('inf')
+
+        while queue:
+            _, distance, hops, label = heapq.heappop(queue)
+            station = label_station[label]
+            if hops >= fewest_hops.get(station, infinity):
+                continue
+            # Zielpruning: Selbst im besten Fall wäre die Route am Ziel dominiert
+            if hops + hops_to_end[station] >= fewest_hops.get(end, infinity):
+                continue
+            fewest_hops[station] = hops
+
+            if station == end:
+                path: List[Station] = []
+                while label != -1:
+                    path.append(label_station[label])
+                    label = label_previous[label]
+                path.reverse()
+                result.append((distance, hops, path))
+                continue
+
+            next_hops = hops + 1
+            target_hops = fewest_hops.get(end, infinity)
+            for neighbor, duration in graph[station]:
+                if next_hops >= fewest_hops.get(neighbor, infinity):
+                    continue
+                if next_hops + hops_to_end[neighbor] >= target_hops:
+                    continue
+                label_station.append(neighbor)
+                label_previous.append(label)
+                next_distance = distance + duration
+                heapq.heappush(queue, (next_distance + to_end[neighbor], next_distance,
+                                       next_hops, len(label_station) - 1))
 
-        return distances[end], path
+        return result
@@ -0,0 +1,375 @@
+from array import array
+from collections import deque
+from itertools import count
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+import heapq
+
+from traffic_network.station import Station
+from traffic_network.connection import Connection
+
+Duration = Union[int, float]
+
+class CellOverlay:
+    """
+    Metrikunabhängiger Teil des Customizable Route Planning: eine
+    mehrstufige, verschachtelte Zerlegung des Netzes in Zellen. Sie hängt nur
+    von der Topologie ab und wird einmal berechnet; Reisedauern kommen erst
+    mit customize() hinzu, das für jede Metrik (Werktag, Wochenende,
+    aktuelle Verspätungen) ein eigenes OverlayMetric liefert.
+
+    Ebene 0 ist der ursprüngliche Graph, Ebene l > 0 besteht aus Zellen mit
+    höchstens cell_sizes[l - 1] Stationen. Jede Zelle einer Ebene liegt
+    vollständig in einer Zelle der nächsthöheren Ebene.
+    """
+
+    def __init__(self, stations: Sequence[Station], connections: Sequence[Connection],
+                 cell_sizes: Sequence[int] = (64, 512, 4096)) -> None:
+        self.stations: List[Station] = list(stations)
+        self.index: Dict[Station, int] = {station: i for i, station in enumerate(self.stations)}
+        self.connections: List[Connection] = list(connections)
+        n = len(self.stations)
+
+        # Ungerichteter Graph im CSR-Format; je Kante der Index der Verbindung
+        edges: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+        for i, connection in enumerate(self.connections):
+            a, b = self.index[connection.station1], self.index[connection.station2]
+            edges[a].append((b, i))
+            edges[b].append((a, i))
+        self.offsets = array('q', [0])
+        self.targets = array('q')
+        self.edge_connections = array('q')
+        for station_edges in edges:
+            for neighbor, connection_index in station_edges:
+                self.targets.append(neighbor)
+                self.edge_connections.append(connection_index)
+            self.offsets.append(len(self.targets))
+
+        # Nur Ebenen, die das Netz tatsächlich in mehrere Zellen zerlegen
+        sizes = sorted(size for size in set(cell_sizes) if 0 < size < n)
+        self.levels = len(sizes)
+        # cells[l][v]: Zelle der Station v auf Ebene l (Ebene 0 bleibt leer)
+        self.cells: List[array] = [array('q')]
+        # boundary[l][c]: Randstationen der Zelle c auf Ebene l
+        self.boundary: List[List[List[int]]] = [[]]
+        # position[l][v]: Position der Randstation v im Rand ihrer Zelle auf Ebene l
+        self.position: List[Dict[int, int]] = [{}]
+
+        parts: List[List[int]] = [list(range(n))]
+        per_level: List[List[List[int]]] = []
+        for size in reversed(sizes):
+            parts = [part for parent in parts for part in self._split(parent, size)]
+            per_level.append(parts)
+        per_level.reverse()
+
+        for level, level_parts in enumerate(per_level, start=1):
+            cell_of = array('q', [0]) * n
+            for cell, part in enumerate(level_parts):
+                for station in part:
+                    cell_of[station] = cell
+            boundary: List[List[int]] = [[] for _ in level_parts]
+            position: Dict[int, int] = {}
+            for station in range(n):
+                cell = cell_of[station]
+                for edge in range(self.offsets[station], self.offsets[station + 1]):
+                    if cell_of[self.targets[edge]] != cell:
+                        position[station] = len(boundary[cell])
+                        boundary[cell].append(station)
+                        break
+            self.cells.append(cell_of)
+            self.boundary.append(boundary)
+            self.position.append(position)
+
+        # cell_graphs[l][c]: Suchgraph der Zelle c auf Ebene l für die Customization
+        self.cell_graphs: List[List["CellGraph"]] = [[]]
+        for level, level_parts in enumerate(per_level, start=1):
+            self.cell_graphs.append([self._cell_graph(level, cell, part)
+                                     for cell, part in enumerate(level_parts)])
+
+    def _cell_graph(self, level: int, cell: int, members: List[int]) -> "CellGraph":
+        """
+        Baut den metrikunabhängigen Suchgraphen einer Zelle: auf Ebene 1 alle
+        Stationen und Verbindungen der Zelle, darüber die Randstationen der
+        Unterzellen mit deren Cliquen und den Verbindungen zwischen ihnen.
+        Die Randstationen der Zelle selbst stehen am Anfang.
+        """
+        cell_of = self.cells[level]
+        boundary = self.boundary[level][cell]
+        if level > 1:
+            below = self.position[level - 1]
+            members = [station for station in members if station in below]
+        on_boundary = set(boundary)
+        vertices = boundary + [station for station in members if station not in on_boundary]
+        local = {station: i for i, station in enumerate(vertices)}
+
+        graph = CellGraph(vertices, len(boundary))
+        for station in vertices:
+            if level > 1:
+                # Cliquenkanten der Unterzelle eine Ebene tiefer
+                sub_cell = self.cells[level - 1][station]
+                sub_boundary = self.boundary[level - 1][sub_cell]
+                row = self.position[level - 1][station] * len(sub_boundary)
+                for column, neighbor in enumerate(sub_boundary):
+                    if neighbor != station:
+                        graph.add_edge(local[neighbor], sub_cell, row + column)
+            for edge in range(self.offsets[station], self.offsets[station + 1]):
+                neighbor = self.targets[edge]
+                if cell_of[neighbor] != cell:
+                    continue
+                if level > 1 and self.cells[level - 1][neighbor] == self.cells[level - 1][station]:
+                    continue  # bereits durch die Clique der Unterzelle abgedeckt
+                graph.add_edge(local[neighbor], -1, self.edge_connections[edge])
+            graph.offsets.append(len(graph.targets))
+        return graph
+
+    def _split(self, part: List[int], size: int) -> List[List[int]]:
+        """
+        Zerlegt eine Stationsmenge durch wiederholte Halbierung in Teile mit
+        höchstens `size` Stationen. Halbiert wird entlang einer Breitensuche ab
+        einer möglichst peripheren Station, damit die Hälften zusammenhängend
+        bleiben und wenige Kanten schneiden.
+        """
+        result: List[List[int]] = []
+        pending = [part]
+        while pending:
+            current = pending.pop()
+            if len(current) <= size:
+                result.append(current)
+                continue
+            members = set(current)
+            peripheral = self._breadth_first(current[0], members)[-1]
+            order = self._breadth_first(peripheral, members)
+            half = len(order) // 2
+            pending.append(order[half:])
+            pending.append(order[:half])
+        return result
+
+    def _breadth_first(self, start: int, members: Set[int]) -> List[int]:
+        """Breitensuche innerhalb von `members`; nicht verbundene Teile werden angehängt."""
+        order: List[int] = []
+        visited = {start}
+        for root in [start] + [station for station in members if station != start]:
+            if root in visited and root != start:
+                continue
+            visited.add(root)
+            queue = deque([root])
+            while queue:
+                station = queue.popleft()
+                order.append(station)
+                for edge in range(self.offsets[station], self.offsets[station + 1]):
+                    neighbor = self.targets[edge]
+                    if neighbor in members and neighbor not in visited:
+                        visited.add(neighbor)
+                        queue.append(neighbor)
+        return order
+
+    def customize(self, durations: Optional[Dict[Connection, Duration]] = None) -> "OverlayMetric":
+        """
+        Berechnet für eine Metrik die Cliquen aller Zellen von unten nach oben.
+        `durations` enthält abweichende Dauern einzelner Verbindungen; alle
+        anderen Verbindungen behalten ihre eigene Dauer.
+        """
+        return OverlayMetric(self, durations or {})
+
+
+class CellGraph:
+    """
+    Metrikunabhängiger Suchgraph einer Zelle im CSR-Format mit lokalen
+    Stationsindizes. Die Dauer einer Kante wird erst bei der Customization
+    bestimmt: aus einer Verbindung (sub_cells == -1, `entries` ist der Index
+    der Verbindung) oder aus der Clique einer Unterzelle (`entries` ist die
+    Position in deren Distanzmatrix).
+    """
+
+    def __init__(self, vertices: List[int], boundary_size: int) -> None:
+        self.vertices = vertices
+        self.boundary_size = boundary_size
+        self.offsets = array('q', [0])
+        self.targets = array('q')
+        self.sub_cells = array('q')
+        self.entries = array('q')
+
+    def add_edge(self, target: int, sub_cell: int, entry: int) -> None:
+        self.targets.append(target)
+        self.sub_cells.append(sub_cell)
+        self.entries.append(entry)
+
+
+class OverlayMetric:
+    """
+    Eine Metrik auf einem CellOverlay. Für jede Zelle jeder Ebene enthält sie
+    die Clique der kürzesten Reisedauern zwischen den Randstationen der Zelle,
+    gemessen innerhalb der Zelle.
+    """
+
+    def __init__(self, overlay: CellOverlay, durations: Dict[Connection, Duration]) -> None:
+        self.overlay = overlay
+        self.weights: List[Duration] = [durations.get(connection, connection.duration)
+                                        for connection in overlay.connections]
+        # cliques[l][c]: Zeilenweise gespeicherte Distanzmatrix der Randstationen
+        self.cliques: List[List[List[Duration]]] = [[]]
+        for level in range(1, overlay.levels + 1):
+            self.cliques.append([self._clique(graph, self.cliques[level - 1])
+                                 for graph in overlay.cell_graphs[level]])
+
+    def _clique(self, graph: CellGraph, below: List[List[Duration]]) -> List[Duration]:
+        """
+        Distanzen zwischen allen Randstationen einer Zelle: je Randstation eine
+        Dijkstra-Suche auf dem Suchgraphen der Zelle, die endet, sobald alle
+        Randstationen erreicht sind.
+        """
+        weights, connection_weights = [], self.weights
+        for sub_cell, entry in zip(graph.sub_cells, graph.entries):
+            weights.append(connection_weights[entry] if sub_cell == -1 else below[sub_cell][entry])
+        offsets, targets = graph.offsets, graph.targets
+        size = graph.boundary_size
+        infinity = float('inf')
+        matrix: List[Duration] = []
+        for source in range(size):
+            distances: List[Duration] = [infinity] * len(graph.vertices)
+            distances[source] = 0
+            remaining = size
+            queue = [(0, source)]
+            while queue:
+                distance, station = heapq.heappop(queue)
+                if distance > distances[station]:
+                    continue
+                if station < size:
+                    remaining -= 1
+                    if not remaining:
+                        break
+                for edge in range(offsets[station], offsets[station + 1]):
+                    new_distance = distance + weights[edge]
+                    neighbor = targets[edge]
+                    if new_distance < distances[neighbor]:
+                        distances[neighbor] = new_distance
+                        heapq.heappush(queue, (new_distance, neighbor))
+            matrix.extend(distances[:size])
+        return matrix
+
+    def _neighbors(self, station: int, level: int) -> Iterator[Tuple[int, Duration, int]]:
+        """
+        Kanten einer Station im Overlay der Ebene `level` als Tripel
+        (Nachbar, Dauer, Ebene der Kante). Auf Ebene 0 sind das alle
+        Verbindungen, darüber die Clique der eigenen Zelle und die
+        Verbindungen, die die Zelle verlassen.
+        """
+        overlay = self.overlay
+        if level == 0:
+            for edge in range(overlay.offsets[station], overlay.offsets[station + 1]):
+                yield overlay.targets[edge], self.weights[overlay.edge_connections[edge]], 0
+            return
+        cell_of = overlay.cells[level]
+        cell = cell_of[station]
+        boundary = overlay.boundary[level][cell]
+        row = overlay.position[level][station] * len(boundary)
+        clique = self.cliques[level][cell]
+        for column, neighbor in enumerate(boundary):
+            if neighbor != station:
+                yield neighbor, clique[row + column], level
+        for edge in range(overlay.offsets[station], overlay.offsets[station + 1]):
+            neighbor = overlay.targets[edge]
+            if cell_of[neighbor] != cell:
+                yield neighbor, self.weights[overlay.edge_connections[edge]], 0
+
+    def _query_level(self, station: int, start: int, end: int) -> int:
+        """Höchste Ebene, auf der die Station weder in der Zelle des Starts noch des Ziels liegt."""
+        cells = self.overlay.cells
+        for level in range(self.overlay.levels, 0, -1):
+            cell = cells[level][station]
+            if cell != cells[level][start] and cell != cells[level][end]:
+                return level
+        return 0
+
+    def shortest_path(self, start: Station, end: Station) -> Optional[Tuple[Duration, List[Station]]]:
+        """
+        Berechnet die kürzeste Reisedauer zwischen zwei Stationen mit einer
+        bidirektionalen Suche über das Overlay: nahe Start und Ziel auf dem
+        ursprünglichen Graphen, weiter entfernt über die Cliquen möglichst
+        hoher Ebenen. Gibt wie Network.shortest_path ein Tupel
+        (Gesamtdauer, [Liste der Stationen im Pfad]) oder None zurück.
+        """
+        overlay = self.overlay
+        if start not in overlay.index or end not in overlay.index:
+            return None
+        s, t = overlay.index[start], overlay.index[end]
+        if s == t:
+            return 0, [start]
+
+        infinity = float('inf')
+        # Je Richtung: Distanzen, Vorgänger (Station, Ebene der Kante), Warteschlange
+        distances: Tuple[Dict[int, Duration], Dict[int, Duration]] = ({s: 0}, {t: 0})
+        previous: Tuple[Dict[int, Tuple[int, int]], Dict[int, Tuple[int, int]]] = ({}, {})
+        tie_breaker = count()
+        queues = ([(0, next(tie_breaker), s)], [(0, next(tie_breaker), t)])
+        best: Duration = infinity
+        meeting = -1
+
+        while queues[0] and queues[1]:
+            if queues[0][0][0] + queues[1][0][0] >= best:
+                break
+            # Es wird immer die Richtung mit der kleineren Warteschlange fortgesetzt
+            side = 0 if len(queues[0]) <= len(queues[1]) else 1
+            distance, _, station = heapq.heappop(queues[side])
+            own, other = distances[side], distances[1 - side]
+            if distance > own[station]:
+                continue
+            level = self._query_level(station, s, t)
+            for neighbor, duration, edge_level in self._neighbors(station, level):
+                new_distance = distance + duration
+                if new_distance < own.get(neighbor, infinity):
+                    own[neighbor] = new_distance
+                    previous[side][neighbor] = (station, edge_level)
+                    heapq.heappush(queues[side], (new_distance, next(tie_breaker), neighbor))
+                    if neighbor in other and new_distance + other[neighbor] < best:
+                        best = new_distance + other[neighbor]
+                        meeting = neighbor
+
+        if meeting == -1:
+            return None
+        forward = self._unpack(previous[0], meeting)
+        backward = self._unpack(previous[1], meeting)
+        path = forward + backward[::-1][1:]
+        return best, [overlay.stations[station] for station in path]
+
+    def _unpack(self, previous: Dict[int, Tuple[int, int]], station: int) -> List[int]:
+        """Folgt den Vorgängern bis zum Suchbeginn und packt Cliquenkanten aus."""
+        path = [station]
+        while station in previous:
+            before, level = previous[station]
+            if level == 0:
+                path.append(before)
+            else:
+                path.extend(self._unpack_shortcut(before, station, level)[::-1][1:])
+            station = before
+        path.reverse()
+        return path
+
+    def _unpack_shortcut(self, source: int, target: int, level: int) -> List[int]:
+        """
+        Ersetzt eine Cliquenkante durch die Stationsfolge im ursprünglichen
+        Graphen, mit einer Dijkstra-Suche innerhalb der Zelle.
+        """
+        overlay = self.overlay
+        cell_of = overlay.cells[level]
+        cell = cell_of[source]
+        distances: Dict[int, Duration] = {source: 0}
+        parent: Dict[int, int] = {}
+        queue = [(0, source)]
+        while queue:
+            distance, station = heapq.heappop(queue)
+            if station == target:
+                break
+            if distance > distances[station]:
+                continue
+            for edge in range(overlay.offsets[station], overlay.offsets[station + 1]):
+                neighbor = overlay.targets[edge]
+                new_distance = distance + self.weights[overlay.edge_connections[edge]]
+                if cell_of[neighbor] == cell and new_distance < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = new_distance
+                    parent[neighbor] = station
+                    heapq.heappush(queue, (new_distance, neighbor))
+        path = [target]
+        while path[-1] != source:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return path
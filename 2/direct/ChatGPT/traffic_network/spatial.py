@@ -0,0 +1,112 @@
+from array import array
+from typing import Iterable, List, Optional, Tuple
+import heapq
+import math
+
+from traffic_network.station import Station
+
+# Mittlerer Erdradius in Metern
+EARTH_RADIUS = 6371000.0
+
+def _unit_vector(latitude: float, longitude: float) -> Tuple[float, float, float]:
+    """Punkt auf der Einheitskugel zu geografischen Koordinaten in Grad."""
+    lat, lon = math.radians(latitude), math.radians(longitude)
+    return math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)
+
+
+def _chord_to_meters(chord: float) -> float:
+    """Wandelt die Sehnenlänge auf der Einheitskugel in eine Großkreisdistanz um."""
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, chord / 2))
+
+
+def _meters_to_chord(meters: float) -> float:
+    """Sehnenlänge auf der Einheitskugel zu einer Großkreisdistanz in Metern."""
+    return 2 * math.sin(min(math.pi, meters / EARTH_RADIUS) / 2)
+
+
+class SpatialIndex:
+    """
+    KD-Baum über die Stationen mit Koordinaten. Die Stationen werden als
+    Punkte auf der Einheitskugel gespeichert; die euklidische Distanz dieser
+    Punkte wächst monoton mit der Großkreisdistanz, sodass die Suche ohne
+    Projektion und auch über Datumsgrenze und Pole hinweg exakt ist.
+
+    Der Baum ist implizit: Die Punkte liegen so sortiert in flachen Arrays,
+    dass jeder Bereich [lo, hi) in der Mitte seinen Teilungspunkt hat.
+    """
+
+    def __init__(self, stations: Iterable[Station]) -> None:
+        located = [station for station in stations if station.has_coordinates]
+        points = [_unit_vector(station.latitude, station.longitude) for station in located]
+        order = list(range(len(located)))
+        # Teilungsachse je Knoten, indiziert nach der Position des Teilungspunkts
+        self.axes = array('b', bytes(len(located)))
+        self._build(order, points, 0, len(order))
+        self.stations: List[Station] = [located[i] for i in order]
+        self.xs = array('d', (points[i][0] for i in order))
+        self.ys = array('d', (points[i][1] for i in order))
+        self.zs = array('d', (points[i][2] for i in order))
+
+    def _build(self, order: List[int], points: List[Tuple[float, float, float]], lo: int, hi: int) -> None:
+        """Sortiert order[lo:hi] rekursiv in die Reihenfolge des KD-Baums."""
+        stack = [(lo, hi)]
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo <= 1:
+                continue
+            # Geteilt wird entlang der Achse mit der größten Ausdehnung
+            spreads = [max(points[i][axis] for i in order[lo:hi]) - min(points[i][axis] for i in order[lo:hi])
+                       for axis in range(3)]
+            axis = spreads.index(max(spreads))
+            order[lo:hi] = sorted(order[lo:hi], key=lambda i: points[i][axis])
+            mid = (lo + hi) // 2
+            self.axes[mid] = axis
+            stack.append((lo, mid))
+            stack.append((mid + 1, hi))
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1,
+                max_distance: Optional[float] = None) -> List[Tuple[Station, float]]:
+        """
+        Liefert die bis zu `k` nächstgelegenen Stationen als Paare
+        (Station, Distanz in Metern), aufsteigend nach Distanz. Mit
+        `max_distance` (in Metern) werden nur Stationen in diesem Umkreis
+        berücksichtigt.
+        """
+        if k <= 0 or not self.stations:
+            return []
+        qx, qy, qz = _unit_vector(latitude, longitude)
+        query = (qx, qy, qz)
+        xs, ys, zs, axes = self.xs, self.ys, self.zs, self.axes
+        limit = _meters_to_chord(max_distance) ** 2 if max_distance is not None else math.inf
+        # Max-Heap der besten Kandidaten als (-quadratische Distanz, Position)
+        best: List[Tuple[float, int]] = []
+
+        def worst() -> float:
+            return -best[0][0] if len(best) == k else limit
+
+        def visit(lo: int, hi: int) -> None:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                dx, dy, dz = xs[mid] - qx, ys[mid] - qy, zs[mid] - qz
+                squared = dx * dx + dy * dy + dz * dz
+                if squared <= worst():
+                    if len(best) == k:
+                        heapq.heapreplace(best, (-squared, mid))
+                    else:
+                        heapq.heappush(best, (-squared, mid))
+                if hi - lo == 1:
+                    return
+                axis = axes[mid]
+                difference = query[axis] - (xs, ys, zs)[axis][mid]
+                near, far = ((lo, mid), (mid + 1, hi)) if difference < 0 else ((mid + 1, hi), (lo, mid))
+                visit(*near)
+                if difference * difference > worst():
+                    return
+                lo, hi = far
+
+        visit(0, len(self.stations))
+        result = sorted((-negative, position) for negative, position in best)
+        return [(self.stations[position], _chord_to_meters(math.sqrt(squared))) for squared, position in result]
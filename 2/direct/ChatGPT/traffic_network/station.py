@@ -1,8 +1,20 @@
+from typing import Optional
+
 class Station:
-    """Repräsentiert eine Station im Verkehrsnetz."""
+    """
+    Repräsentiert eine Station im Verkehrsnetz. Die Koordinaten (WGS84, in
+    Grad) sind optional und werden für die Suche nach nahen Stationen benötigt.
+    """
     
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, latitude: Optional[float] = None,
+                 longitude: Optional[float] = None) -> None:
         self.name = name
+        self.latitude = latitude
+        self.longitude = longitude
+
+    @property
+    def has_coordinates(self) -> bool:
+        return self.latitude is not None and self.longitude is not None
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, Station):
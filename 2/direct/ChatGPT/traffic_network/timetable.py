@@ -0,0 +1,175 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+
+from traffic_network.station import Station
+
+class TimetableConnection:
+    """
+    Elementare Fahrplanverbindung: eine Fahrt ohne Zwischenhalt von einer
+    Station zur nächsten mit Abfahrts- und Ankunftszeit in Minuten.
+    """
+
+    def __init__(self, departure_station: Station, arrival_station: Station,
+                 departure: int, arrival: int) -> None:
+        if arrival < departure:
+            raise ValueError("Ankunft darf nicht vor der Abfahrt liegen")
+        self.departure_station = departure_station
+        self.arrival_station = arrival_station
+        self.departure = departure
+        self.arrival = arrival
+
+    def __repr__(self) -> str:
+        return (f"TimetableConnection({self.departure_station!r}, {self.arrival_station!r}, "
+                f"{self.departure}, {self.arrival})")
+
+
+class Timetable:
+    """
+    Fahrplanmodus des Verkehrsnetzes. Die elementaren Verbindungen werden in
+    flachen, nach Abfahrtszeit sortierten Arrays gehalten und mit dem
+    Connection Scan Algorithm (CSA) durchsucht.
+    """
+
+    def __init__(self) -> None:
+        self.connections: List[TimetableConnection] = []
+        self._station_index: Dict[Station, int] = {}
+        self._stations: List[Station] = []
+        # Sortierte Arrays; werden nach Änderungen beim nächsten Zugriff neu aufgebaut
+        self._sorted: Optional[List[TimetableConnection]] = None
+        self._departures = array('l')
+        self._arrivals = array('l')
+        self._from = array('l')
+        self._to = array('l')
+
+    def add_connection(self, connection: TimetableConnection) -> None:
+        """Fügt eine elementare Verbindung zum Fahrplan hinzu."""
+        for station in (connection.departure_station, connection.arrival_station):
+            if station not in self._station_index:
+                self._station_index[station] = len(self._stations)
+                self._stations.append(station)
+        self.connections.append(connection)
+        self._sorted = None
+
+    def _build(self) -> None:
+        """Sortiert die Verbindungen nach Abfahrt und füllt die flachen Arrays."""
+        if self._sorted is not None:
+            return
+        ordered = sorted(self.connections, key=lambda c: (c.departure, c.arrival))
+        index = self._station_index
+        self._departures = array('l', (c.departure for c in ordered))
+        self._arrivals = array('l', (c.arrival for c in ordered))
+        self._from = array('l', (index[c.departure_station] for c in ordered))
+        self._to = array('l', (index[c.arrival_station] for c in ordered))
+        self._sorted = ordered
+
+    def earliest_arrival(self, start: Station, end: Station, departure_time: int
+                         ) -> Optional[Tuple[int, List[TimetableConnection]]]:
+        """
+        Berechnet die früheste Ankunft in `end` bei Abfahrt in `start` frühestens
+        zum Zeitpunkt `departure_time`. Gibt ein Tupel (Ankunftszeit,
+        [genutzte Verbindungen]) zurück oder None, falls `end` nicht erreichbar ist.
+        """
+        if start not in self._station_index or end not in self._station_index:
+            return None
+        if start == end:
+            return departure_time, []
+        self._build()
+
+        source = self._station_index[start]
+        target = self._station_index[end]
+        departures, arrivals = self._departures, self._arrivals
+        from_station, to_station = self._from, self._to
+
+        infinity = float('inf')
+        arrival_at = [infinity] * len(self._stations)
+        incoming = [-1] * len(self._stations)
+        arrival_at[source] = departure_time
+
+        # Verbindungen vor der Abfahrtszeit können übersprungen werden
+        for i in range(bisect_left(departures, departure_time), len(departures)):
+            departure = departures[i]
+            if departure >= arrival_at[target]:
+                break
+            if arrival_at[from_station[i]] <= departure and arrivals[i] < arrival_at[to_station[i]]:
+                arrival_at[to_station[i]] = arrivals[i]
+                incoming[to_station[i]] = i
+
+        if incoming[target] == -1:
+            return None
+
+        # Rekonstruktion der Reise über die zuletzt verbessernden Verbindungen
+        journey: List[TimetableConnection] = []
+        station = target
+        while station != source:
+            i = incoming[station]
+            journey.append(self._sorted[i])
+            station = from_station[i]
+        journey.reverse()
+        return arrivals[incoming[target]], journey
+
+    def profile(self, start: Station, end: Station, earliest_departure: int,
+                latest_departure: int) -> List[Tuple[int, int]]:
+        """
+        Profilanfrage: Berechnet alle Pareto-optimalen Abfahrten von `start` nach
+        `end` im Zeitraum [earliest_departure, latest_departure]. Eine Abfahrt ist
+        optimal, wenn keine spätere Abfahrt mindestens genauso früh ankommt.
+
+        Gibt eine nach Abfahrtszeit sortierte Liste von Tupeln
+        (Abfahrtszeit, Ankunftszeit) zurück.
+        """
+        if start not in self._station_index or end not in self._station_index or start == end:
+            return []
+        self._build()
+
+        source = self._station_index[start]
+        target = self._station_index[end]
+        departures, arrivals = self._departures, self._arrivals
+        from_station, to_station = self._from, self._to
+
+        # Profil je Station: Einträge mit fallender Abfahrt und fallender Ankunft.
+        # Die Abfahrten werden negiert gespeichert, damit bisect aufsteigend sucht.
+        negated_departures: List[List[int]] = [[] for _ in self._stations]
+        profile_arrivals: List[List[int]] = [[] for _ in self._stations]
+        # Abfahrten ab `start` im Zeitraum; getrennt geführt, da Weiterfahrten
+        # über `start` auch spätere Abfahrten nutzen dürfen
+        result_departures: List[int] = []
+        result_arrivals: List[int] = []
+        infinity = float('inf')
+
+        # Verbindungen in absteigender Abfahrtszeit durchlaufen
+        for i in range(len(departures) - 1, bisect_left(departures, earliest_departure) - 1, -1):
+            arrival = arrivals[i]
+            next_station = to_station[i]
+            if next_station == target:
+                reached = arrival
+            else:
+                # Früheste Ankunft bei Weiterfahrt ab next_station nicht vor `arrival`
+                position = bisect_right(negated_departures[next_station], -arrival)
+                reached = profile_arrivals[next_station][position - 1] if position else infinity
+            if reached == infinity:
+                continue
+
+            station = from_station[i]
+            if station == source and departures[i] <= latest_departure:
+                _add_to_profile(result_departures, result_arrivals, -departures[i], reached)
+            _add_to_profile(negated_departures[station], profile_arrivals[station], -departures[i], reached)
+
+        result = [(-departure, arrival) for departure, arrival in zip(result_departures, result_arrivals)]
+        result.reverse()
+        return result
+
+
+def _add_to_profile(negated_departures: List[int], profile_arrivals: List[int],
+                    negated_departure: int, reached: int) -> None:
+    """
+    Ergänzt ein Profil um eine Abfahrt, die nicht später als alle bisherigen
+    liegt, sofern sie nicht durch eine spätere Abfahrt dominiert wird.
+    """
+    if profile_arrivals and reached >= profile_arrivals[-1]:
+        return  # Dominiert durch eine spätere Abfahrt
+    if negated_departures and negated_departures[-1] == negated_departure:
+        profile_arrivals[-1] = reached
+    else:
+        negated_departures.append(negated_departure)
+        profile_arrivals.append(reached)
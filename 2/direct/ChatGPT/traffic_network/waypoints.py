@@ -0,0 +1,89 @@
+from typing import Dict, List, Sequence, Tuple, Union
+
+Duration = Union[int, float]
+
+# Bis zu dieser Anzahl Zwischenhalte wird die Reihenfolge exakt bestimmt
+EXACT_LIMIT = 10
+
+def order_waypoints(matrix: Sequence[Sequence[Duration]]) -> List[int]:
+    """
+    Bestimmt die Reihenfolge der Zwischenhalte mit der kleinsten Gesamtdauer
+    (Pfad-Variante des Problems des Handlungsreisenden). Punkt 0 ist der
+    Start, der letzte Punkt das Ziel, dazwischen liegen die Zwischenhalte.
+    `matrix[i][j]` ist die Reisedauer von Punkt i nach Punkt j (unendlich,
+    falls nicht erreichbar).
+
+    Bis EXACT_LIMIT Zwischenhalte wird exakt mit dynamischer Programmierung
+    (Held-Karp) gerechnet, darüber mit Nächster-Nachbar-Heuristik und 2-opt.
+    Zurückgegeben wird die vollständige Punktfolge inklusive Start und Ziel.
+    """
+    count = len(matrix)
+    end = count - 1
+    stops = list(range(1, end))
+    if len(stops) <= 1:
+        return list(range(count))
+    if len(stops) <= EXACT_LIMIT:
+        return _held_karp(matrix, stops, end)
+    return _two_opt(matrix, _nearest_neighbor(matrix, stops, end))
+
+
+def _held_karp(matrix: Sequence[Sequence[Duration]], stops: List[int], end: int) -> List[int]:
+    """Exakte Reihenfolge per Held-Karp über alle Teilmengen der Zwischenhalte."""
+    # best[(Teilmenge, letzter Halt)] = (Dauer ab Start, vorletzter Halt)
+    best: Dict[Tuple[int, int], Tuple[Duration, int]] = {}
+    for i, stop in enumerate(stops):
+        best[1 << i, i] = (matrix[0][stop], -1)
+    for subset in range(1, 1 << len(stops)):
+        for last in range(len(stops)):
+            if not subset & (1 << last) or (subset, last) not in best:
+                continue
+            duration = best[subset, last][0]
+            for following in range(len(stops)):
+                if subset & (1 << following):
+                    continue
+                key = (subset | (1 << following), following)
+                candidate = duration + matrix[stops[last]][stops[following]]
+                if key not in best or candidate < best[key][0]:
+                    best[key] = (candidate, last)
+
+    full = (1 << len(stops)) - 1
+    last = min(range(len(stops)), key=lambda i: best[full, i][0] + matrix[stops[i]][end])
+    order = []
+    subset = full
+    while last != -1:
+        order.append(stops[last])
+        subset, last = subset & ~(1 << last), best[subset, last][1]
+    order.reverse()
+    return [0] + order + [end]
+
+
+def _nearest_neighbor(matrix: Sequence[Sequence[Duration]], stops: List[int], end: int) -> List[int]:
+    """Startreihenfolge: immer zum nächstgelegenen noch offenen Zwischenhalt."""
+    route = [0]
+    remaining = set(stops)
+    while remaining:
+        following = min(remaining, key=lambda stop: matrix[route[-1]][stop])
+        route.append(following)
+        remaining.discard(following)
+    return route + [end]
+
+
+def _two_opt(matrix: Sequence[Sequence[Duration]], route: List[int]) -> List[int]:
+    """
+    Verbessert eine Reihenfolge, indem Abschnitte zwischen Start und Ziel
+    umgedreht werden, solange das die Gesamtdauer verkürzt.
+    """
+    def total(candidate: List[int]) -> Duration:
+        return sum(matrix[a][b] for a, b in zip(candidate, candidate[1:]))
+
+    best = total(route)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(route) - 2):
+            for j in range(i + 1, len(route) - 1):
+                candidate = route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+                duration = total(candidate)
+                if duration < best:
+                    route, best, improved = candidate, duration, True
+    return route
@@ -1,116 +1,161 @@
-import heapq
+import threading
+from contextlib import contextmanager
+
 from models import Station, Connection
+from snapshot import NetworkSnapshot, SnapshotBuilder
 
 class Network:
     """
     Repräsentiert ein Verkehrsnetz bestehend aus Stationen und Verbindungen.
-    
+
+    Der Zustand des Netzes liegt in einem unveränderlichen NetworkSnapshot.
+    Schreibende Methoden erzeugen eine neue Version und veröffentlichen sie
+    atomar; Leser arbeiten ohne Sperren auf der Version, die sie zu Beginn
+    ihrer Anfrage erhalten haben.
+
     Attributes:
-        stations (set): Menge aller Stationen im Netzwerk
-        connections (list): Liste aller Verbindungen im Netzwerk
-        graph (dict): Graphrepräsentation für die Routenberechnung
+        stations (Set): Menge aller Stationen im Netzwerk
+        connections (Sequence): Alle Verbindungen im Netzwerk
+        graph (Mapping): Graphrepräsentation für die Routenberechnung
     """
-    
+
     def __init__(self):
         """Initialisiert ein neues, leeres Verkehrsnetz."""
-        self.stations = set()
-        self.connections = []
-        self.graph = {}  # Adjazenzliste: {station: [(nachbar, dauer), ...]}
-        
+        self._snapshot = NetworkSnapshot()
+        # Serialisiert nur die Schreiber; Leser benötigen keine Sperre
+        self._write_lock = threading.Lock()
+
+    @property
+    def stations(self):
+        """Menge aller Stationen der aktuellen Version."""
+        return self._snapshot.stations
+
+    @property
+    def connections(self):
+        """Alle Verbindungen der aktuellen Version in Einfügereihenfolge."""
+        return self._snapshot.connections
+
+    @property
+    def graph(self):
+        """Adjazenz der aktuellen Version: {station: ((nachbar, dauer), ...)}."""
+        return self._snapshot.graph
+
+    def snapshot(self):
+        """
+        Liefert die aktuell veröffentlichte, unveränderliche Version des Netzes.
+
+        Returns:
+            NetworkSnapshot: Die aktuelle Version
+        """
+        return self._snapshot
+
+    @contextmanager
+    def edit(self):
+        """
+        Fasst mehrere Änderungen zu einer neuen Version zusammen.
+
+        Innerhalb des with-Blocks werden Änderungen auf einem Editor ausgeführt;
+        erst am Ende wird die neue Version veröffentlicht. Tritt eine Ausnahme
+        auf, bleibt die bisherige Version unverändert.
+
+        Yields:
+            NetworkEditor: Editor für die neue Version
+        """
+        with self._write_lock:
+            editor = NetworkEditor(self._snapshot)
+            yield editor
+            # Die Zuweisung einer Referenz ist atomar; Leser sehen alt oder neu
+            self._snapshot = editor.snapshot
+
     def add_station(self, station):
         """
         Fügt eine Station zum Netzwerk hinzu.
-        
+
         Args:
             station (Station): Die hinzuzufügende Station
         """
-        self.stations.add(station)
-        if station not in self.graph:
-            self.graph[station] = []
-            
+        with self.edit() as editor:
+            editor.add_station(station)
+
     def add_connection(self, connection):
         """
         Fügt eine Verbindung zum Netzwerk hinzu.
-        
+
         Args:
             connection (Connection): Die hinzuzufügende Verbindung
         """
-        # Stelle sicher, dass beide Stationen im Netzwerk sind
-        self.add_station(connection.start)
-        self.add_station(connection.end)
-        
-        # Füge die Verbindung zur Liste hinzu
-        self.connections.append(connection)
-        
-        # Aktualisiere den Graphen (für bidirektionale Verbindungen)
-        self.graph[connection.start].append((connection.end, connection.duration))
-        
+        with self.edit() as editor:
+            editor.add_connection(connection)
+
+    def update_duration(self, start, end, duration):
+        """
+        Ändert die Dauer aller Verbindungen von `start` nach `end`.
+
+        Args:
+            start (Station): Die Startstation
+            end (Station): Die Zielstation
+            duration (int): Die neue Dauer in Minuten
+
+        Raises:
+            ValueError: Wenn keine Verbindung von start nach end existiert
+        """
+        with self.edit() as editor:
+            editor.update_duration(start, end, duration)
+
     def shortest_path(self, start, end):
         """
         Berechnet den kürzesten Weg zwischen zwei Stationen mittels Dijkstra-Algorithmus.
-        
+
+        Die Suche läuft vollständig auf der beim Aufruf aktuellen Version, auch
+        wenn währenddessen neue Versionen veröffentlicht werden.
+
         Args:
             start (Station): Die Startstation
             end (Station): Die Zielstation
-            
+
         Returns:
             tuple: (path, total_duration) wobei path eine Liste von Stationen ist
                   und total_duration die Gesamtdauer in Minuten
-        
+
         Raises:
             ValueError: Wenn start oder end nicht im Netzwerk sind oder kein Weg existiert
         """
-        if start not in self.stations:
-            raise ValueError(f"Startstation '{start}' ist nicht im Netzwerk")
-        if end not in self.stations:
-            raise ValueError(f"Zielstation '{end}' ist nicht im Netzwerk")
-        
-        # Initialisiere die Distanzen mit unendlich
-        distances = {station: float('infinity') for station in self.stations}
-        distances[start] = 0
-        
-        # Initialisiere die Vorgänger für die Pfadrekonstruktion
-        previous = {station: None for station in self.stations}
-        
-        # Prioritätswarteschlange für Dijkstra, enthält (distanz, station)
-        priority_queue = [(0, start)]
-        
-        # Menge der bereits besuchten Stationen
-        visited = set()
-        
-        while priority_queue:
-            # Hole die Station mit der geringsten Distanz
-            current_distance, current_station = heapq.heappop(priority_queue)
-            
-            # Wenn wir die Zielstation erreicht haben, können wir den Pfad rekonstruieren
-            if current_station == end:
-                path = []
-                current = end
-                while current is not None:
-                    path.append(current)
-                    current = previous[current]
-                path.reverse()  # Pfad von Start nach Ziel umdrehen
-                return path, distances[end]
-            
-            # Keine Knoten mehrfach verarbeiten
-            if current_station in visited:
-                continue
-            
-            visited.add(current_station)
-            
-            # Untersuche alle Nachbarn des aktuellen Knotens
-            for neighbor, weight in self.graph[current_station]:
-                if neighbor in visited:
-                    continue
-                    
-                # Berechne die neue Distanz
-                distance = current_distance + weight
-                
-                # Wenn wir einen kürzeren Weg gefunden haben, aktualisiere die Werte
-                if distance < distances[neighbor]:
-                    distances[neighbor] = distance
-                    previous[neighbor] = current_station
-                    heapq.heappush(priority_queue, (distance, neighbor))
-        
-        # Wenn wir hier ankommen, existiert kein Pfad
-        raise ValueError(f"Es existiert kein Weg von '{start}' nach '{end}'")
\ No newline at end of file
+        return self._snapshot.shortest_path(start, end)
+
+
+class NetworkEditor:
+    """
+    Sammelt Änderungen für eine neue Version des Verkehrsnetzes.
+
+    Die Änderungen werden mit einem SnapshotBuilder gebündelt und erst beim
+    Lesen von `snapshot` in die persistenten Strukturen übernommen.
+
+    Attributes:
+        snapshot (NetworkSnapshot): Die bisher aufgebaute neue Version
+    """
+
+    def __init__(self, snapshot):
+        """
+        Initialisiert den Editor.
+
+        Args:
+            snapshot (NetworkSnapshot): Die Ausgangsversion
+        """
+        self._builder = SnapshotBuilder(snapshot)
+
+    @property
+    def snapshot(self):
+        """Die neue Version mit allen bisherigen Änderungen."""
+        return self._builder.snapshot()
+
+    def add_station(self, station):
+        """Fügt eine Station zur neuen Version hinzu."""
+        self._builder.add_station(station)
+
+    def add_connection(self, connection):
+        """Fügt eine Verbindung (und ihre Stationen) zur neuen Version hinzu."""
+        self._builder.add_connection(connection)
+
+    def update_duration(self, start, end, duration):
+        """Ändert die Dauer aller Verbindungen von `start` nach `end`."""
+        self._builder.update_duration(start, end, duration)
@@ -0,0 +1,611 @@
+import heapq
+from collections.abc import Mapping, Sequence, Set
+from itertools import count
+
+from models import Connection
+
+
+# Verzweigungsgrad der Tries: 2 ** _BITS Kinder je Knoten
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+_HASH_MASK = (1 << 64) - 1
+_MISSING = object()
+
+
+class _Leaf:
+    """Ein Eintrag eines PersistentMap-Tries."""
+
+    __slots__ = ("hash", "key", "value")
+
+    def __init__(self, key_hash, key, value):
+        self.hash = key_hash
+        self.key = key
+        self.value = value
+
+
+class _Collision:
+    """Einträge verschiedener Schlüssel mit vollständig gleichem Hashwert."""
+
+    __slots__ = ("hash", "entries")
+
+    def __init__(self, key_hash, entries):
+        self.hash = key_hash
+        self.entries = entries
+
+
+class _Node:
+    """Innerer Knoten: Bitmap der belegten Positionen und die belegten Kinder."""
+
+    __slots__ = ("bitmap", "children")
+
+    def __init__(self, bitmap, children):
+        self.bitmap = bitmap
+        self.children = children
+
+
+def _merge(first, second, shift):
+    """Erzeugt die Knoten, unter denen sich zwei Einträge mit verschiedenem Hash trennen."""
+    first_slot = (first.hash >> shift) & _MASK
+    second_slot = (second.hash >> shift) & _MASK
+    if first_slot == second_slot:
+        return _Node(1 << first_slot, (_merge(first, second, shift + _BITS),))
+    if first_slot > second_slot:
+        first, second = second, first
+    return _Node((1 << first_slot) | (1 << second_slot), (first, second))
+
+
+def _assoc(node, shift, key_hash, key, value):
+    """
+    Setzt `key` im Teilbaum `node` und kopiert dabei nur den Pfad zum Eintrag.
+
+    Returns:
+        tuple: (neuer Knoten, True falls der Schlüssel neu ist)
+    """
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    children = node.children
+    if not node.bitmap & bit:
+        child, added = _Leaf(key_hash, key, value), True
+        return _Node(node.bitmap | bit, children[:index] + (child,) + children[index:]), added
+
+    child = children[index]
+    if type(child) is _Node:
+        child, added = _assoc(child, shift + _BITS, key_hash, key, value)
+    elif child.hash != key_hash:
+        child, added = _merge(child, _Leaf(key_hash, key, value), shift + _BITS), True
+    elif type(child) is _Leaf:
+        if child.key == key:
+            child, added = _Leaf(key_hash, key, value), False
+        else:
+            child, added = _Collision(key_hash, ((child.key, child.value), (key, value))), True
+    else:
+        entries = tuple(entry for entry in child.entries if entry[0] != key)
+        added = len(entries) == len(child.entries)
+        child = _Collision(key_hash, entries + ((key, value),))
+    return _Node(node.bitmap, children[:index] + (child,) + children[index + 1:]), added
+
+
+def _entries(node):
+    """Durchläuft alle Einträge eines Teilbaums als (Schlüssel, Wert)."""
+    for child in node.children:
+        if type(child) is _Node:
+            yield from _entries(child)
+        elif type(child) is _Leaf:
+            yield child.key, child.value
+        else:
+            yield from child.entries
+
+
+class PersistentMap(Mapping):
+    """
+    Unveränderliches Dictionary mit strukturellem Teilen.
+
+    Die Einträge liegen in einem Hash-Trie (HAMT) mit 32 Kindern je Knoten.
+    Eine Änderung kopiert nur die Knoten auf dem Pfad zum Eintrag, also
+    O(log N); alle anderen Teilbäume werden von der neuen Version
+    unverändert mitbenutzt.
+    """
+
+    def __init__(self, root=None, size=0):
+        """
+        Initialisiert die Map.
+
+        Args:
+            root (_Node): Wurzel des Tries, None für eine leere Map
+            size (int): Anzahl der Einträge
+        """
+        self._root = root if root is not None else _Node(0, ())
+        self._size = size
+
+    def _find(self, key):
+        key_hash = hash(key) & _HASH_MASK
+        node = self._root
+        shift = 0
+        while True:
+            bit = 1 << ((key_hash >> shift) & _MASK)
+            if not node.bitmap & bit:
+                return _MISSING
+            child = node.children[(node.bitmap & (bit - 1)).bit_count()]
+            if type(child) is _Node:
+                node = child
+                shift += _BITS
+            elif child.hash != key_hash:
+                return _MISSING
+            elif type(child) is _Leaf:
+                return child.value if child.key == key else _MISSING
+            else:
+                for entry_key, value in child.entries:
+                    if entry_key == key:
+                        return value
+                return _MISSING
+
+    def __getitem__(self, key):
+        value = self._find(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self._find(key) is not _MISSING
+
+    def get(self, key, default=None):
+        value = self._find(key)
+        return default if value is _MISSING else value
+
+    def __iter__(self):
+        for key, _ in _entries(self._root):
+            yield key
+
+    def __len__(self):
+        return self._size
+
+    def set(self, key, value):
+        """
+        Liefert eine neue Map, in der `key` auf `value` gesetzt ist.
+
+        Args:
+            key: Der Schlüssel
+            value: Der neue Wert
+
+        Returns:
+            PersistentMap: Die neue Version; die aktuelle bleibt unverändert
+        """
+        root, added = _assoc(self._root, 0, hash(key) & _HASH_MASK, key, value)
+        return PersistentMap(root, self._size + added)
+
+
+def _path(shift, values):
+    """Neuer Pfad aus Einzelknoten bis hinunter zum Blatt mit `values`."""
+    node = values
+    while shift > 0:
+        node = (node,)
+        shift -= _BITS
+    return node
+
+
+def _push(node, shift, index, values):
+    """
+    Hängt `values` ab Position `index` an und kopiert nur den rechten Pfad.
+    Alle Werte müssen in dasselbe Blatt passen.
+    """
+    if shift == 0:
+        return node + values
+    slot = (index >> shift) & _MASK
+    if slot < len(node):
+        return node[:slot] + (_push(node[slot], shift - _BITS, index, values),)
+    return node + (_path(shift - _BITS, values),)
+
+
+def _assign(node, shift, index, value):
+    """Ersetzt das Element an `index` und kopiert nur den Pfad dorthin."""
+    slot = (index >> shift) & _MASK
+    if shift == 0:
+        return node[:slot] + (value,) + node[slot + 1:]
+    return node[:slot] + (_assign(node[slot], shift - _BITS, index, value),) + node[slot + 1:]
+
+
+def _values(node, shift):
+    """Durchläuft die Elemente eines Teilbaums in Reihenfolge."""
+    if shift == 0:
+        yield from node
+    else:
+        for child in node:
+            yield from _values(child, shift - _BITS)
+
+
+class PersistentList(Sequence):
+    """
+    Unveränderliche Liste mit strukturellem Teilen.
+
+    Die Elemente liegen in einem Trie aus Tupeln mit je bis zu 32 Einträgen.
+    Anhängen und Ersetzen kopieren nur die Knoten auf dem Pfad zum Element,
+    also O(log N).
+    """
+
+    def __init__(self, root=(), size=0, shift=0):
+        """
+        Initialisiert die Liste.
+
+        Args:
+            root (tuple): Wurzel des Tries
+            size (int): Anzahl der Elemente
+            shift (int): Bitverschiebung der Wurzelebene (0 für ein einzelnes Blatt)
+        """
+        self._root = root
+        self._size = size
+        self._shift = shift
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("Index außerhalb der Liste")
+        node = self._root
+        shift = self._shift
+        while shift > 0:
+            node = node[(index >> shift) & _MASK]
+            shift -= _BITS
+        return node[index & _MASK]
+
+    def __iter__(self):
+        return _values(self._root, self._shift)
+
+    def __len__(self):
+        return self._size
+
+    def _append_leaf(self, values):
+        """Hängt Werte an, die vollständig in das letzte bzw. ein neues Blatt passen."""
+        if self._size == _WIDTH << self._shift:
+            # Wurzel ist voll: eine Ebene mehr
+            root = (self._root, _path(self._shift, values))
+            return PersistentList(root, self._size + len(values), self._shift + _BITS)
+        root = _push(self._root, self._shift, self._size, values)
+        return PersistentList(root, self._size + len(values), self._shift)
+
+    def append(self, value):
+        """
+        Liefert eine neue Liste mit `value` am Ende.
+
+        Args:
+            value: Das anzuhängende Element
+
+        Returns:
+            PersistentList: Die neue Version; die aktuelle bleibt unverändert
+        """
+        return self._append_leaf((value,))
+
+    def extend(self, values):
+        """
+        Liefert eine neue Liste mit allen `values` am Ende. Die Werte werden
+        blattweise eingefügt, sodass je 32 Elemente nur ein Pfad kopiert wird.
+
+        Args:
+            values: Die anzuhängenden Elemente
+
+        Returns:
+            PersistentList: Die neue Version; die aktuelle bleibt unverändert
+        """
+        values = tuple(values)
+        result = self
+        position = 0
+        while position < len(values):
+            free = _WIDTH - result._size % _WIDTH
+            result = result._append_leaf(values[position:position + free])
+            position += free
+        return result
+
+    def set(self, index, value):
+        """
+        Liefert eine neue Liste, in der das Element an `index` ersetzt ist.
+
+        Args:
+            index (int): Position des Elements
+            value: Das neue Element
+
+        Returns:
+            PersistentList: Die neue Version; die aktuelle bleibt unverändert
+        """
+        self[index]  # Bereichsprüfung
+        root = _assign(self._root, self._shift, index % self._size, value)
+        return PersistentList(root, self._size, self._shift)
+
+
+class _StationView(Set):
+    """Menge der Stationen einer Version, gelesen aus deren Adjazenz-Map."""
+
+    __slots__ = ("_adjacency",)
+
+    def __init__(self, adjacency):
+        self._adjacency = adjacency
+
+    def __contains__(self, station):
+        return station in self._adjacency
+
+    def __iter__(self):
+        return iter(self._adjacency)
+
+    def __len__(self):
+        return len(self._adjacency)
+
+
+class _GraphView(Mapping):
+    """Adjazenz einer Version ohne Verbindungsindizes, gelesen aus deren Adjazenz-Map."""
+
+    __slots__ = ("_adjacency",)
+
+    def __init__(self, adjacency):
+        self._adjacency = adjacency
+
+    def __getitem__(self, station):
+        return tuple((neighbor, duration) for neighbor, duration, _ in self._adjacency[station])
+
+    def __iter__(self):
+        return iter(self._adjacency)
+
+    def __len__(self):
+        return len(self._adjacency)
+
+
+class NetworkSnapshot:
+    """
+    Unveränderliche Version eines Verkehrsnetzes.
+
+    Ein Snapshot wird nach seiner Veröffentlichung nie mehr verändert und kann
+    daher ohne Sperren von beliebig vielen Threads gelesen werden. Änderungen
+    erzeugen über die with_*-Methoden eine neue Version, die unveränderte
+    Teilbäume von Adjazenz und Verbindungsliste mit der alten Version teilt.
+
+    Attributes:
+        version (int): Fortlaufende Versionsnummer
+    """
+
+    def __init__(self, adjacency=None, connections=None, version=0):
+        """
+        Initialisiert einen Snapshot.
+
+        Args:
+            adjacency (PersistentMap): {station: ((nachbar, dauer, verbindungsindex), ...)}
+            connections (PersistentList): Alle Verbindungen in Einfügereihenfolge
+            version (int): Versionsnummer
+        """
+        self._adjacency = adjacency if adjacency is not None else PersistentMap()
+        self._connections = connections if connections is not None else PersistentList()
+        self.version = version
+        # Die Sichten lesen direkt aus den persistenten Strukturen; sie werden
+        # vor der Veröffentlichung in O(1) angelegt und danach nie verändert
+        self._stations = _StationView(self._adjacency)
+        self._graph = _GraphView(self._adjacency)
+
+    @property
+    def stations(self):
+        """Menge aller Stationen dieser Version (Sicht auf die Adjazenz)."""
+        return self._stations
+
+    @property
+    def connections(self):
+        """Alle Verbindungen dieser Version in Einfügereihenfolge."""
+        return self._connections
+
+    @property
+    def graph(self):
+        """Graphrepräsentation {station: ((nachbar, dauer), ...)} dieser Version."""
+        return self._graph
+
+    def has_station(self, station):
+        """Prüft, ob die Station in dieser Version enthalten ist."""
+        return station in self._adjacency
+
+    def with_station(self, station):
+        """
+        Liefert eine neue Version, die zusätzlich die Station enthält.
+
+        Args:
+            station (Station): Die hinzuzufügende Station
+
+        Returns:
+            NetworkSnapshot: Die neue Version (oder diese, falls die Station schon existiert)
+        """
+        builder = SnapshotBuilder(self)
+        builder.add_station(station)
+        return builder.snapshot()
+
+    def with_connection(self, connection):
+        """
+        Liefert eine neue Version, die zusätzlich die Verbindung enthält.
+
+        Args:
+            connection (Connection): Die hinzuzufügende Verbindung
+
+        Returns:
+            NetworkSnapshot: Die neue Version
+        """
+        builder = SnapshotBuilder(self)
+        builder.add_connection(connection)
+        return builder.snapshot()
+
+    def with_duration(self, start, end, duration):
+        """
+        Liefert eine neue Version, in der alle Verbindungen von `start` nach
+        `end` die neue Dauer haben.
+
+        Args:
+            start (Station): Die Startstation
+            end (Station): Die Zielstation
+            duration (int): Die neue Dauer in Minuten
+
+        Returns:
+            NetworkSnapshot: Die neue Version
+
+        Raises:
+            ValueError: Wenn keine Verbindung von start nach end existiert
+        """
+        builder = SnapshotBuilder(self)
+        builder.update_duration(start, end, duration)
+        return builder.snapshot()
+
+    def shortest_path(self, start, end):
+        """
+        Berechnet den kürzesten Weg zwischen zwei Stationen mittels Dijkstra-Algorithmus.
+
+        Args:
+            start (Station): Die Startstation
+            end (Station): Die Zielstation
+
+        Returns:
+            tuple: (path, total_duration) wobei path eine Liste von Stationen ist
+                  und total_duration die Gesamtdauer in Minuten
+
+        Raises:
+            ValueError: Wenn start oder end nicht im Netzwerk sind oder kein Weg existiert
+        """
+        adjacency = self._adjacency
+        if start not in adjacency:
+            raise ValueError(f"Startstation '{start}' ist nicht im Netzwerk")
+        if end not in adjacency:
+            raise ValueError(f"Zielstation '{end}' ist nicht im Netzwerk")
+
+        # Distanzen und Vorgänger nur für erreichte Stationen
+        distances = {start: 0}
+        previous = {start: None}
+
+        # Prioritätswarteschlange für Dijkstra, enthält (distanz, zähler, station);
+        # der Zähler verhindert Vergleiche zwischen Stationen bei gleicher Distanz
+        tie_breaker = count()
+        priority_queue = [(0, next(tie_breaker), start)]
+
+        # Menge der bereits besuchten Stationen
+        visited = set()
+        # Jede Station wird höchstens einmal aus dem Trie gelesen
+        find = adjacency._find
+
+        while priority_queue:
+            # Hole die Station mit der geringsten Distanz
+            current_distance, _, current_station = heapq.heappop(priority_queue)
+
+            # Wenn wir die Zielstation erreicht haben, können wir den Pfad rekonstruieren
+            if current_station == end:
+                path = []
+                current = end
+                while current is not None:
+                    path.append(current)
+                    current = previous[current]
+                path.reverse()  # Pfad von Start nach Ziel umdrehen
+                return path, distances[end]
+
+            # Keine Knoten mehrfach verarbeiten
+            if current_station in visited:
+                continue
+
+            visited.add(current_station)
+
+            # Untersuche alle Nachbarn des aktuellen Knotens
+            for neighbor, weight, _ in find(current_station):
+                if neighbor in visited:
+                    continue
+
+                # Berechne die neue Distanz
+                distance = current_distance + weight
+
+                # Wenn wir einen kürzeren Weg gefunden haben, aktualisiere die Werte
+                if distance < distances.get(neighbor, float('infinity')):
+                    distances[neighbor] = distance
+                    previous[neighbor] = current_station
+                    heapq.heappush(priority_queue, (distance, next(tie_breaker), neighbor))
+
+        # Wenn wir hier ankommen, existiert kein Pfad
+        raise ValueError(f"Es existiert kein Weg von '{start}' nach '{end}'")
+
+
+class SnapshotBuilder:
+    """
+    Sammelt Änderungen an einer Version und übernimmt sie gebündelt.
+
+    Geänderte Adjazenzen und neue Verbindungen liegen bis zum Aufruf von
+    snapshot() in gewöhnlichen Dictionaries und Listen. Erst dann werden sie
+    mit einer Änderung je betroffener Station und blattweisem Anhängen der
+    Verbindungen in die persistenten Strukturen übertragen. Die
+    Versionsnummer steigt wie bei den with_*-Methoden je Änderung um eins.
+    """
+
+    def __init__(self, snapshot):
+        """
+        Initialisiert den Builder.
+
+        Args:
+            snapshot (NetworkSnapshot): Die Ausgangsversion
+        """
+        self._base = snapshot
+        self._adjacency = {}
+        self._replaced = {}
+        self._appended = []
+        self._changes = 0
+
+    def _entries(self, station):
+        """Aktuelle Adjazenz einer Station oder None, falls sie nicht existiert."""
+        entries = self._adjacency.get(station)
+        if entries is None:
+            entries = self._base._adjacency.get(station)
+        return entries
+
+    def add_station(self, station):
+        """Fügt eine Station hinzu, sofern sie noch nicht existiert."""
+        if self._entries(station) is None:
+            self._adjacency[station] = ()
+            self._changes += 1
+
+    def add_connection(self, connection):
+        """Fügt eine Verbindung und ihre Stationen hinzu."""
+        entries = self._entries(connection.start) or ()
+        if self._entries(connection.end) is None:
+            self._adjacency[connection.end] = ()
+        index = len(self._base._connections) + len(self._appended)
+        self._adjacency[connection.start] = entries + ((connection.end, connection.duration, index),)
+        self._appended.append(connection)
+        self._changes += 1
+
+    def update_duration(self, start, end, duration):
+        """
+        Ändert die Dauer aller Verbindungen von `start` nach `end`.
+
+        Raises:
+            ValueError: Wenn keine Verbindung von start nach end existiert
+        """
+        entries = self._entries(start)
+        if entries is None:
+            raise ValueError(f"Startstation '{start}' ist nicht im Netzwerk")
+        indices = [index for neighbor, _, index in entries if neighbor == end]
+        if not indices:
+            raise ValueError(f"Es existiert keine Verbindung von '{start}' nach '{end}'")
+        offset = len(self._base._connections)
+        for index in indices:
+            connection = Connection(start, end, duration)
+            if index >= offset:
+                self._appended[index - offset] = connection
+            else:
+                self._replaced[index] = connection
+        self._adjacency[start] = tuple(
+            (neighbor, duration if neighbor == end else old_duration, index)
+            for neighbor, old_duration, index in entries
+        )
+        self._changes += 1
+
+    def snapshot(self):
+        """
+        Liefert die Version mit allen bisherigen Änderungen.
+
+        Returns:
+            NetworkSnapshot: Die neue Version (oder die Ausgangsversion ohne Änderungen)
+        """
+        if self._changes:
+            base = self._base
+            adjacency = base._adjacency
+            for station, entries in self._adjacency.items():
+                adjacency = adjacency.set(station, entries)
+            connections = base._connections
+            for index, connection in self._replaced.items():
+                connections = connections.set(index, connection)
+            connections = connections.extend(self._appended)
+            self._base = NetworkSnapshot(adjacency, connections, base.version + self._changes)
+            self._adjacency, self._replaced, self._appended, self._changes = {}, {}, [], 0
+        return self._base
@@ -0,0 +1,205 @@
+"""
+Testmodul für die unveränderlichen Versionen des Verkehrsnetzes.
+"""
+
+import random
+import sys
+import threading
+
+from models import Station, Connection
+from network import Network
+from snapshot import PersistentList, PersistentMap
+
+
+class _Key:
+    """Schlüssel mit frei wählbarem Hashwert, um Kollisionen zu erzwingen."""
+
+    def __init__(self, value, key_hash):
+        self.value = value
+        self.key_hash = key_hash
+
+    def __hash__(self):
+        return self.key_hash
+
+    def __eq__(self, other):
+        return isinstance(other, _Key) and other.value == self.value
+
+
+def _shortest_durations(stations, connections):
+    """Floyd-Warshall als Referenz: {(start, ziel): dauer}."""
+    infinity = float('infinity')
+    durations = {(a, b): 0 if a == b else infinity for a in stations for b in stations}
+    for connection in connections:
+        key = (connection.start, connection.end)
+        durations[key] = min(durations[key], connection.duration)
+    for via in stations:
+        for a in stations:
+            for b in stations:
+                if durations[a, via] + durations[via, b] < durations[a, b]:
+                    durations[a, b] = durations[a, via] + durations[via, b]
+    return durations
+
+
+def test_persistent_map():
+    """Die Map verhält sich wie ein dict, alte Versionen bleiben unverändert."""
+    rng = random.Random(0)
+    for colliding in (False, True):
+        current = PersistentMap()
+        expected = {}
+        versions = []
+        for _ in range(2000):
+            value = rng.randint(0, 500)
+            # Mit wenigen Hashwerten entstehen viele vollständige Kollisionen
+            key = _Key(value, value % 7 if colliding else hash(value * 2654435761))
+            versions.append((current, dict(expected)))
+            current = current.set(key, rng.random())
+            expected[key] = current[key]
+        assert len(current) == len(expected)
+        assert set(current) == set(expected)
+        assert all(current[key] == value for key, value in expected.items())
+        assert _Key(-1, 3) not in current
+        for version, contents in versions[::97]:
+            assert len(version) == len(contents)
+            assert all(version[key] == value for key, value in contents.items())
+
+
+def test_persistent_list():
+    """Die Liste verhält sich wie eine list, alte Versionen bleiben unverändert."""
+    rng = random.Random(1)
+    current = PersistentList()
+    expected = []
+    versions = []
+    for i in range(5000):
+        if i % 50 == 0:
+            versions.append((current, list(expected)))
+        if expected and rng.random() < 0.2:
+            index = rng.randrange(len(expected))
+            current = current.set(index, -i)
+            expected[index] = -i
+        elif rng.random() < 0.1:
+            values = list(range(i, i + rng.randint(0, 70)))
+            current = current.extend(values)
+            expected.extend(values)
+        else:
+            current = current.append(i)
+            expected.append(i)
+    assert list(current) == expected and len(current) == len(expected)
+    assert all(current[i] == expected[i] for i in range(-len(expected), len(expected), 7))
+    for version, contents in versions:
+        assert list(version) == contents
+
+
+def test_shortest_path_matches_reference():
+    """Kürzeste Wege jeder Version entsprechen Floyd-Warshall."""
+    rng = random.Random(2)
+    for _ in range(30):
+        stations = [Station(str(i)) for i in range(8)]
+        network = Network()
+        connections = []
+        for _ in range(rng.randint(0, 20)):
+            start, end = rng.choice(stations), rng.choice(stations)
+            connections.append(Connection(start, end, rng.randint(1, 9)))
+        with network.edit() as editor:
+            for station in stations:
+                editor.add_station(station)
+            for connection in connections:
+                editor.add_connection(connection)
+
+        for _ in range(5):
+            snapshot = network.snapshot()
+            durations = _shortest_durations(stations, connections)
+            for start in stations:
+                for end in stations:
+                    try:
+                        path, duration = snapshot.shortest_path(start, end)
+                    except ValueError:
+                        assert durations[start, end] == float('infinity')
+                        continue
+                    assert duration == durations[start, end]
+                    assert path[0] == start and path[-1] == end
+
+            # Dauer ändern; die alte Version muss unverändert bleiben
+            if not connections:
+                break
+            changed = rng.choice(connections)
+            duration = rng.randint(1, 9)
+            network.update_duration(changed.start, changed.end, duration)
+            connections = [Connection(c.start, c.end, duration)
+                           if (c.start, c.end) == (changed.start, changed.end) else c
+                           for c in connections]
+            assert snapshot.version < network.snapshot().version
+            assert [c.duration for c in network.connections] == [c.duration for c in connections]
+
+
+def test_views_are_cached():
+    """Abgeleitete Sichten gehören fest zu ihrer Version."""
+    a, b, c = Station("A"), Station("B"), Station("C")
+    network = Network()
+    network.add_connection(Connection(a, b, 5))
+    snapshot = network.snapshot()
+    assert snapshot.stations is snapshot.stations
+    assert snapshot.graph is snapshot.graph
+    assert snapshot.connections is snapshot.connections
+    assert snapshot.graph[a] == ((b, 5),)
+
+    network.add_connection(Connection(b, c, 2))
+    assert c not in snapshot.stations and c in network.stations
+    assert network.shortest_path(a, c) == ([a, b, c], 7)
+
+    # Lesen verändert eine veröffentlichte Version nicht
+    state = dict(vars(snapshot))
+    snapshot.shortest_path(a, b)
+    list(snapshot.graph.items())
+    assert vars(snapshot) == state
+
+
+def test_concurrent_readers():
+    """Mehrere Leser fragen jede neue Version gleichzeitig als Erste ab."""
+    stations = [Station(str(i)) for i in range(30)]
+    network = Network()
+    with network.edit() as editor:
+        for a, b in zip(stations, stations[1:]):
+            editor.add_connection(Connection(a, b, 1))
+    rounds, readers = 300, 8
+    start_round = threading.Barrier(readers + 1)
+    end_round = threading.Barrier(readers + 1)
+    errors = []
+
+    def read():
+        for _ in range(rounds):
+            start_round.wait()
+            try:
+                snapshot = network.snapshot()
+                path, duration = snapshot.shortest_path(stations[0], stations[-1])
+                graph = snapshot.graph
+                assert duration == sum(dict(graph[a])[b] for a, b in zip(path, path[1:]))
+                assert len(snapshot.stations) == len(stations)
+            except Exception as error:
+                errors.append(error)
+            end_round.wait()
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=read) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        rng = random.Random(3)
+        for _ in range(rounds):
+            i = rng.randrange(len(stations) - 1)
+            network.update_duration(stations[i], stations[i + 1], rng.randint(1, 9))
+            start_round.wait()
+            end_round.wait()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert errors == []
+
+
+if __name__ == "__main__":
+    test_persistent_map()
+    test_persistent_list()
+    test_shortest_path_matches_reference()
+    test_views_are_cached()
+    test_concurrent_readers()
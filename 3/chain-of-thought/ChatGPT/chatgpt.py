@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 
 class InvalidExpressionError(ValueError):
@@ -48,12 +48,19 @@ def evaluate(expression: str) -> float:
     """
     Evaluiert einen mathematischen Ausdruck und gibt das Ergebnis als float zurück.
     
-    Der Ausdruck wird tokenisiert und rekursiv verarbeitet:
-      1. Klammerausdrücke werden rekursiv ausgewertet und ihr Ergebnis ersetzt
-         den gesamten Klammerausdruck in der Tokenliste.
-      2. Anschließend werden Multiplikation und Division (höhere Priorität)
-         ausgewertet, wobei die Teilergebnisse in die Tokenliste "zusammengeführt" werden.
-      3. Zum Schluss werden Addition und Subtraktion ausgewertet.
+    Der Ausdruck wird tokenisiert und die Tokenliste anschließend in einem
+    einzigen Durchlauf per Index ausgewertet:
+      1. Multiplikation und Division (höhere Priorität) werden sofort mit dem
+         laufenden Produkt des aktuellen Summanden verrechnet.
+      2. Addition und Subtraktion werden verrechnet, sobald ein Summand
+         vollständig ist.
+      3. Eine öffnende Klammer legt den Zwischenstand auf einen Stapel, die
+         schließende Klammer setzt ihn mit dem Wert des Klammerausdrucks als
+         Operand fort. So bleibt auch bei tiefer Verschachtelung die
+         Rekursionstiefe konstant.
+    
+    Unausgeglichene und leere Klammern werden vorab geprüft und wie bei der
+    früheren klammerweisen Auswertung vor allen übrigen Fehlern gemeldet.
     
     Raises:
         InvalidExpressionError: Wenn der Ausdruck nicht mathematisch korrekt ist,
@@ -68,76 +75,84 @@ def evaluate(expression: str) -> float:
     if tokens.count("(") != tokens.count(")"):
         raise InvalidExpressionError("Unausgeglichene Klammern im Ausdruck")
     
-    # Basisfall: Ausdruck besteht nur aus einer Zahl
-    if len(tokens) == 1 and tokens[0].replace('.', '', 1).isdigit():
-        return float(tokens[0])
+    # Wie bei der früheren klammerweisen Auswertung hat ein leerer
+    # Klammerausdruck Vorrang vor Fehlern außerhalb der Klammern
+    depth = 0
+    unbalanced = False
+    for i, token in enumerate(tokens):
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            if i > 0 and tokens[i - 1] == "(":
+                raise InvalidExpressionError("Leerer Klammerausdruck")
+            depth -= 1
+            unbalanced = unbalanced or depth < 0
+    if unbalanced:
+        raise InvalidExpressionError("Unausgeglichene Klammern im Ausdruck")
     
-    # Schritt 1: Rekursive Auswertung von Klammerausdrücken
-    while "(" in tokens:
-        start = None
-        for i, token in enumerate(tokens):
+    # Zwischenstand der aktuellen Klammerebene:
+    # Summe der fertigen Summanden, offener Additionsoperator,
+    # Produkt des aktuellen Summanden und offener Multiplikationsoperator
+    total = 0.0
+    add_operator = None
+    product = 0.0
+    multiply_operator = None
+    levels = []
+    expect_operand = True
+    
+    for token in tokens:
+        if expect_operand:
             if token == "(":
-                start = i  # Merke die Position der zuletzt geöffneten Klammer
-            elif token == ")" and start is not None:
-                inner_expr_tokens = tokens[start + 1:i]
-                if not inner_expr_tokens:
-                    raise InvalidExpressionError("Leerer Klammerausdruck")
-                inner_expr = " ".join(inner_expr_tokens)
-                value = evaluate(inner_expr)
-                # Ersetze den gesamten Klammerausdruck (inkl. Klammern) durch das Ergebnis
-                tokens = tokens[:start] + [str(value)] + tokens[i + 1:]
-                break
-        else:
-            # Falls keine passende schließende Klammer gefunden wurde
-            raise InvalidExpressionError("Unausgeglichene Klammern im Ausdruck")
-    
-    # Schritt 2: Auswertung von Multiplikation und Division (höhere Priorität)
-    i = 0
-    while i < len(tokens):
-        if tokens[i] in ("*", "/"):
-            try:
-                left = float(tokens[i - 1])
-                right = float(tokens[i + 1])
-            except (IndexError, ValueError):
+                levels.append((total, add_operator, product, multiply_operator))
+                total, add_operator, product, multiply_operator = 0.0, None, 0.0, None
+                continue
+            if token in ("+", "-", "*", "/", ")"):
                 raise InvalidExpressionError("Ungültiger mathematischer Ausdruck")
-            
-            if tokens[i] == "*":
-                result = left * right
-            else:
-                if right == 0:
-                    raise InvalidExpressionError("Division durch Null")
-                result = left / right
-            
-            # Zusammenführen: Ersetze "left operator right" durch das Ergebnis
-            tokens = tokens[:i - 1] + [str(result)] + tokens[i + 2:]
-            i = 0  # Starte die Schleife neu, da sich die Tokenliste verändert hat
-        else:
-            i += 1
-    
-    # Schritt 3: Auswertung von Addition und Subtraktion
-    i = 0
-    while i < len(tokens):
-        if tokens[i] in ("+", "-"):
             try:
-                left = float(tokens[i - 1])
-                right = float(tokens[i + 1])
-            except (IndexError, ValueError):
+                value = float(token)
+            except ValueError:
                 raise InvalidExpressionError("Ungültiger mathematischer Ausdruck")
-            
-            if tokens[i] == "+":
-                result = left + right
-            else:
-                result = left - right
-            
-            tokens = tokens[:i - 1] + [str(result)] + tokens[i + 2:]
-            i = 0  # Nach Zusammenführen neu starten
+        elif token in ("*", "/"):
+            multiply_operator = token
+            expect_operand = True
+            continue
+        elif token in ("+", "-"):
+            total = _add(total, add_operator, product)
+            add_operator = token
+            multiply_operator = None
+            expect_operand = True
+            continue
+        elif token == ")":
+            # Klammerebene abschließen; ihr Wert ist Operand der äußeren Ebene
+            value = _add(total, add_operator, product)
+            total, add_operator, product, multiply_operator = levels.pop()
         else:
-            i += 1
+            # Zwei Operanden ohne Operator dazwischen
+            raise InvalidExpressionError("Ungültiger mathematischer Ausdruck")
+        
+        if multiply_operator is None:
+            product = value
+        elif multiply_operator == "*":
+            product = product * value
+        else:
+            if value == 0:
+                raise InvalidExpressionError("Division durch Null")
+            product = product / value
+        expect_operand = False
     
-    if len(tokens) != 1:
+    if expect_operand:
         raise InvalidExpressionError("Ungültiger mathematischer Ausdruck")
     
-    return float(tokens[0])
+    return _add(total, add_operator, product)
+
+
+def _add(total: float, operator: Optional[str], value: float) -> float:
+    """Verrechnet einen fertigen Summanden mit der bisherigen Summe."""
+    if operator is None:
+        return value
+    if operator == "+":
+        return total + value
+    return total - value
 
 
 def main() -> None:
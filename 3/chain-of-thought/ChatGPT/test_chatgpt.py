@@ -0,0 +1,61 @@
+"""
+Testmodul für den Auswerter mathematischer Ausdrücke.
+
+Ergebnisse und Fehlermeldungen werden anhand kleiner Tabellen geprüft,
+auch für Ausdrücke mit mehreren Fehlern, bei denen die Meldung der früheren
+klammerweisen Auswertung erhalten bleiben muss.
+"""
+
+from chatgpt import InvalidExpressionError, evaluate
+
+
+def test_evaluate():
+    """Gültige Ausdrücke liefern die erwarteten Ergebnisse."""
+    for ausdruck, erwartet in [
+        ("3.5 + 4 * (2 - 1)", 7.5),
+        ("2 * 3 + 4 / 2", 8.0),
+        ("(1 + 2) * (3 - 4)", -3.0),
+        ("1 - 2 - 3", -4.0),
+        ("8 / 2 / 2", 2.0),
+        ("((((5))))", 5.0),
+    ]:
+        assert evaluate(ausdruck) == erwartet, ausdruck
+
+
+def test_fehlermeldungen():
+    """Ungültige Ausdrücke melden den erwarteten Fehler."""
+    for ausdruck, meldung in [
+        ("", "Ausdruck ist leer"),
+        ("1a", "Ungültiges Zeichen im Ausdruck: a"),
+        ("(1 + 2", "Unausgeglichene Klammern im Ausdruck"),
+        ("3.5 + 4 * )2 - 1(", "Unausgeglichene Klammern im Ausdruck"),
+        ("()", "Leerer Klammerausdruck"),
+        # Leere Klammern haben Vorrang vor Fehlern außerhalb der Klammern
+        ("1()*1", "Leerer Klammerausdruck"),
+        ("2/2()/", "Leerer Klammerausdruck"),
+        ("..+3()-12", "Leerer Klammerausdruck"),
+        (")/()-3(", "Leerer Klammerausdruck"),
+        ("3.5 + 4 * (2 - )", "Ungültiger mathematischer Ausdruck"),
+        ("3.5 + 4 ** 2", "Ungültiger mathematischer Ausdruck"),
+        ("1 2", "Ungültiger mathematischer Ausdruck"),
+        ("5 / (2 - 2)", "Division durch Null"),
+    ]:
+        try:
+            evaluate(ausdruck)
+        except InvalidExpressionError as fehler:
+            assert str(fehler) == meldung, (ausdruck, str(fehler))
+        else:
+            raise AssertionError(f"'{ausdruck}' muss einen Fehler auslösen")
+
+
+def test_tiefe_verschachtelung():
+    """Tief verschachtelte Klammern kommen ohne Rekursion aus."""
+    tiefe = 10000
+    assert evaluate("(" * tiefe + "1 + 2" + ")" * tiefe) == 3.0
+    assert evaluate("3 - (" * tiefe + "1" + ")" * tiefe) == 1.0
+
+
+if __name__ == "__main__":
+    test_evaluate()
+    test_fehlermeldungen()
+    test_tiefe_verschachtelung()
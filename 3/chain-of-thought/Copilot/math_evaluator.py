@@ -6,7 +6,11 @@ mathematischer Ausdrücke unter Berücksichtigung der Operatorpräzedenz
 und mathematischer Korrektheit.
 """
 
-from typing import Union, List, Optional, Any, Tuple
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, Union, List, Optional, Any, Tuple
+import sys
+import threading
 
 
 # Typdefinitionen für bessere Lesbarkeit
@@ -18,12 +22,20 @@ TokenList = List[Token]
 # Konstanten
 OPERATORS = {'+', '-', '*', '/', '^'}
 PRECEDENCE = {'^': 3, '*': 2, '/': 2, '+': 1, '-': 1}
+CACHE_SIZE = 4096  # Anzahl zwischengespeicherter übersetzter Ausdrücke
+MAX_NESTING_DEPTH = 1000  # Maximale Klammertiefe
+FRAMES_PER_LEVEL = 8  # Stackrahmen je Klammerebene im Parser (höchstens 7 und Reserve)
 
 
 def tokenize(expression: str) -> TokenList:
     """
     Zerlegt einen mathematischen Ausdruck in Tokens (Zahlen, Operatoren, Klammern).
 
+    Zeichen, Klammern und Operatorpositionen werden in einem einzigen
+    Durchlauf geprüft. Treten mehrere Fehler auf, wird derjenige gemeldet,
+    den die Prüfungen in der Reihenfolge aufeinanderfolgende Operatoren,
+    Zahlen und Zeichen, Klammern, Operatorpositionen zuerst finden.
+
     Args:
         expression: Der zu zerlegende mathematische Ausdruck als String
 
@@ -38,33 +50,49 @@ def tokenize(expression: str) -> TokenList:
 
     # Entferne alle Leerzeichen aus dem Ausdruck
     expression = expression.replace(" ", "")
+    length = len(expression)
     
-    # Überprüfung auf ungültige aufeinanderfolgende Operatoren
-    for j in range(len(expression) - 1):
-        if (expression[j] in OPERATORS and 
-            expression[j+1] in OPERATORS and 
-            not (expression[j+1] in '+-' and (j == 0 or expression[j] in '*/^('))):
-            raise ValueError(
-                f"Ungültige aufeinanderfolgende Operatoren: "
-                f"'{expression[j]}{expression[j+1]}'"
-            )
-    
-    tokens = []
+    tokens: TokenList = []
+    # Erster Fehler je Prüfung; gemeldet wird am Ende nach Vorrang
+    character_error: Optional[Exception] = None
+    bracket_error: Optional[str] = None
+    operator_error: Optional[Tuple[int, str]] = None
+    open_brackets = 0
     i = 0
     
-    while i < len(expression):
+    while i < length:
         char = expression[i]
         
+        # Verarbeite Operatoren
+        if char in OPERATORS:
+            # Aufeinanderfolgende Operatoren haben Vorrang vor allen anderen Fehlern
+            if i + 1 < length:
+                following = expression[i+1]
+                if (following in OPERATORS and 
+                    not (following in '+-' and (i == 0 or char in '*/^'))):
+                    raise ValueError(
+                        f"Ungültige aufeinanderfolgende Operatoren: "
+                        f"'{char}{following}'"
+                    )
+            if (operator_error is None and tokens and tokens[-1] == '(' and 
+                char not in '+-'):
+                operator_error = (
+                    len(tokens), f"Operator '{char}' direkt nach öffnender Klammer"
+                )
+            tokens.append(char)
+            i += 1
+        
         # Verarbeite Zahlen (ganze Zahlen und Dezimalzahlen)
-        if char.isdigit() or char == '.':
+        elif char.isdigit() or char == '.':
             j = i
             has_decimal = False
+            error: Optional[Exception] = None
             
             # Extrahiere die vollständige Zahl
-            while j < len(expression) and (expression[j].isdigit() or expression[j] == '.'):
+            while j < length and (expression[j].isdigit() or expression[j] == '.'):
                 if expression[j] == '.':
-                    if has_decimal:
-                        raise ValueError(
+                    if has_decimal and error is None:
+                        error = ValueError(
                             f"Ungültige Zahl: Mehrere Dezimalpunkte in "
                             f"'{expression[i:j+1]}'"
                         )
@@ -72,98 +100,149 @@ def tokenize(expression: str) -> TokenList:
                 j += 1
             
             # Überprüfe spezielle Fehler bei Dezimalzahlen
-            if has_decimal:
+            if error is None and has_decimal:
                 if j > i + 1 and expression[j-1] == '.':
-                    raise ValueError(
+                    error = ValueError(
                         f"Ungültige Zahl: Dezimalpunkt am Ende von "
                         f"'{expression[i:j]}'"
                     )
-                if j == i + 1:
-                    raise ValueError(
+                elif j == i + 1:
+                    error = ValueError(
                         f"Ungültige Zahl: Einzelner Dezimalpunkt an Position {i}"
                     )
             
             # Füge die Zahl als Token hinzu
-            number_str = expression[i:j]
-            tokens.append(float(number_str) if '.' in number_str else int(number_str))
+            if error is None:
+                number_str = expression[i:j]
+                try:
+                    tokens.append(float(number_str) if has_decimal else int(number_str))
+                except ValueError as e:
+                    error = e
+            if error is not None and character_error is None:
+                character_error = error
             i = j
         
-        # Verarbeite Operatoren
-        elif char in OPERATORS:
+        # Verarbeite Klammern
+        elif char == '(':
+            open_brackets += 1
             tokens.append(char)
             i += 1
         
-        # Verarbeite Klammern
-        elif char in '()':
+        elif char == ')':
+            open_brackets -= 1
+            if open_brackets < 0 and bracket_error is None:
+                bracket_error = "Schließende Klammer ohne zugehörige öffnende Klammer"
+            if (operator_error is None and tokens and 
+                isinstance(tokens[-1], str) and tokens[-1] in OPERATORS):
+                operator_error = (
+                    len(tokens) - 1,
+                    f"Operator '{tokens[-1]}' direkt vor schließender Klammer"
+                )
             tokens.append(char)
             i += 1
         
         else:
-            raise ValueError(f"Unbekanntes Zeichen: '{char}' an Position {i}")
+            if character_error is None:
+                character_error = ValueError(
+                    f"Unbekanntes Zeichen: '{char}' an Position {i}"
+                )
+            i += 1
     
-    # Überprüfung auf ausgewogene Klammern
-    check_balanced_brackets(tokens)
+    if character_error is not None:
+        raise character_error
     
-    # Überprüfung auf gültige Operatorpositionen
-    validate_operator_positions(tokens)
+    # Überprüfung auf ausgewogene Klammern
+    if bracket_error is None and open_brackets > 0:
+        bracket_error = "Öffnende Klammer ohne zugehörige schließende Klammer"
+    if bracket_error is not None:
+        raise ValueError(bracket_error)
+    
+    # Überprüfung auf gültige Operatorpositionen; ein Operator am Ende
+    # wird vor den übrigen Fehlern desselben Operators gemeldet
+    last = len(tokens) - 1
+    if (tokens and isinstance(tokens[last], str) and tokens[last] in OPERATORS and 
+        (operator_error is None or operator_error[0] == last)):
+        operator_error = (last, f"Operator '{tokens[last]}' am Ende des Ausdrucks")
+    if operator_error is not None:
+        raise ValueError(operator_error[1])
     
     return tokens
 
 
-def check_balanced_brackets(tokens: TokenList) -> None:
+class CompiledExpression:
     """
-    Überprüft, ob die Klammern im Ausdruck ausgewogen sind.
+    Ein bereits zerlegter und geprüfter Ausdruck, der ohne erneutes
+    Tokenisieren beliebig oft ausgewertet werden kann.
 
-    Args:
-        tokens: Liste der Tokens, die überprüft werden sollen
-
-    Raises:
-        ValueError: Wenn die Klammern nicht ausgewogen sind
+    Attributes:
+        expression: Der ursprüngliche Ausdruck
+        tokens: Die geprüften Tokens des Ausdrucks
     """
-    open_brackets = 0
-    
-    for token in tokens:
-        if token == '(':
-            open_brackets += 1
-        elif token == ')':
-            open_brackets -= 1
-            if open_brackets < 0:
-                raise ValueError(
-                    "Schließende Klammer ohne zugehörige öffnende Klammer"
-                )
-    
-    if open_brackets > 0:
-        raise ValueError(
-            "Öffnende Klammer ohne zugehörige schließende Klammer"
-        )
 
+    def __init__(self, expression: str, tokens: TokenList) -> None:
+        self.expression = expression
+        self.tokens = tokens
+
+    def evaluate(self, debug: bool = False) -> Number:
+        """
+        Wertet den übersetzten Ausdruck aus.
 
-def validate_operator_positions(tokens: TokenList) -> None:
+        Args:
+            debug: Wenn True, werden Zwischenschritte der Auswertung ausgegeben
+
+        Returns:
+            Das Ergebnis der Auswertung als Zahl (int oder float)
+
+        Raises:
+            ValueError: Wenn der Ausdruck mathematisch nicht korrekt ist
+        """
+        if debug:
+            print(f"Tokenisierter Ausdruck: {self.tokens}")
+        try:
+            return evaluate_tokens(self.tokens, debug)
+        except Exception as e:
+            raise _invalid_expression(e)
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.expression!r})"
+
+
+def _invalid_expression(error: Exception) -> ValueError:
+    """Vereinheitlicht einen Fehler zu einem ValueError mit festem Präfix."""
+    error_msg = str(error)
+    if not error_msg.startswith("Mathematisch ungültiger Ausdruck"):
+        error_msg = f"Mathematisch ungültiger Ausdruck: {error_msg}"
+    return ValueError(error_msg)
+
+
+def compile_expression(expression: str) -> CompiledExpression:
     """
-    Überprüft, ob die Operatoren an gültigen Positionen stehen.
+    Zerlegt und prüft einen mathematischen Ausdruck einmalig, damit er
+    anschließend beliebig oft ausgewertet werden kann.
 
     Args:
-        tokens: Liste der Tokens, die überprüft werden sollen
+        expression: Der mathematische Ausdruck als String
+
+    Returns:
+        Der übersetzte Ausdruck
 
     Raises:
-        ValueError: Wenn ein Operator an einer ungültigen Position steht
+        ValueError: Wenn der Ausdruck syntaktisch nicht korrekt ist
     """
-    for i, token in enumerate(tokens):
-        if token in OPERATORS:
-            # Überprüfe, ob der Operator am Ende steht
-            if i == len(tokens) - 1:
-                raise ValueError(f"Operator '{token}' am Ende des Ausdrucks")
-            
-            # Überprüfe spezielle Fälle für Operatoren nach Klammern oder vor Klammern
-            if (i > 0 and tokens[i-1] == '(' and token not in '+-'):
-                raise ValueError(
-                    f"Operator '{token}' direkt nach öffnender Klammer"
-                )
-            
-            if i < len(tokens) - 1 and tokens[i+1] == ')':
-                raise ValueError(
-                    f"Operator '{token}' direkt vor schließender Klammer"
-                )
+    try:
+        tokens = tokenize(expression)
+        
+        # Überprüfe, ob der Ausdruck leer ist
+        if not tokens:
+            raise ValueError("Der Ausdruck darf nicht leer sein")
+    except Exception as e:
+        raise _invalid_expression(e)
+    return CompiledExpression(expression, tokens)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile_cached(normalized: str) -> CompiledExpression:
+    return compile_expression(normalized)
 
 
 def evaluate(expression: str, debug: bool = False) -> Number:
@@ -171,7 +250,9 @@ def evaluate(expression: str, debug: bool = False) -> Number:
     Wertet einen mathematischen Ausdruck aus.
 
     Diese Funktion zerlegt den Ausdruck in Tokens, überprüft dessen
-    mathematische Korrektheit und berechnet das Ergebnis.
+    mathematische Korrektheit und berechnet das Ergebnis. Zerlegte
+    Ausdrücke werden in einem LRU-Cache gehalten; als Schlüssel dient der
+    Ausdruck ohne Leerzeichen, die auch tokenize() als Erstes entfernt.
 
     Args:
         expression: Der auszuwertende mathematische Ausdruck als String
@@ -183,30 +264,231 @@ def evaluate(expression: str, debug: bool = False) -> Number:
     Raises:
         ValueError: Wenn der Ausdruck mathematisch nicht korrekt ist
     """
-    try:
-        tokens = tokenize(expression)
+    if not isinstance(expression, str):
+        # Nicht hashbare oder fremde Eingaben wie bisher über tokenize() melden
+        return compile_expression(expression).evaluate(debug)
+    return _compile_cached(expression.replace(" ", "")).evaluate(debug)
+
+
+# Platzhalter für Teilergebnisse, deren Berechnung fehlgeschlagen ist
+_FAILED = object()
+
+
+class _Level:
+    """
+    Zustand einer Klammerebene während der Auswertung.
+
+    Fehler einer Ebene werden erst an ihrem Ende gemeldet, damit wie bei der
+    früheren schrittweisen Auswertung zuerst alle Klammerausdrücke der Ebene
+    ausgewertet werden und danach unäre Operatoren, fehlende Operatoren und
+    die Berechnungen in absteigender Präzedenz an der Reihe sind.
+    """
+
+    def __init__(self) -> None:
+        self.unary_error: Optional[Exception] = None
+        self.implicit_error: Optional[Exception] = None
+        # Erster Berechnungsfehler je Präzedenz
+        self.operation_errors: dict = {}
+        # Binärer Operator am Anfang der Ebene (wird nie ausgewertet)
+        self.leading_operator: Optional[str] = None
+        # Zuletzt gelesener Operand, für die Meldung fehlender Operatoren
+        self.last_operand: Any = None
+
+
+class _PrattParser:
+    """
+    Pratt-Parser (Precedence Climbing), der eine Token-Liste in einem
+    einzigen Durchlauf per Index auswertet. Alle binären Operatoren sind
+    linksassoziativ; unäres + und - gilt nur für die direkt folgende Zahl
+    bzw. den direkt folgenden Klammerausdruck und bindet daher stärker als ^.
+    Jede Klammerebene wird rekursiv ausgewertet; die Tiefe ist deshalb auf
+    MAX_NESTING_DEPTH begrenzt, für tiefere Ausdrücke hebt evaluate_tokens
+    das Rekursionslimit vorübergehend an.
+    """
+
+    def __init__(self, tokens: TokenList, debug: bool) -> None:
+        self.tokens = tokens
+        self.position = 0
+        self.debug = debug
+
+    def _peek(self) -> Optional[Token]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def parse_level(self, level: int) -> Number:
+        """
+        Wertet eine Klammerebene ab der aktuellen Position bis vor die
+        zugehörige schließende Klammer bzw. bis zum Ende aus.
+        """
+        indent = "  " * level
+        start = self.position
+        if self.debug:
+            print(f"{indent}Auswertung von: {self._level_tokens(start)}")
         
-        if debug:
-            print(f"Tokenisierter Ausdruck: {tokens}")
+        state = _Level()
+        token = self._peek()
+        if isinstance(token, str) and token in OPERATORS and token not in '+-':
+            state.leading_operator = token
+            self.position += 1
+        result = self._expression(state, 1, level)
         
-        # Überprüfe, ob der Ausdruck leer ist
-        if not tokens:
-            raise ValueError("Der Ausdruck darf nicht leer sein")
+        if state.unary_error is not None:
+            raise state.unary_error
+        if state.implicit_error is not None:
+            raise state.implicit_error
+        for precedence_level in range(3, 0, -1):
+            if precedence_level in state.operation_errors:
+                raise state.operation_errors[precedence_level]
+        if state.leading_operator is not None:
+            raise ValueError(
+                f"Ungültiger Ausdruck: Konnte nicht vollständig ausgewertet werden. "
+                f"Übrige Tokens: {[state.leading_operator, result]}"
+            )
+        if not isinstance(result, (int, float)):
+            raise ValueError(f"Ergebnis '{result}' ist keine Zahl")
         
-        result = evaluate_tokens(tokens, debug)
+        if self.debug:
+            print(f"{indent}Finales Ergebnis: {result}")
         return result
-    
-    except Exception as e:
-        # Fange alle Fehler ab und gebe einen einheitlichen Fehlertyp zurück
-        error_msg = str(e)
-        if not error_msg.startswith("Mathematisch ungültiger Ausdruck"):
-            error_msg = f"Mathematisch ungültiger Ausdruck: {error_msg}"
-        raise ValueError(error_msg)
+
+    def _level_tokens(self, start: int) -> TokenList:
+        """Tokens der Ebene ab `start`, nur für Debug-Ausgaben."""
+        depth = 0
+        for end in range(start, len(self.tokens)):
+            if self.tokens[end] == '(':
+                depth += 1
+            elif self.tokens[end] == ')':
+                depth -= 1
+                if depth < 0:
+                    return self.tokens[start:end]
+        return self.tokens[start:]
+
+    def _expression(self, state: _Level, min_precedence: int, level: int) -> Any:
+        """Liest Operanden und Operatoren mit mindestens `min_precedence`."""
+        left = self._prefix(state, level)
+        while True:
+            token = self._peek()
+            if token is None or token == ')':
+                return left
+            if isinstance(token, str) and token in OPERATORS:
+                precedence = PRECEDENCE[token]
+                if precedence < min_precedence:
+                    return left
+                self.position += 1
+                right = self._expression(state, precedence + 1, level)
+                left = self._apply(state, left, token, right, level)
+            elif isinstance(token, (int, float)) or token == '(':
+                # Zwei Operanden ohne Operator dazwischen
+                previous = state.last_operand
+                operand = self._operand(level)
+                if state.implicit_error is None:
+                    state.implicit_error = ValueError(
+                        f"Fehlender Operator zwischen {previous} und {operand}"
+                    )
+                state.last_operand = operand
+                left = _FAILED
+            else:
+                raise ValueError(f"Unbekannter Operator: {token}")
+
+    def _prefix(self, state: _Level, level: int) -> Any:
+        """Liest einen Operanden, gegebenenfalls mit unärem Operator."""
+        token = self._peek()
+        if isinstance(token, str) and token in '+-':
+            self.position += 1
+            following = self._peek()
+            if isinstance(following, (int, float)) or following == '(':
+                value = self._operand(level)
+                if token == '-':
+                    value = -value
+                if self.debug:
+                    print(f"{'  ' * level}Unärer Operator '{token}' ergibt {value}")
+            else:
+                if state.unary_error is None:
+                    state.unary_error = ValueError(
+                        f"Unärer Operator '{token}' ohne nachfolgende Zahl"
+                    )
+                if following is not None and following != ')':
+                    self._prefix(state, level)
+                value = _FAILED
+            state.last_operand = value
+            return value
+        if isinstance(token, (int, float)) or token == '(':
+            value = self._operand(level)
+            state.last_operand = value
+            return value
+        operator = self.tokens[self.position - 1] if self.position > 0 else token
+        raise ValueError(f"Ungültige Verwendung des Operators {operator}")
+
+    def _operand(self, level: int) -> Number:
+        """Liest eine Zahl oder wertet einen Klammerausdruck vollständig aus."""
+        token = self.tokens[self.position]
+        self.position += 1
+        if token != '(':
+            return token
+        if self._peek() == ')':
+            raise ValueError("Leerer Klammerausdruck")
+        if level >= MAX_NESTING_DEPTH:
+            raise ValueError(f"Klammern zu tief verschachtelt (höchstens {MAX_NESTING_DEPTH} Ebenen)")
+        value = self.parse_level(level + 1)
+        if self._peek() != ')':
+            raise ValueError("Öffnende Klammer ohne zugehörige schließende Klammer")
+        self.position += 1
+        return value
+
+    def _apply(self, state: _Level, left: Any, operator: str, right: Any, level: int) -> Any:
+        """Berechnet eine Operation; Fehler werden bis zum Ende der Ebene zurückgestellt."""
+        if left is _FAILED or right is _FAILED:
+            return _FAILED
+        if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+            # z. B. komplexe Zwischenergebnisse aus Potenzen negativer Zahlen
+            state.operation_errors.setdefault(
+                PRECEDENCE[operator],
+                ValueError(f"Ungültige Verwendung des Operators {operator}")
+            )
+            return _FAILED
+        try:
+            result = calculate_operation(left, operator, right)
+        except Exception as e:
+            state.operation_errors.setdefault(PRECEDENCE[operator], e)
+            return _FAILED
+        if self.debug:
+            print(f"{'  ' * level}Berechne: {left} {operator} {right} = {result}")
+        return result
+
+
+# Gemeinsam angehobenes Rekursionslimit für tief verschachtelte Ausdrücke
+_recursion_lock = threading.Lock()
+_recursion_users = 0
+_recursion_limit = 0
+
+
+@contextmanager
+def _recursion_headroom(frames: int) -> Iterator[None]:
+    """
+    Hebt das Rekursionslimit für die Dauer des Blocks um `frames` Rahmen an.
+
+    Das ursprüngliche Limit wird erst wiederhergestellt, wenn kein Thread
+    mehr einen tief verschachtelten Ausdruck auswertet.
+    """
+    global _recursion_users, _recursion_limit
+    with _recursion_lock:
+        if _recursion_users == 0:
+            _recursion_limit = sys.getrecursionlimit()
+        _recursion_users += 1
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), _recursion_limit + frames))
+    try:
+        yield
+    finally:
+        with _recursion_lock:
+            _recursion_users -= 1
+            if _recursion_users == 0:
+                sys.setrecursionlimit(_recursion_limit)
 
 
 def evaluate_tokens(tokens: TokenList, debug: bool = False, level: int = 0) -> Number:
     """
-    Wertet eine Liste von Tokens rekursiv aus und führt Teilergebnisse zusammen.
+    Wertet eine Liste von Tokens mit einem Pratt-Parser in einem Durchlauf aus.
 
     Args:
         tokens: Die Liste der auszuwertenden Tokens
@@ -219,8 +501,6 @@ def evaluate_tokens(tokens: TokenList, debug: bool = False, level: int = 0) -> N
     Raises:
         ValueError: Wenn die Token-Liste nicht korrekt ausgewertet werden kann
     """
-    indent = "  " * level
-    
     # Basisfall: Leere Token-Liste
     if not tokens:
         raise ValueError("Leerer Ausdruck")
@@ -234,210 +514,28 @@ def evaluate_tokens(tokens: TokenList, debug: bool = False, level: int = 0) -> N
                 f"Einzelner Token '{tokens[0]}' kann nicht ausgewertet werden"
             )
     
-    if debug:
-        print(f"{indent}Auswertung von: {tokens}")
-    
-    # Kopiere Tokens, um die Originalliste nicht zu verändern
-    tokens = tokens.copy()
-    
-    # Schritt 1: Klammern auswerten
-    tokens = evaluate_brackets(tokens, debug, level)
-    
-    # Schritt 2: Unäre Operatoren auswerten
-    tokens = evaluate_unary_operators(tokens, debug, level)
-    
-    # Schritt 3: Implizite Multiplikation überprüfen
-    check_implicit_multiplication(tokens)
-    
-    # Schritt 4: Operatoren in Reihenfolge ihrer Präzedenz auswerten
-    for precedence_level in range(3, 0, -1):
-        tokens = evaluate_operators_by_precedence(
-            tokens, precedence_level, debug, level
-        )
-    
-    # Nach der Auswertung sollte nur noch ein Token übrig sein
-    if len(tokens) != 1:
+    parser = _PrattParser(tokens, debug)
+    try:
+        # Flache Ausdrücke kommen mit dem normalen Limit aus; die Anzahl der
+        # öffnenden Klammern begrenzt die Tiefe nach oben
+        levels = min(tokens.count('('), MAX_NESTING_DEPTH)
+        if levels * FRAMES_PER_LEVEL < sys.getrecursionlimit() // 4:
+            result = parser.parse_level(level)
+        else:
+            with _recursion_headroom(levels * FRAMES_PER_LEVEL):
+                result = parser.parse_level(level)
+    except RecursionError:
+        # Nur möglich, wenn der Aufrufer selbst schon tief im Stack steckt
+        raise ValueError("Ausdruck zu tief verschachtelt")
+    
+    # Nach der Auswertung dürfen keine Tokens übrig sein
+    if parser.position != len(tokens):
         raise ValueError(
             f"Ungültiger Ausdruck: Konnte nicht vollständig ausgewertet werden. "
-            f"Übrige Tokens: {tokens}"
+            f"Übrige Tokens: {tokens[parser.position:]}"
         )
     
-    if not isinstance(tokens[0], (int, float)):
-        raise ValueError(f"Ergebnis '{tokens[0]}' ist keine Zahl")
-    
-    if debug:
-        print(f"{indent}Finales Ergebnis: {tokens[0]}")
-    
-    return tokens[0]
-
-
-def evaluate_brackets(tokens: TokenList, debug: bool, level: int) -> TokenList:
-    """
-    Findet und wertet alle Klammerausdrücke in den Tokens aus.
-    
-    Args:
-        tokens: Die zu verarbeitende Token-Liste
-        debug: Debug-Modus aktivieren/deaktivieren
-        level: Aktuelle Rekursionsebene
-        
-    Returns:
-        Die aktualisierte Token-Liste mit ausgewerteten Klammerausdrücken
-    """
-    indent = "  " * level
-    i = 0
-    
-    while i < len(tokens):
-        if tokens[i] == '(':
-            # Suche die schließende Klammer
-            open_brackets = 1
-            j = i + 1
-            
-            while j < len(tokens) and open_brackets > 0:
-                if tokens[j] == '(':
-                    open_brackets += 1
-                elif tokens[j] == ')':
-                    open_brackets -= 1
-                j += 1
-            
-            # Überprüfe, ob der Klammerinhalt leer ist
-            if j - i == 2:
-                raise ValueError("Leerer Klammerausdruck")
-            
-            # Extrahiere den Klammerinhalt
-            bracket_content = tokens[i+1:j-1]
-            
-            if debug:
-                print(f"{indent}Klammerinhalt gefunden: {bracket_content}")
-            
-            # Rekursiver Aufruf für den Klammerinhalt
-            sub_result = evaluate_tokens(bracket_content, debug, level + 1)
-            
-            if debug:
-                print(
-                    f"{indent}Klammerausdruck {bracket_content} = {sub_result}"
-                )
-            
-            # Ersetze den Klammerausdruck durch sein Ergebnis
-            tokens = tokens[:i] + [sub_result] + tokens[j:]
-            
-            if debug:
-                print(f"{indent}Nach Ersetzung: {tokens}")
-        else:
-            i += 1
-    
-    return tokens
-
-
-def evaluate_unary_operators(tokens: TokenList, debug: bool, level: int) -> TokenList:
-    """
-    Wertet unäre Operatoren (+ und -) in der Token-Liste aus.
-    
-    Args:
-        tokens: Die zu verarbeitende Token-Liste
-        debug: Debug-Modus aktivieren/deaktivieren
-        level: Aktuelle Rekursionsebene
-        
-    Returns:
-        Die aktualisierte Token-Liste mit ausgewerteten unären Operatoren
-    """
-    indent = "  " * level
-    i = 0
-    
-    while i < len(tokens):
-        if (tokens[i] in '+-' and 
-            (i == 0 or tokens[i-1] in OPERATORS or tokens[i-1] == '(')):
-            if i + 1 < len(tokens) and isinstance(tokens[i+1], (int, float)):
-                if tokens[i] == '-':
-                    tokens[i+1] = -tokens[i+1]
-                # Entferne den unären Operator
-                tokens.pop(i)
-                
-                if debug:
-                    print(
-                        f"{indent}Nach Auswertung des unären Operators: {tokens}"
-                    )
-            else:
-                raise ValueError(
-                    f"Unärer Operator '{tokens[i]}' ohne nachfolgende Zahl"
-                )
-        else:
-            i += 1
-    
-    return tokens
-
-
-def check_implicit_multiplication(tokens: TokenList) -> None:
-    """
-    Überprüft auf implizite Multiplikation (fehlende Operatoren zwischen Zahlen).
-    
-    Args:
-        tokens: Die zu überprüfende Token-Liste
-        
-    Raises:
-        ValueError: Wenn eine implizite Multiplikation gefunden wird
-    """
-    for i in range(len(tokens) - 1):
-        if (isinstance(tokens[i], (int, float)) and 
-            isinstance(tokens[i+1], (int, float))):
-            raise ValueError(
-                f"Fehlender Operator zwischen {tokens[i]} und {tokens[i+1]}"
-            )
-
-
-def evaluate_operators_by_precedence(
-    tokens: TokenList, precedence_level: int, debug: bool, level: int
-) -> TokenList:
-    """
-    Wertet alle Operatoren mit einer bestimmten Präzedenz aus.
-    
-    Args:
-        tokens: Die zu verarbeitende Token-Liste
-        precedence_level: Präzedenzebene der auszuwertenden Operatoren
-        debug: Debug-Modus aktivieren/deaktivieren
-        level: Aktuelle Rekursionsebene
-        
-    Returns:
-        Die aktualisierte Token-Liste mit ausgewerteten Operatoren
-    """
-    indent = "  " * level
-    i = 1
-    
-    while i < len(tokens):
-        if (tokens[i] in OPERATORS and 
-            PRECEDENCE.get(tokens[i], 0) == precedence_level):
-            
-            operator = tokens[i]
-            
-            # Überprüfe auf gültige Operanden
-            if (i-1 < 0 or i+1 >= len(tokens) or 
-                not isinstance(tokens[i-1], (int, float)) or 
-                not isinstance(tokens[i+1], (int, float))):
-                raise ValueError(
-                    f"Ungültige Verwendung des Operators {operator}"
-                )
-            
-            left = tokens[i-1]
-            right = tokens[i+1]
-            
-            # Berechne das Ergebnis basierend auf dem Operator
-            result = calculate_operation(left, operator, right)
-            
-            if debug:
-                print(f"{indent}Berechne: {left} {operator} {right} = {result}")
-            
-            # Ersetze die Operation durch ihr Ergebnis
-            tokens = tokens[:i-1] + [result] + tokens[i+2:]
-            
-            if debug:
-                print(
-                    f"{indent}Nach Auswertung von '{operator}': {tokens}"
-                )
-            
-            i = 1  # Starte wieder von vorne
-        else:
-            i += 1
-    
-    return tokens
+    return result
 
 
 def calculate_operation(left: Number, operator: str, right: Number) -> Number:
@@ -0,0 +1,82 @@
+"""
+Testmodul für den Auswerter mathematischer Ausdrücke.
+
+Ergebnisse und Fehlermeldungen werden anhand kleiner Tabellen geprüft,
+darunter tief verschachtelte Klammern, die der frühere Auswerter verarbeitet
+hat.
+"""
+
+import sys
+
+from math_evaluator import MAX_NESTING_DEPTH, evaluate
+
+PREFIX = "Mathematisch ungültiger Ausdruck: "
+
+
+def _verschachtelt(tiefe, innen="1", vor=""):
+    """Ausdruck mit `tiefe` Klammerebenen, vor jeder Ebene steht `vor`."""
+    return (vor + "(") * tiefe + innen + ")" * tiefe
+
+
+def test_evaluate():
+    """Gültige Ausdrücke liefern die erwarteten Ergebnisse."""
+    for ausdruck, erwartet in [
+        ("2 + 3 * 4", 14),
+        ("10 / (4 - 2)", 5.0),
+        ("2^3^2", 64),
+        ("-(2+3)", -5),
+        ("2 * -3", -6),
+        ("(7 + 3) * (5 - 2)", 30),
+        (".5 + 2", 2.5),
+    ]:
+        assert evaluate(ausdruck) == erwartet, ausdruck
+
+
+def test_fehlermeldungen():
+    """Ungültige Ausdrücke melden den erwarteten Fehler."""
+    for ausdruck, meldung in [
+        ("", "Der Ausdruck darf nicht leer sein"),
+        ("2 + * 3", "Ungültige aufeinanderfolgende Operatoren: '+*'"),
+        ("(2 + 3", "Öffnende Klammer ohne zugehörige schließende Klammer"),
+        ("2 +", "Operator '+' am Ende des Ausdrucks"),
+        ("2..5", "Ungültige Zahl: Mehrere Dezimalpunkte in '2..'"),
+        ("()", "Leerer Klammerausdruck"),
+        ("5 / (2-2)", "Division durch Null"),
+        ("2 + (3 *)", "Operator '*' direkt vor schließender Klammer"),
+        ("2 $ 3", "Unbekanntes Zeichen: '$' an Position 1"),
+    ]:
+        try:
+            evaluate(ausdruck)
+        except ValueError as fehler:
+            assert str(fehler) == PREFIX + meldung, (ausdruck, str(fehler))
+        else:
+            raise AssertionError(f"'{ausdruck}' muss einen Fehler auslösen")
+
+
+def test_tiefe_verschachtelung():
+    """Tiefe Klammern werden bis MAX_NESTING_DEPTH ausgewertet, auch mit Operatoren je Ebene."""
+    limit = sys.getrecursionlimit()
+    for tiefe, ausdruck, erwartet in [
+        (101, _verschachtelt(101), 1),
+        (150, _verschachtelt(150, "1+2"), 3),
+        (300, _verschachtelt(300, "2", vor="-"), 2),
+        (300, _verschachtelt(300, "1", vor="1+2*1^"), 3),
+        (MAX_NESTING_DEPTH, _verschachtelt(MAX_NESTING_DEPTH), 1),
+    ]:
+        assert evaluate(ausdruck) == erwartet, tiefe
+    # Das Rekursionslimit wird nach der Auswertung wiederhergestellt
+    assert sys.getrecursionlimit() == limit
+
+    try:
+        evaluate(_verschachtelt(MAX_NESTING_DEPTH + 1))
+    except ValueError as fehler:
+        assert str(fehler) == (PREFIX + "Klammern zu tief verschachtelt "
+                               f"(höchstens {MAX_NESTING_DEPTH} Ebenen)")
+    else:
+        raise AssertionError("Zu tiefe Klammern müssen einen Fehler auslösen")
+
+
+if __name__ == "__main__":
+    test_evaluate()
+    test_fehlermeldungen()
+    test_tiefe_verschachtelung()
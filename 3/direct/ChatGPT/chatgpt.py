@@ -1,53 +1,96 @@
 import ast
 import operator
+from functools import lru_cache
 
-def evaluate(expression: str) -> float:
+# Definierte erlaubte Operatoren
+allowed_operators = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv
+}
+
+# Anzahl übersetzter Ausdrücke, die evaluate() zwischenspeichert
+CACHE_SIZE = 4096
+
+def eval_node(node):
+    """Wertet einen Knoten des AST rekursiv aus."""
+    if isinstance(node, ast.BinOp):
+        # Rekursive Auswertung des linken und rechten Ausdrucks
+        left_val = eval_node(node.left)
+        right_val = eval_node(node.right)
+        op_type = type(node.op)
+        if op_type in allowed_operators:
+            return allowed_operators[op_type](left_val, right_val)
+        else:
+            raise ValueError(f"Operator {op_type} nicht erlaubt")
+    elif isinstance(node, ast.UnaryOp):
+        # Unterstützung für unäre Plus- und Minusoperatoren
+        if isinstance(node.op, ast.UAdd):
+            return +eval_node(node.operand)
+        elif isinstance(node.op, ast.USub):
+            return -eval_node(node.operand)
+        else:
+            raise ValueError("Unärer Operator nicht erlaubt")
+    elif isinstance(node, ast.Num):  # Für Python-Versionen vor 3.8
+        return node.n
+    elif isinstance(node, ast.Constant):  # Für Python 3.8 und höher
+        if isinstance(node.value, (int, float)):
+            return node.value
+        else:
+            raise ValueError("Nur int und float als Konstanten erlaubt")
+    else:
+        raise ValueError("Nicht unterstützter Ausdruckstyp")
+
+class CompiledExpression:
     """
-    Wandelt einen mathematischen Ausdruck in einen AST um und wertet diesen
-    rekursiv aus. Erlaubt werden die Operatoren +, -, * und / sowie Klammern.
+    Ein einmal geparster Ausdruck. Der AST wird beim Auswerten nur noch
+    durchlaufen, ohne den Ausdruck erneut zu parsen.
     """
-    # Definierte erlaubte Operatoren
-    allowed_operators = {
-        ast.Add: operator.add,
-        ast.Sub: operator.sub,
-        ast.Mult: operator.mul,
-        ast.Div: operator.truediv
-    }
 
-    def eval_node(node):
-        if isinstance(node, ast.BinOp):
-            # Rekursive Auswertung des linken und rechten Ausdrucks
-            left_val = eval_node(node.left)
-            right_val = eval_node(node.right)
-            op_type = type(node.op)
-            if op_type in allowed_operators:
-                return allowed_operators[op_type](left_val, right_val)
-            else:
-                raise ValueError(f"Operator {op_type} nicht erlaubt")
-        elif isinstance(node, ast.UnaryOp):
-            # Unterstützung für unäre Plus- und Minusoperatoren
-            if isinstance(node.op, ast.UAdd):
-                return +eval_node(node.operand)
-            elif isinstance(node.op, ast.USub):
-                return -eval_node(node.operand)
-            else:
-                raise ValueError("Unärer Operator nicht erlaubt")
-        elif isinstance(node, ast.Num):  # Für Python-Versionen vor 3.8
-            return node.n
-        elif isinstance(node, ast.Constant):  # Für Python 3.8 und höher
-            if isinstance(node.value, (int, float)):
-                return node.value
-            else:
-                raise ValueError("Nur int und float als Konstanten erlaubt")
-        else:
-            raise ValueError("Nicht unterstützter Ausdruckstyp")
-    
+    def __init__(self, expression: str, tree: ast.AST) -> None:
+        self.expression = expression
+        self.tree = tree
+
+    def evaluate(self) -> float:
+        try:
+            return eval_node(self.tree)
+        except Exception as e:
+            raise ValueError(f"Ungültiger Ausdruck: {self.expression}") from e
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.expression!r})"
+
+def compile_expression(expression: str) -> CompiledExpression:
+    """
+    Parst einen mathematischen Ausdruck einmalig in einen AST, der danach
+    beliebig oft mit evaluate() des Ergebnisses ausgewertet werden kann.
+    """
     try:
         # Parse den Ausdruck im "eval"-Modus
         parsed_expr = ast.parse(expression, mode='eval')
-        return eval_node(parsed_expr.body)
     except Exception as e:
         raise ValueError(f"Ungültiger Ausdruck: {expression}") from e
+    return CompiledExpression(expression, parsed_expr.body)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile_cached(normalized: str) -> CompiledExpression:
+    return compile_expression(normalized)
+
+def evaluate(expression: str) -> float:
+    """
+    Wandelt einen mathematischen Ausdruck in einen AST um und wertet diesen
+    rekursiv aus. Erlaubt werden die Operatoren +, -, * und / sowie Klammern.
+
+    Geparste Ausdrücke werden in einem LRU-Cache gehalten. Schlüssel und
+    geparster Text ist der Ausdruck mit vereinheitlichten Leerzeichen, so
+    dass auch Einrückungen und Zeilenumbrüche im Ausdruck erlaubt sind.
+    Fehlermeldungen nennen den Ausdruck wie übergeben.
+    """
+    try:
+        return _compile_cached(" ".join(expression.split())).evaluate()
+    except ValueError as e:
+        raise ValueError(f"Ungültiger Ausdruck: {expression}") from e.__cause__
 
 # Beispiel:
 print(evaluate("3 + (2 * (1 * 1))"))  # Ausgabe: 7
@@ -0,0 +1,74 @@
+"""
+Vergleicht die Auswertung über evaluate_postfix mit den per
+postfix_to_function übersetzten Python-Funktionen.
+
+Gemessen werden zwei Lasten:
+  - skalar: konstante Ausdrücke ohne Variablen, wiederholt ausgewertet
+  - variablen: eine Formel mit Variablen, ausgewertet für viele Belegungen
+Zusätzlich werden die einmaligen Kosten der Übersetzung ausgegeben.
+
+Achtung: Bei der Last "skalar" faltet CPython die Konstanten schon beim
+compile() der übersetzten Funktion, die dann nur noch ein fertiges
+Ergebnis zurückgibt. Der Faktor dort zeigt also die Ersparnis gegenüber
+wiederholter Auswertung, nicht die Geschwindigkeit der Arithmetik; dafür
+ist die Last "variablen" maßgeblich.
+
+Beispiel:
+    python benchmark.py --repeat 200000
+"""
+
+import argparse
+import random
+import time
+
+from expression_evaluator import evaluate_postfix, infix_to_postfix, is_variable, postfix_to_function, tokenize
+
+SCALAR_EXPRESSIONS = [
+    "3 + (2 * (1 + 1))",
+    "3 * (4 + 2) / 3 - 1",
+    "((1.5 + 2.5) * (3 - 1) / 4 + 7) * (8 - 2 / 4)",
+]
+
+VARIABLE_EXPRESSIONS = [
+    "(a + b) * 2 / c",
+    "a * x * x + b * x + c",
+    "(preis * menge - rabatt) * (1 + steuer) / menge",
+]
+
+def _measure(function, arguments: list) -> float:
+    """Laufzeit in Mikrosekunden je Aufruf von function(argument)."""
+    start = time.perf_counter()
+    for argument in arguments:
+        function(argument)
+    return (time.perf_counter() - start) / len(arguments) * 1e6
+
+def _bindings(names: list, count: int, rng: random.Random) -> list:
+    """Zufällige Variablenbelegungen ohne Nullwerte."""
+    return [{name: rng.uniform(1, 100) for name in names} for _ in range(count)]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=100000, help="Auswertungen je Ausdruck")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(f"{'Last':<10} {'Ausdruck':<50} {'Stack µs':>9} {'Funktion µs':>12} {'Faktor':>7} {'compile µs':>11}")
+    workloads = [("skalar", SCALAR_EXPRESSIONS), ("variablen", VARIABLE_EXPRESSIONS)]
+    for workload, expressions in workloads:
+        for expression in expressions:
+            postfix = infix_to_postfix(tokenize(expression))
+            names = list(dict.fromkeys(token for token in postfix if is_variable(token)))
+            bindings = _bindings(names, args.repeat, rng) if names else [{}] * args.repeat
+
+            start = time.perf_counter()
+            function = postfix_to_function(postfix)
+            compile_time = (time.perf_counter() - start) * 1e6
+
+            stack = _measure(lambda variables: evaluate_postfix(postfix, variables), bindings)
+            compiled = _measure(function, bindings)
+            print(f"{workload:<10} {expression:<50} {stack:>9.3f} {compiled:>12.3f} "
+                  f"{stack / compiled:>6.1f}x {compile_time:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,25 @@
 """
 Modul zur Auswertung mathematischer Ausdrücke.
-Unterstützt die Operationen +, -, *, / und Klammern.
+Unterstützt die Operationen +, -, *, /, Klammern und benannte Variablen.
 """
 
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from functools import lru_cache, partial
+from itertools import islice
+import math
+import os
+
+try:
+    import numpy as np
+except ImportError:  # nur für evaluate_vectorized nötig
+    np = None
+
+# Anzahl übersetzter Ausdrücke, die evaluate() zwischenspeichert
+CACHE_SIZE = 4096
+
+# Ab so vielen Auswertungen wird ein Ausdruck zu einer Python-Funktion übersetzt
+COMPILE_THRESHOLD = 64
+
 def tokenize(expression: str) -> list:
     """Konvertiert einen Ausdruck in eine Liste von Tokens."""
     tokens = []
@@ -31,11 +48,24 @@ def tokenize(expression: str) -> list:
             i += 1
             continue
         
+        # Variablennamen
+        if char.isalpha() or char == '_':
+            j = i
+            while j < len(expression) and (expression[j].isalnum() or expression[j] == '_'):
+                j += 1
+            tokens.append(expression[i:j])
+            i = j
+            continue
+        
         # Ungültiges Zeichen
         raise ValueError(f"Ungültiges Zeichen im Ausdruck: {char}")
     
     return tokens
 
+def is_variable(token) -> bool:
+    """Prüft, ob ein Token ein Variablenname ist."""
+    return isinstance(token, str) and (token[0].isalpha() or token[0] == '_')
+
 def infix_to_postfix(tokens: list) -> list:
     """Konvertiert Infix-Notation zu Postfix-Notation mit dem Shunting-Yard-Algorithmus."""
     precedence = {'+': 1, '-': 1, '*': 2, '/': 2}
@@ -43,8 +73,8 @@ def infix_to_postfix(tokens: list) -> list:
     operators = []
     
     for token in tokens:
-        # Wenn Token eine Zahl ist, füge sie zur Ausgabe hinzu
-        if isinstance(token, float):
+        # Wenn Token eine Zahl oder Variable ist, füge sie zur Ausgabe hinzu
+        if isinstance(token, float) or is_variable(token):
             output.append(token)
         
         # Wenn Token ein Operator ist
@@ -76,8 +106,8 @@ def infix_to_postfix(tokens: list) -> list:
     
     return output
 
-def evaluate_postfix(postfix: list) -> float:
-    """Wertet einen Postfix-Ausdruck aus."""
+def evaluate_postfix(postfix: list, variables: dict = None) -> float:
+    """Wertet einen Postfix-Ausdruck mit den Werten aus `variables` aus."""
     stack = []
     
     for token in postfix:
@@ -85,6 +115,12 @@ def evaluate_postfix(postfix: list) -> float:
         if isinstance(token, float):
             stack.append(token)
         
+        # Wenn Token eine Variable ist, lege ihren Wert auf den Stack
+        elif is_variable(token):
+            if variables is None or token not in variables:
+                raise ValueError(f"Unbekannte Variable: {token}")
+            stack.append(variables[token])
+        
         # Wenn Token ein Operator ist
         elif token in '+-*/':
             if len(stack) < 2:
@@ -110,12 +146,132 @@ def evaluate_postfix(postfix: list) -> float:
     
     return stack[0]
 
-def evaluate(expression: str) -> float:
+def postfix_to_function(postfix: list):
+    """
+    Übersetzt einen Postfix-Ausdruck in eine Python-Funktion f(variables).
+    
+    Für jeden Operator wird eine Zuweisung an eine lokale Variable erzeugt,
+    Variablen werden beim ersten Auftreten einmal aus `variables` gelesen.
+    Der Quelltext wird mit compile() in einem Namensraum ohne Builtins
+    ausgeführt. Da die Anweisungen der Reihenfolge des Postfix-Ausdrucks
+    folgen, liefert die Funktion dieselben Ergebnisse und Fehler wie
+    evaluate_postfix. Für ungültige Postfix-Ausdrücke wird None geliefert.
+    """
+    lines = []
+    stack = []
+    names = {}
+    
+    for token in postfix:
+        if isinstance(token, float):
+            stack.append(repr(token) if math.isfinite(token) else "_inf")
+        elif is_variable(token):
+            if token not in names:
+                names[token] = f"_v{len(names)}"
+                lines.append(f"{names[token]} = variables[{token!r}]")
+            stack.append(names[token])
+        elif token in '+-*/':
+            if len(stack) < 2:
+                return None
+            b = stack.pop()
+            a = stack.pop()
+            if token == '/':
+                # Explizit wie evaluate_postfix: NumPy-Skalare liefern inf statt einer Ausnahme
+                lines.append(f"if {b} == 0: raise ValueError('Division durch Null')")
+            stack.append(f"_t{len(lines)}")
+            lines.append(f"{stack[-1]} = {a} {token} {b}")
+    
+    if len(stack) != 1:
+        return None
+    
+    lines.append(f"return {stack[0]}")
+    source = (
+        "def _compiled(variables):\n"
+        "    try:\n"
+        + "".join(f"        {line}\n" for line in lines) +
+        "    except KeyError as error:\n"
+        "        raise ValueError(f'Unbekannte Variable: {error.args[0]}') from None\n"
+    )
+    namespace = {
+        "__builtins__": {},
+        "ValueError": ValueError,
+        "KeyError": KeyError,
+        "_inf": math.inf,
+    }
+    exec(compile(source, "<expression>", "exec"), namespace)
+    return namespace["_compiled"]
+
+class CompiledExpression:
+    """
+    Ein übersetzter Ausdruck in Postfix-Notation, der ohne erneutes
+    Tokenisieren und Umwandeln beliebig oft ausgewertet werden kann.
+    
+    Nach COMPILE_THRESHOLD Auswertungen wird der Ausdruck zusätzlich mit
+    postfix_to_function in eine Python-Funktion übersetzt, die danach
+    anstelle von evaluate_postfix verwendet wird. Selten ausgewertete
+    Ausdrücke sparen so die Kosten von compile().
+    """
+    
+    def __init__(self, expression: str, postfix: list) -> None:
+        self.expression = expression
+        self.postfix = postfix
+        # Namen der Variablen in der Reihenfolge ihres ersten Auftretens
+        self.variables = list(dict.fromkeys(token for token in postfix if is_variable(token)))
+        self._function = None
+        self._evaluations = 0
+    
+    def to_function(self):
+        """Liefert die übersetzte Funktion f(variables) und erzeugt sie bei Bedarf."""
+        if self._function is None:
+            function = postfix_to_function(self.postfix)
+            # Ungültige Ausdrücke melden ihren Fehler weiterhin über evaluate_postfix
+            self._function = function or partial(evaluate_postfix, self.postfix)
+        return self._function
+    
+    def evaluate(self, variables: dict = None) -> float:
+        """Wertet den übersetzten Ausdruck mit den Werten aus `variables` aus."""
+        if self._function is not None:
+            result = self._function({} if variables is None else variables)
+        elif self._evaluations < COMPILE_THRESHOLD:
+            self._evaluations += 1
+            result = evaluate_postfix(self.postfix, variables)
+        else:
+            result = self.to_function()({} if variables is None else variables)
+        
+        # Wenn das Ergebnis ganzzahlig ist, gib es als Integer zurück
+        if result == int(result):
+            return int(result)
+        return result
+    
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.expression!r})"
+
+def compile_expression(expression: str) -> CompiledExpression:
+    """
+    Übersetzt einen Ausdruck einmalig in Postfix-Notation.
+    
+    Beispiel:
+        >>> formel = compile_expression("3 + (2 * (1 + 1))")
+        >>> formel.evaluate()
+        7
+    """
+    return CompiledExpression(expression, infix_to_postfix(tokenize(expression)))
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile_cached(normalized: str) -> CompiledExpression:
+    return compile_expression(normalized)
+
+def evaluate(expression: str, variables: dict = None) -> float:
     """
     Wertet einen mathematischen Ausdruck mit +, -, *, / und Klammern aus.
+    Variablen im Ausdruck werden durch ihre Werte aus `variables` ersetzt.
+    
+    Übersetzte Ausdrücke werden in einem LRU-Cache mit CACHE_SIZE Einträgen
+    gehalten. Da Leerzeichen nur Tokens trennen, wird der Ausdruck mit
+    vereinheitlichten Leerzeichen als Schlüssel verwendet.
     
     Args:
         expression: Ein String, der den mathematischen Ausdruck enthält
+        variables: Werte der Variablen im Ausdruck, z. B. {"a": 2}
         
     Returns:
         Das Ergebnis der Auswertung als Zahl
@@ -124,11 +280,155 @@ def evaluate(expression: str) -> float:
         >>> evaluate("3 + (2 * (1 + 1))")
         7
     """
-    tokens = tokenize(expression)
-    postfix = infix_to_postfix(tokens)
-    result = evaluate_postfix(postfix)
-    
-    # Wenn das Ergebnis ganzzahlig ist, gib es als Integer zurück
-    if result == int(result):
-        return int(result)
-    return result
\ No newline at end of file
+    return _compile_cached(" ".join(expression.split())).evaluate(variables)
+
+def _evaluate_chunk(expressions: list, variables: dict = None) -> list:
+    """Wertet einen Block von Ausdrücken aus; Fehler werden als Wert geliefert."""
+    results = []
+    for expression in expressions:
+        try:
+            results.append(evaluate(expression, variables))
+        except Exception as error:
+            results.append(error)
+    return results
+
+def evaluate_chunks(expressions, workers: int = None, chunksize: int = 1000,
+                    variables: dict = None, ordered: bool = True):
+    """
+    Wertet viele Ausdrücke in Blöcken von `chunksize` Ausdrücken parallel
+    in `workers` Prozessen aus (Standard: Anzahl der CPU-Kerne) und liefert
+    je Block ein Paar (Position des ersten Ausdrucks, Ergebnisse).
+    
+    Mit ordered=True kommen die Blöcke in der Reihenfolge der Eingabe,
+    sonst in der Reihenfolge ihrer Fertigstellung. Schlägt die Auswertung
+    eines Ausdrucks fehl, steht an seiner Stelle die Ausnahme als Wert. Es
+    sind höchstens zwei Blöcke je Worker gleichzeitig in Arbeit, sodass auch
+    sehr große Eingaben mit begrenztem Speicher verarbeitet werden. Bei
+    einem Worker wird ohne Prozesspool im aktuellen Prozess gerechnet.
+    
+    Raises:
+        ValueError: Bei chunksize kleiner 1 oder negativer Anzahl Worker;
+            die Prüfung erfolgt sofort beim Aufruf
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize muss mindestens 1 sein, nicht {chunksize}")
+    if workers is not None and workers < 0:
+        raise ValueError(f"workers darf nicht negativ sein, nicht {workers}")
+    return _evaluate_chunks(expressions, workers or os.cpu_count() or 1, chunksize,
+                            variables, ordered)
+
+def _evaluate_chunks(expressions, workers: int, chunksize: int, variables: dict, ordered: bool):
+    """Generator zu evaluate_chunks mit bereits geprüften Parametern."""
+    expressions = iter(expressions)
+    chunks = iter(lambda: list(islice(expressions, chunksize)), [])
+    
+    if workers == 1:
+        offset = 0
+        for chunk in chunks:
+            yield offset, _evaluate_chunk(chunk, variables)
+            offset += len(chunk)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Position des ersten Ausdrucks je laufendem Block, in Reihenfolge der Eingabe
+        pending = {}
+        offset = 0
+        for chunk in chunks:
+            pending[pool.submit(_evaluate_chunk, chunk, variables)] = offset
+            offset += len(chunk)
+            if len(pending) >= 2 * workers:
+                if ordered:
+                    future = next(iter(pending))
+                else:
+                    future = next(iter(wait(pending, return_when=FIRST_COMPLETED).done))
+                yield pending.pop(future), future.result()
+        for future in (list(pending) if ordered else as_completed(pending)):
+            yield pending[future], future.result()
+
+def evaluate_many(expressions, workers: int = None, chunksize: int = 1000, variables: dict = None):
+    """
+    Wertet viele Ausdrücke parallel aus und liefert die Ergebnisse als
+    Generator in der Reihenfolge der Eingabe; fehlgeschlagene Ausdrücke
+    liefern ihre Ausnahme als Wert. Verteilung auf Prozesse und Blöcke
+    wie bei evaluate_chunks.
+    
+    Args:
+        expressions: Beliebiges Iterable von Ausdrücken
+        workers: Anzahl der Prozesse
+        chunksize: Anzahl der Ausdrücke je Arbeitspaket
+        variables: Werte der Variablen, gültig für alle Ausdrücke
+        
+    Beispiel:
+        >>> list(evaluate_many(["1 + 2", "1 / 0"], workers=1))
+        [3, ValueError('Division durch Null')]
+    """
+    return (result for _, results in evaluate_chunks(expressions, workers, chunksize, variables)
+            for result in results)
+
+def evaluate_vectorized(expression, columns: dict) -> tuple:
+    """
+    Wertet einen Ausdruck für ganze Spalten von Daten in einem Aufruf aus.
+    
+    Das Postfix-Programm wird einmal durchlaufen; jeder Operator wird dabei
+    mit NumPy auf die vollständigen Arrays angewendet. Statt einer Ausnahme
+    bei Division durch Null wird eine Maske der betroffenen Zeilen geliefert;
+    deren Ergebnis ist NaN.
+    
+    Args:
+        expression: Ausdruck als String oder CompiledExpression
+        columns: Werte je Variable als Array oder Liste, z. B. {"a": [1, 2]}
+        
+    Returns:
+        Tupel (Ergebnisse, Maske der Zeilen mit Division durch Null)
+        
+    Beispiel:
+        >>> werte, fehler = evaluate_vectorized("(a + b) * 2 / c",
+        ...                                     {"a": [1, 2], "b": [3, 4], "c": [2, 0]})
+        >>> werte
+        array([ 4., nan])
+        >>> fehler
+        array([False,  True])
+    """
+    if np is None:
+        raise ImportError("evaluate_vectorized benötigt NumPy")
+    if not isinstance(expression, CompiledExpression):
+        expression = _compile_cached(" ".join(expression.split()))
+    
+    arrays = {}
+    for name in expression.variables:
+        if name not in columns:
+            raise ValueError(f"Unbekannte Variable: {name}")
+        arrays[name] = np.asarray(columns[name], dtype=float)
+    shape = np.broadcast_shapes(*(array.shape for array in arrays.values()))
+    division_by_zero = np.zeros(shape, dtype=bool)
+    
+    stack = []
+    for token in expression.postfix:
+        if isinstance(token, float):
+            stack.append(token)
+        elif is_variable(token):
+            stack.append(arrays[token])
+        else:
+            if len(stack) < 2:
+                raise ValueError("Ungültiger Ausdruck")
+            
+            b = stack.pop()
+            a = stack.pop()
+            
+            if token == '+':
+                stack.append(np.add(a, b))
+            elif token == '-':
+                stack.append(np.subtract(a, b))
+            elif token == '*':
+                stack.append(np.multiply(a, b))
+            elif token == '/':
+                zero = np.equal(b, 0)
+                division_by_zero |= zero
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    stack.append(np.where(zero, np.nan, np.divide(a, b)))
+    
+    if len(stack) != 1:
+        raise ValueError("Ungültiger Ausdruck")
+    
+    result = np.broadcast_to(np.asarray(stack[0], dtype=float), shape).copy()
+    return result, division_by_zero
\ No newline at end of file
@@ -1,25 +1,116 @@
 """
 Hauptprogramm zum Testen des mathematischen Ausdrucksauswerters.
+
+Ohne Argumente und mit einem Terminal als Eingabe startet eine interaktive
+Eingabeschleife. Werden Dateien angegeben oder die Eingabe umgeleitet,
+werden die Ausdrücke zeilenweise gelesen und ohne Rückfrage ausgewertet.
+
+Beispiel:
+    python main.py formeln.txt --workers 4 --statistik > ergebnisse.txt
+    cat formeln.txt | python main.py --ungeordnet
 """
 
-from expression_evaluator import evaluate
+import argparse
+import fileinput
+import os
+import sys
+import time
 
-def main():
+from expression_evaluator import evaluate, evaluate_chunks
+
+def interactive():
     """Führt eine einfache Benutzeroberfläche zum Testen der Ausdrucksauswertung aus."""
     print("Mathematischer Ausdrucksauswerter")
     print("Geben Sie 'exit' ein, um das Programm zu beenden.")
-    
+
     while True:
         try:
             expression = input("\nBitte geben Sie einen Ausdruck ein: ")
             if expression.lower() in ['exit', 'quit', 'ende']:
                 break
-                
+
             result = evaluate(expression)
             print(f"Ergebnis: {result}")
-            
+
         except Exception as e:
             print(f"Fehler: {e}")
 
+def stream(files: list, workers: int = 1, chunksize: int = 1000, ordered: bool = True,
+           output=None, statistics: bool = False) -> None:
+    """
+    Wertet die Ausdrücke aus `files` ("-" für die Standardeingabe) Zeile für
+    Zeile aus und schreibt je Zeile das Ergebnis oder "Fehler: ...".
+
+    Gelesen und ausgewertet wird in Blöcken von `chunksize` Zeilen, sodass
+    der Speicherbedarf unabhängig von der Größe der Eingabe bleibt. Jeder
+    Block wird geschrieben, sobald er fertig ist. Mit ordered=False kommen
+    die Blöcke in der Reihenfolge ihrer Fertigstellung; jeder Zeile wird
+    dann ihre Zeilennummer und ein Tabulator vorangestellt. Mit
+    `statistics` werden Anzahl, Fehler und Durchsatz auf stderr ausgegeben.
+    """
+    output = output or sys.stdout
+    start = time.perf_counter()
+    count = errors = 0
+
+    with fileinput.input(files or ["-"]) as lines:
+        expressions = (line.rstrip("\r\n") for line in lines)
+        for offset, results in evaluate_chunks(expressions, workers, chunksize, ordered=ordered):
+            formatted = []
+            for number, result in enumerate(results, offset + 1):
+                if isinstance(result, Exception):
+                    errors += 1
+                    text = f"Fehler: {result}"
+                else:
+                    text = str(result)
+                formatted.append(text if ordered else f"{number}\t{text}")
+            output.write("\n".join(formatted) + "\n")
+            output.flush()
+            count += len(results)
+
+    if statistics:
+        seconds = time.perf_counter() - start
+        rate = count / seconds if seconds else 0.0
+        print(f"{count} Ausdrücke, {errors} Fehler, {seconds:.2f} s, {rate:.0f} Ausdrücke/s",
+              file=sys.stderr)
+
+def _count(minimum: int):
+    """argparse-Typ für ganze Zahlen von mindestens `minimum`."""
+    def parse(text: str) -> int:
+        try:
+            value = int(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"keine ganze Zahl: '{text}'")
+        if value < minimum:
+            raise argparse.ArgumentTypeError(f"muss mindestens {minimum} sein: {value}")
+        return value
+    return parse
+
+def main():
+    """Wählt anhand der Argumente zwischen interaktivem Modus und Datenstrom."""
+    parser = argparse.ArgumentParser(description="Mathematischer Ausdrucksauswerter")
+    parser.add_argument("files", nargs="*", metavar="datei",
+                        help="Dateien mit einem Ausdruck je Zeile, '-' für die Standardeingabe")
+    parser.add_argument("--workers", type=_count(0), default=1, help="Anzahl der Prozesse (0: alle CPU-Kerne)")
+    parser.add_argument("--chunksize", type=_count(1), default=1000, help="Zeilen je Block")
+    parser.add_argument("--ungeordnet", action="store_true",
+                        help="Blöcke in der Reihenfolge ihrer Fertigstellung ausgeben")
+    parser.add_argument("--statistik", action="store_true", help="Durchsatz auf stderr ausgeben")
+    args = parser.parse_args()
+
+    if not args.files and sys.stdin.isatty():
+        interactive()
+        return
+
+    try:
+        stream(args.files, args.workers, args.chunksize, ordered=not args.ungeordnet,
+               statistics=args.statistik)
+    except BrokenPipeError:
+        # Ausgabe wurde vorzeitig geschlossen, z. B. durch "| head". Die
+        # restliche Ausgabe geht nach os.devnull, damit der abschließende
+        # Flush von stdout beim Beenden nicht erneut fehlschlägt.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -2,7 +2,10 @@
 Testmodul für den mathematischen Ausdrucksauswerter.
 """
 
-from expression_evaluator import evaluate
+import sys
+
+from expression_evaluator import (COMPILE_THRESHOLD, compile_expression, evaluate, evaluate_chunks,
+                                  evaluate_many, evaluate_vectorized, np, postfix_to_function)
 
 def test_evaluate():
     """Testet die evaluate-Funktion mit verschiedenen Ausdrücken."""
@@ -26,5 +29,116 @@ def test_evaluate():
     
     print("Alle Tests erfolgreich!")
 
+def test_compile_expression():
+    """Testet übersetzte Ausdrücke und den Cache von evaluate."""
+    formel = compile_expression("3 * (4 + 2) / 3 - 1")
+    assert formel.evaluate() == 5
+    assert formel.evaluate() == 5
+    
+    # Unterschiedliche Leerzeichen ergeben dasselbe Ergebnis
+    assert evaluate("1+ 2\t*3") == evaluate(" 1 + 2 * 3 ") == 7
+    
+    # Leerzeichen trennen weiterhin Zahlen
+    try:
+        evaluate("1 2")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("'1 2' muss einen Fehler auslösen")
+
+def test_variables():
+    """Testet Ausdrücke mit benannten Variablen."""
+    assert evaluate("(a + b) * 2 / c", {"a": 1, "b": 3, "c": 2}) == 4
+    assert compile_expression("a * b + a").variables == ["a", "b"]
+    
+    try:
+        evaluate("a + 1")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unbekannte Variable muss einen Fehler auslösen")
+
+def test_postfix_to_function():
+    """Testet die Übersetzung in Python-Funktionen."""
+    formel = compile_expression("(a + b) * 2 / c - a")
+    funktion = postfix_to_function(formel.postfix)
+    assert funktion({"a": 1, "b": 3, "c": 2}) == 3
+    
+    # Nach COMPILE_THRESHOLD Auswertungen wird die Funktion verwendet
+    for _ in range(COMPILE_THRESHOLD + 1):
+        assert formel.evaluate({"a": 1, "b": 3, "c": 2}) == 3
+    
+    # Fehler entsprechen denen der Auswertung über den Stack
+    for variablen, meldung in [({"a": 1, "b": 3, "c": 0}, "Division durch Null"),
+                               ({"a": 1, "c": 2}, "Unbekannte Variable: b")]:
+        for auswertung in (funktion, formel.evaluate):
+            try:
+                auswertung(variablen)
+            except ValueError as fehler:
+                assert str(fehler) == meldung
+            else:
+                raise AssertionError(f"'{meldung}' muss einen Fehler auslösen")
+    
+    # Werte, deren Division durch Null keine Ausnahme auslöst (wie NumPy-Skalare)
+    class Null(float):
+        def __rtruediv__(self, other):
+            return float("inf")
+    
+    for auswertung in (funktion, formel.evaluate):
+        try:
+            auswertung({"a": 1, "b": 3, "c": Null()})
+        except ValueError as fehler:
+            assert str(fehler) == "Division durch Null"
+        else:
+            raise AssertionError("Division durch Null muss einen Fehler auslösen")
+
+def test_evaluate_many():
+    """Testet die Auswertung vieler Ausdrücke mit und ohne Prozesspool."""
+    ausdruecke = ["3 + 2", "1 / 0", "a * 2", "(1 + 2"] * 5
+    for workers in (1, 2):
+        ergebnisse = list(evaluate_many(ausdruecke, workers=workers, chunksize=3, variables={"a": 4}))
+        assert len(ergebnisse) == len(ausdruecke)
+        assert ergebnisse[0::4] == [5] * 5
+        assert ergebnisse[2::4] == [8] * 5
+        assert all(isinstance(fehler, ValueError) for fehler in ergebnisse[1::4] + ergebnisse[3::4])
+
+def test_evaluate_chunks():
+    """Testet die blockweise Auswertung mit und ohne Reihenfolge der Eingabe."""
+    ausdruecke = [f"{i} * 2" for i in range(20)]
+    for geordnet in (True, False):
+        ergebnisse = [None] * len(ausdruecke)
+        for position, block in evaluate_chunks(ausdruecke, workers=2, chunksize=3, ordered=geordnet):
+            ergebnisse[position:position + len(block)] = block
+        assert ergebnisse == [i * 2 for i in range(20)]
+    
+    # Ungültige Parameter fallen schon beim Aufruf auf, nicht erst beim Iterieren
+    for parameter in ({"chunksize": 0}, {"chunksize": -1}, {"workers": -1}):
+        for auswertung in (evaluate_chunks, evaluate_many):
+            try:
+                auswertung(ausdruecke, **parameter)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"{parameter} muss einen Fehler auslösen")
+
+def test_evaluate_vectorized():
+    """Testet die spaltenweise Auswertung mit NumPy."""
+    if np is None:
+        # Sichtbar überspringen: unter pytest als "skipped", sonst mit Meldung
+        if "pytest" in sys.modules:
+            sys.modules["pytest"].skip("NumPy ist nicht installiert")
+        print("test_evaluate_vectorized übersprungen: NumPy ist nicht installiert")
+        return
+    werte, fehler = evaluate_vectorized("(a + b) * 2 / c", {"a": [1, 2, 3], "b": [3, 4, 5], "c": [2, 0, 4]})
+    assert werte[0] == 4 and werte[2] == 4
+    assert np.isnan(werte[1])
+    assert fehler.tolist() == [False, True, False]
+
 if __name__ == "__main__":
-    test_evaluate()
\ No newline at end of file
+    test_evaluate()
+    test_compile_expression()
+    test_variables()
+    test_postfix_to_function()
+    test_evaluate_many()
+    test_evaluate_chunks()
+    test_evaluate_vectorized()
\ No newline at end of file